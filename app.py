@@ -1,120 +1,26 @@
 import streamlit as st
-import pandas as pd
-import numpy as np
-from model import get_model
-import joblib
-import eli5
+import resources
+import prediction_cache
+import dataset
+import render
+import events
+import uuid
+from game_state import GameState
+import inference_client
+import instrumentation
+from instrumentation import timed, timer
 import streamlit.components.v1 as components
 
 
-if 'fake_tweet_count' not in st.session_state:
-    st.session_state.fake_tweet_count = 0
-    st.session_state.fake_tweets_list = []
-    st.session_state.total_questions = 0
-
-
-# Function to set background color to light yellow and text to black
+# Dark theme and widget styles: one minified <style> block (render.py), built once
+# per process. Streamlit drops elements a rerun does not emit, so every page still
+# emits it on every rerun.
+@timed('set_light_theme')
 def set_light_theme():
-    st.markdown(
-        """
-        <style>
-        /* Set background color to light yellow and text to black */
-        .stApp {
-            background-color: #15202b;
-            font-family: 'Helvetica Neue', sans-serif;
-            color: white;
-        }
-
-        /* Header style - White text */
-        h1, h2, h3, h4, .css-1q2bbj3 {
-            color: white;
-        }
-
-        /* Buttons styled with a light color */
-        .stButton>button {
-            background-color: #2E5984;
-            color: white;
-            border-radius: 25px;
-            padding: 10px 20px;
-            font-size: 16px;
-            border: none;
-            box-shadow: none;
-            cursor: pointer;
-            transition: background-color 0.3s ease;
-        }
-
-        .stButton>button:hover {
-            background-color: #FFD700;
-        }
-        /* ✅ Custom style for 'Next question' button only */
-        button[data-testid="next_question"] {
-            background-color: #d4edda !important; /* Light green */
-            color: black !important;
-        }
-
-        button[data-testid="next_question"]:hover {
-            background-color: #c3e6cb !important; /* Slightly darker on hover */
-        }
-
-        /* Main content area without sidebar */
-        .main-container {
-            display: flex;
-            flex-direction: column;
-            align-items: center;
-            justify-content: center;
-            width: 100%;
-            max-width: 900px;
-            margin: 0 auto;
-            padding-top: 50px;
-            text-align: center;
-        }
-
-        /* Quit button in the top-right corner */
-        .quit-btn {
-            position: absolute;
-            top: 20px;
-            right: 20px;
-            background-color: #FFDD44;
-            color: black;
-            padding: 10px 20px;
-            border-radius: 20px;
-            cursor: pointer;
-            border: none;
-            font-size: 16px;
-        }
-
-        .quit-btn:hover {
-            background-color: #FFD700;
-        }
-        /* Set global default text color to black */
-        html, body, [class*="css"] {
-        color: black !important;
-        }
-
-        /* Make all Streamlit alert box text black */
-        div.stAlert {
-        color: black !important;
-        }
-        /* set start game button color */
-        button[data-testid="start_game"] {
-            background-color: #90EE90 !important; /* Light yellow */
-            color: black !important;
-        }
-        button[data-testid="start_game"]:hover {
-            background-color: #98FB98 !important; /* Slightly darker on hover */
-        }
-        /* Match buttons inside columns */
-        div[data-testid="column"] button {
-            width: 100% !important;
-            padding: 20px 0 !important;
-            font-size: 24px !important;
-            border-radius: 28px !important;
-        }
-        </style>
-        """, unsafe_allow_html=True
-    )
+    st.markdown(render.THEME_STYLE, unsafe_allow_html=True)
 
 # HOME PAGE FUNCTION
+@timed('home')
 def Home():
     st.set_page_config(page_title="WHO SAID THAT?", layout="wide")
     
@@ -145,6 +51,11 @@ def Home():
     if 'game_mode' not in st.session_state:
         st.session_state.game_mode = None
     
+    leaderboard()
+    name = st.text_input("Your name for the leaderboard (optional):", value=st.session_state.get('player_name', ''),
+                         max_chars=30, key="player_name_input")
+    st.session_state.player_name = name.strip()
+
     ### BUTTONS ###
     st.write('Choose your game mode:')
     if st.button("Easy mode", key="easy_mode"):
@@ -162,60 +73,56 @@ def Home():
             st.rerun()
     
     # ML Model & Prediction
-    st.markdown("""
-        <style>
-        /* Works across Streamlit versions/themes */
-        label[data-testid="stCheckbox-label"] {
-            color: black !important;
-            font-weight: bold;
-        }
-        </style>
-    """, unsafe_allow_html=True)
-
-    model = joblib.load('tweetlike_model.pkl')
-
     st.markdown("<h1 style='text-align: center;'> 🎤 Who Do You Tweet Like 💅", unsafe_allow_html = True)
     user_tweet = st.text_area("Write your own tweet:")
 
-    st.markdown("""
-    <style>
-    label[data-testid="stCheckbox-label"] {
-        font-weight: bold;
-        color: black !important;  /* or white for dark themes */
-    }
-    </style>
-""", unsafe_allow_html=True)
-    
     simple_explanation = st.checkbox('### Show Simple Explanation')
     detailed_explanation = st.checkbox('### Show Detailed Explanation')
 
-    if st.button("Guess"):
+    if st.button("Guess", key="guess"):
         if user_tweet.strip() == "":
             st.warning("### Please write something first!")
         else:
-            pred = model.predict([user_tweet])[0]
-            probs = model.predict_proba([user_tweet])[0]
-            top3 = sorted(zip(model.classes_, probs), key=lambda x: x[1], reverse=True)[:3]
-
-            st.success(f"## You sound like **{pred}**!")
+            remote = None
+            client = inference_client.get_client()
+            if client is not None:
+                # Batched with other sessions' requests by inference_server.py
+                try:
+                    with timer('guess.remote_predict'):
+                        remote = client.predict([user_tweet], k=3, explain=simple_explanation or detailed_explanation,
+                                                similar=3)[0]
+                except inference_client.ERRORS:
+                    # Server down, overloaded or failing: answer with the local model below
+                    remote = None
+            if remote is not None:
+                prediction = remote['prediction']
+            else:
+                # Repeated or near-identical tweets (same text after lowercasing/stripping)
+                # are served from the prediction cache; a miss vectorizes once and the
+                # prediction and explanations all reuse it
+                with timer('guess.load_model'):
+                    model = resources.get_model()
+                    version = resources.get_model_version()
+                with timer('guess.predict'):
+                    prediction = prediction_cache.predict(model, version, user_tweet, k=3)
+
+            if prediction.ai_probability is None:
+                st.success(f"## You sound like **{prediction.author}**!")
+            else:
+                st.success(f"## You sound like **{prediction.author}**, and look {prediction.ai_probability:.0%} AI-generated!")
             st.markdown("### Top 3 Predictions:")
-            for celeb, prob in top3:
+            for celeb, prob in prediction.top:
                 st.markdown(f"- **{celeb}**: {prob:.1%}")
 
             # Explanation logic starts here
             st.markdown("### Why we guessed that:")
 
             if detailed_explanation:
-                vectorizer = model.named_steps['tfidf']
-                classifier = model.named_steps['clf']
-                X_transformed = vectorizer.transform([user_tweet])
-
-                explanation = eli5.explain_prediction(
-                    classifier,
-                    X_transformed[0],
-                    feature_names=vectorizer.get_feature_names_out()
-                )
-                html = eli5.format_as_html(explanation)
+                if remote is not None:
+                    html = remote['explanation_html']
+                else:
+                    with timer('guess.explain_detailed'):
+                        html = prediction_cache.explanation_html(resources.get_explainer(), model, version, user_tweet)
                 custom_html = f"""
 <div style="background-color: white; color: black; padding: 20px; border-radius: 12px;">
 {html}
@@ -224,14 +131,30 @@ def Home():
                 components.html(custom_html, height=400, scrolling=True)
 
             if simple_explanation:
-                vectorizer = model.named_steps['tfidf']
-                top_words = sorted(
-                    user_tweet.lower().split(),
-                    key=lambda word: word in vectorizer.vocabulary_,
-                    reverse=True
-                )[:5]
-                st.markdown("Your tweet had words like:")
-                st.markdown(", ".join([f"`{w}`" for w in top_words]))
+                # Words that pushed the prediction most (TF-IDF value x class weight)
+                if remote is not None:
+                    top_words = remote['top_words']
+                else:
+                    with timer('guess.explain_simple'):
+                        top_words = prediction_cache.top_words(resources.get_explainer(), model, version, user_tweet, prediction.author, n=5)
+                if top_words is None:
+                    st.markdown("This model reads character n-grams rather than words; the full explanation shows them.")
+                elif top_words:
+                    st.markdown("Your tweet had words like:")
+                    st.markdown(", ".join([f"`{w}`" for w in top_words]))
+                else:
+                    st.markdown(f"None of your words are typical of {prediction.author}, so we went with their overall style.")
+
+            # Nearest real tweets in the model's TF-IDF space (similarity.py)
+            if remote is not None:
+                neighbors = remote['neighbors']
+            else:
+                with timer('guess.similar'):
+                    neighbors = prediction_cache.similar(resources.get_similarity_index(tweets_path=DATA_PATH), model, version, user_tweet, k=3)
+            if neighbors:
+                st.markdown("### Closest real celebrity tweets:")
+                for neighbor in neighbors:
+                    st.markdown(f"- **{neighbor.author}** ({neighbor.score:.0%} similar): {neighbor.tweet}")
 
             
 
@@ -239,106 +162,116 @@ def Home():
 
 
 ### MANAGING DATA ###
-# Load the dataset
+# data/tweets.columnar instead when `python dataset.py data/tweets.csv` has converted it
+DATA_PATH = dataset.resolve("data/tweets.csv")
+
+# Load the dataset as an indexed tweet store
+@timed('load_data')
 def load_data(file_path):
 
     try:
-        df = pd.read_csv(file_path)
-        return df
+        # Parsed and indexed once per process and shared by all sessions
+        return resources.get_tweet_store(file_path)
     except Exception as e:
         st.error(f"Error loading data: {e}")
         return None
 
-# Get a random tweet and its author
-def get_random_tweet(df):
-    random_row = df.sample(n=1).iloc[0]
-    tweet = random_row['tweet']
-    author = random_row['author']
-    return tweet, author
-
-def get_options(df, correct_author):
-    # Filter out the correct author first
-    other_authors = df[df['author'] != correct_author]['author'].unique()
-    sampled_authors = np.random.choice(other_authors, size=3, replace=False).tolist()
-    sampled_authors.append(correct_author)
-    np.random.shuffle(sampled_authors)
-    return sampled_authors
-
-def generate_question_easy(df):
-    tweet, correct_author = get_random_tweet(df)
-    options = get_options(df, correct_author)
-    return correct_author, tweet, options
-
-def generate_question_hard(df):
-    tweet, correct_author = get_random_tweet(df)
-    return correct_author, tweet
-def display_tweet(tweet, author = None, avatar = None):
-    # fallback values
-    display_name = author if author else "Unknown Author"
-    display_avatar = avatar if avatar else "https://abs.twimg.com/sticky/default_profile_images/default_profile_400x400.png"
-    
-    st.markdown(
-        f"""
-        <div style="border: 1px solid #2f3336; background-color: #15202b; border-radius: 12px;
-            padding: 15px; margin: 20px auto; max-width: 550px;
-            box-shadow: 0px 2px 5px rgba(0,0,0,0.4);
-            font-family: 'Segoe UI', sans-serif;">
-            <div style="display: flex; align-items: center;">
-                <img src="{display_avatar}" width="48" height="48" style="border-radius: 50%; margin-right: 10px;">
-                <div>
-                    <span style="font-weight: 600; font-size: 16px; color: white;">{display_name}</span>
-                    <img src="https://upload.wikimedia.org/wikipedia/commons/e/e4/Twitter_Verified_Badge.svg" width="16" height="16" style="margin-left: 4px; vertical-align: text-bottom;">
-                    <br>
-                    <span style="color: #8899a6;">@{author.lower().replace(' ', '') if author else 'Unknown Author'} · Apr 5, 2025</span>
-                </div>
-            </div>
-            <div style="margin-top: 12px; font-size: 18px; line-height: 1.5; color: white;">
-                {tweet}
-            </div>
-            <div style="margin-top: 14px; display: flex; justify-content: space-around; color: #8899a6; font-size: 14px;">
-                <div><img src="https://img.icons8.com/ios-glyphs/20/8899a6/speech-bubble.png"/> 17</div>
-                <div><img src="https://img.icons8.com/ios-glyphs/20/8899a6/share.png"/> 112</div>
-                <div><img src="https://img.icons8.com/ios-glyphs/20/8899a6/like.png"/> 683</div>
-                <div><img src="https://img.icons8.com/ios-glyphs/20/8899a6/view-file.png"/> 13.2K</div>
-            </div>
-        </div>
-        """,
-        unsafe_allow_html=True
-    )
+# Start a game: a pre-generated set of 10 questions (tweet IDs, option author codes,
+# is_real flags) sliced off the shared question bank
+@timed('new_game')
+def new_game():
+    return resources.get_question_bank(DATA_PATH).next_game()
+
+# Tweet card HTML is rendered once per tweet ID and reveal state (render.CardCache)
+# and shared by all sessions; avatars and icons are inline data URIs (assets.py)
+def display_tweet(tweet_id, revealed=False):
+    st.markdown(resources.get_cards(DATA_PATH).card(tweet_id, revealed), unsafe_allow_html=True)
 
 
 #reset the game state
 def reset_game_state():
-    for key in ['questions', 'current_q', 'answered', 'selected_option', 'score', 'hard_answer']:
+    for key in ['game', 'hard_answer']:
         if key in st.session_state:
             del st.session_state[key]
 
-def easy_question(df):
-    if 'questions' not in st.session_state:
-        st.session_state.questions =[generate_question_easy(df) for _ in range(10)]
-        st.session_state.current_q=0
-        st.session_state.answered=False
-        st.session_state.selected_option=None
-        st.session_state.score=0
-    q_idx= st.session_state.current_q
 
+### LEADERBOARD & ANALYTICS ###
+# Anonymous per-session ID; the leaderboard shows the name given on Home
+def player_id():
+    if 'player_id' not in st.session_state:
+        st.session_state.player_id = uuid.uuid4().hex
+    return st.session_state.player_id
+
+# Queued for events.py's writer thread, so the rerun never waits on SQLite
+def record_answer(store, game, mode):
+    event_store = events.get_store()
+    tweet_id = game.tweet_id
+    event_store.record_answer(player_id(), game.game_id, mode, game.current, store.tweet(tweet_id),
+                              store.author(tweet_id), game.is_real, game.selected, game.is_correct)
+    if game.is_last:
+        event_store.record_game(game.game_id, player_id(), st.session_state.get('player_name') or 'Anonymous',
+                                mode, game.score, len(game), game.fake_seen)
+
+# How all players did on this tweet, from the event store's in-memory snapshot
+def tweet_difficulty(tweet):
+    accuracy = events.get_store().tweet_accuracy(tweet)
+    if accuracy:
+        answers, share = accuracy
+        st.caption(f"🌍 {share:.0%} of {answers} answers to this tweet were right.")
+
+def leaderboard():
+    snapshot = events.get_store().snapshot()
+    with st.expander(f"🏆 Leaderboard ({snapshot.games} games played)"):
+        cols = st.columns(len(events.MODES))
+        for col, mode in zip(cols, events.MODES):
+            with col:
+                st.markdown(f"**{mode.capitalize()} mode**")
+                rows = [{"player": name, "best": best, "games": games, "average": round(average, 1)}
+                        for name, best, games, average in snapshot.leaderboard[mode]]
+                if rows:
+                    st.dataframe(rows, hide_index=True)
+                else:
+                    st.write("No games yet.")
+
+# AI-tweet summary, score banner and Play again, after the last answer in either mode
+def final_results(store, game):
+    if game.questions_seen > 0:
+        percent_fake = game.fake_seen / game.questions_seen * 100
+
+        st.markdown(f"### 🤖 AI-Generated Tweet Summary")
+        st.markdown(f"🧠 **{percent_fake:.1f}%** of the tweets you saw were AI-generated.")
+
+        fake_ids = game.fake_tweet_ids()
+        if fake_ids:
+            st.markdown("Here are the AI-generated tweets you saw:")
+            for fake_id in fake_ids:
+                st.markdown(f"> {store.tweet(fake_id)}")
+
+    st.markdown("### 🏁 Final Results")
+    st.balloons()
+    st.markdown(render.final_banner(game.score, len(game)), unsafe_allow_html=True)
+    if st.button("🔁 Play again", key="play_again"):
+        reset_game_state()
+        st.session_state.page = "Home"
+        st.rerun()
 
-    # Assuming tweet is a row from your DataFrame
-    correct_author, tweet_text, options = st.session_state.questions[q_idx]
+@timed('easy_question')
+def easy_question(store):
+    if 'game' not in st.session_state:
+        st.session_state.game = GameState.from_game(new_game())
+    game = st.session_state.game
+    q_idx = game.current
 
-    # Find the row for this tweet
-    row = df[df["tweet"] == tweet_text].iloc[0]
-    is_real = row["is_real"]
+    # Questions hold tweet IDs; everything else is an array lookup in the store
+    tweet_id = game.tweet_id
+    options = [store.authors[code] for code in game.option_codes]
+    correct_author = store.author(tweet_id)
 
-    # Track AI tweet info
-    st.session_state.total_questions += 1
-    if not is_real and tweet_text not in st.session_state.fake_tweets_list:
-        st.session_state.fake_tweet_count += 1
-        st.session_state.fake_tweets_list.append(tweet_text)
+    # Track AI tweet info (a bit per question, so reruns do not count it twice)
+    game.show()
 
     #score display
-    q_idx = st.session_state.current_q
-    score = st.session_state.score
+    score = game.score
     progress = (q_idx+1) / 10
 
 # Display progress bar and score tracker side by side
@@ -346,134 +279,64 @@ def easy_question(df):
     with col1:
         st.progress(progress, text=f"Question {q_idx + 1} of 10")
     with col2:
-        st.markdown(
-            f"""
-            <div style="background-color: #ffffff; color: black; padding: 8px 12px;
-                        border-radius: 12px; text-align: center; font-weight: bold;
-                        box-shadow: 1px 1px 5px rgba(0,0,0,0.1); margin-top: 6px;">
-                Score: {score}
-            </div>
-            """, unsafe_allow_html=True
-        )
+        st.markdown(render.score_badge(score), unsafe_allow_html=True)
 
     #display the tweet
-    correct_author, tweet, options = st.session_state.questions[q_idx]
+    tweet = store.tweet(tweet_id)
     # render the options as buttons
-    if not st.session_state.answered:
-        display_tweet(tweet)
+    if not game.is_answered:
+        display_tweet(tweet_id)
         cols = st.columns([0.6]*len(options))
         for i, option in enumerate(options):
             with cols[i]:
                 if st.button(option, key=f"option_{q_idx}_{i}"):
-                    st.session_state.selected_option = option
-                    st.session_state.answered = True
-                    if option == correct_author:
-                        st.session_state.score += 1
+                    if game.answer(option, option == correct_author):
+                        record_answer(store, game, "easy")
                     st.rerun()
 
     # if the question has been answered, display the correct answer and the selected answer
     else:
-        display_tweet(tweet, author = row['author'])
+        display_tweet(tweet_id, revealed=True)
+        tweet_difficulty(tweet)
         cols = st.columns(len(options))
         for i, option in enumerate(options):
             with cols[i]:
                 if option == correct_author:
-                    bg = "#d4edda"  # green
-                    icon = "✅"
-                elif option == st.session_state.selected_option:
-                    bg = "#f8d7da"  # red
-                    icon = "❌"
+                    state = "correct"
+                elif option == game.selected:
+                    state = "wrong"
                 else:
-                    bg = "#e2e3e5"  # gray
-                    icon = ""
-
-                st.markdown(
-                    f"""
-                    <div style='background-color: {bg}; color: black; padding: 10px 16px; border-radius: 20px;
-                                text-align: center; font-weight: bold; box-shadow: 1px 1px 3px rgba(0,0,0,0.1);'>
-                        {icon} {option}
-                    </div>
-                    """,
-                    unsafe_allow_html=True
-                )
+                    state = "other"
+                st.markdown(render.option_pill(option, state), unsafe_allow_html=True)
 
         
-        if q_idx <9:
+        if not game.is_last:
             st.markdown('<div data-testid="next_question">', unsafe_allow_html=True)
             if st.button("Next question", key="next_question"):
-                st.session_state.current_q += 1
-                st.session_state.answered = False
-                st.session_state.selected_option = None
+                game.next_question()
                 st.rerun()
             st.markdown('</div>', unsafe_allow_html=True)
         else:
-            if st.session_state.total_questions > 0:
-                percent_fake = (st.session_state.fake_tweet_count / 10) * 100
-
-                st.markdown(f"### 🤖 AI-Generated Tweet Summary")
-                st.markdown(f"🧠 **{percent_fake:.1f}%** of the tweets you saw were AI-generated.")
-
-                if st.session_state.fake_tweets_list:
-                    st.markdown("Here are the AI-generated tweets you saw:")
-                    for fake_tweet in st.session_state.fake_tweets_list:
-                        st.markdown(f"> {fake_tweet}")
-
-            st.markdown("### 🏁 Final Results")
-            st.balloons()
-            score = st.session_state.score
-            if score == 10:
-                st.markdown(
-    f"<div style='background-color: #fff3cd; color: black; padding: 12px; border-radius: 8px;'>  🎉 You scored {score}/10. WOW! </div>",
-    unsafe_allow_html=True
-)
-
-            elif score >= 7:
-                st.markdown(
-    f"<div style='background-color: #d4edda; color: black; padding: 12px; border-radius: 8px;'>👏 Great job! You scored {score}/10!</div>",
-    unsafe_allow_html=True
-)
-            elif score >= 4:
-                st.markdown(
-    f"<div style='background-color: #d1ecf1; color: black; padding: 12px; border-radius: 8px;'>ℹ️ You scored {score}/10. Not bad — give it another go!</div>",
-    unsafe_allow_html=True
-)
-
-            else:
-                st.markdown(
-    f"<div style='background-color: #fff3cd; color: black; padding: 12px; border-radius: 8px;'>⚠️ You scored {score}/10. Tough round — try again! 💪</div>",
-    unsafe_allow_html=True
-)
-            if st.button("🔁 Play again", key="play_again"):
-                reset_game_state()
-                st.session_state.page = "Home"
-                st.rerun()
-
-def hard_question(df):
-    if 'questions' not in st.session_state:
-        st.session_state.questions =[generate_question_hard(df) for _ in range(10)]
-        st.session_state.current_q=0
-        st.session_state.answered=False
-        st.session_state.selected_option=None
-        st.session_state.score=0
-    q_idx= st.session_state.current_q
-    correct_author, tweet = st.session_state.questions[q_idx]
+            final_results(store, game)
+
+@timed('hard_question')
+def hard_question(store):
+    if 'game' not in st.session_state:
+        st.session_state.game = GameState.from_game(new_game())
+    game = st.session_state.game
+    q_idx = game.current
+    tweet_id = game.tweet_id
     st.markdown(f"**Tweet {q_idx+1}**:")
 
-    # Getting the tweet and is_real info
+    # Getting the tweet and its author
+    tweet = store.tweet(tweet_id)
+    correct_author = store.author(tweet_id)
 
-    correct_author, tweet_text = st.session_state.questions[q_idx]
-    row = df[df["tweet"] == tweet_text].iloc[0]
-    is_real = row["is_real"]
-
-    # Track AI tweet info
-    st.session_state.total_questions += 1
-    if not is_real and tweet_text not in st.session_state.fake_tweets_list:
-        st.session_state.fake_tweet_count += 1
-        st.session_state.fake_tweets_list.append(tweet_text)
+    # Track AI tweet info (a bit per question, so reruns do not count it twice)
+    game.show()
 
     #score display
-    q_idx = st.session_state.current_q
-    score = st.session_state.score
+    score = game.score
     progress = (q_idx+1) / 10
 
     # Display progress bar and score tracker side by side
@@ -481,96 +344,36 @@ def hard_question(df):
     with col1:
         st.progress(progress, text=f"Question {q_idx + 1} of 10")
     with col2:
-        st.markdown(
-            f"""
-            <div style="background-color: #ffffff; color: black; padding: 8px 12px;
-                        border-radius: 12px; text-align: center; font-weight: bold;
-                        box-shadow: 1px 1px 5px rgba(0,0,0,0.1); margin-top: 6px;">
-                Score: {score}
-            </div>
-            """, unsafe_allow_html=True
-        )
+        st.markdown(render.score_badge(score), unsafe_allow_html=True)
     #display the tweet
-    if not st.session_state.answered:
-        display_tweet(tweet)
+    if not game.is_answered:
+        display_tweet(tweet_id)
         st.text_input("Type your answer here:", key="hard_answer")
         if st.button("Submit", key="submit_answer"):
-            st.session_state.answered = True
-            st.session_state.selected_option = st.session_state.hard_answer
-            if st.session_state.selected_option.lower() == correct_author.lower():
-                st.session_state.score +=1
+            # Fuzzy match, so "shaq", "Conan O Brien" or a typo still count
+            with timer('hard_question.match'):
+                correct, _ = resources.get_author_matcher(DATA_PATH).is_correct(st.session_state.hard_answer, correct_author)
+            if game.answer(st.session_state.hard_answer, correct):
+                record_answer(store, game, "hard")
             st.rerun()
     else:
-        display_tweet(tweet, author=row['author'])
-        # Determine styling
-        if st.session_state.selected_option.lower() == correct_author.lower():
-            bg = "#d4edda"
-            icon = "✅"
-        else:
-            bg = "#f8d7da"
-            icon = "❌"
-        st.markdown(
-            f"""
-            <div style='background-color: {bg}; color: black; padding: 10px 16px; border-radius: 20px;
-                margin-bottom: 10px; font-weight: bold; box-shadow: 1px 1px 3px rgba(0,0,0,0.1);'>
-                {icon} {st.session_state.selected_option} The correct answer was: {correct_author}
-            </div>
-            """,
-            unsafe_allow_html=True
-        )
-        if q_idx <9:
+        display_tweet(tweet_id, revealed=True)
+        tweet_difficulty(tweet)
+        st.markdown(render.answer_banner(game.is_correct, game.selected, correct_author), unsafe_allow_html=True)
+        if not game.is_last:
             st.markdown('<div data-testid="next_question">', unsafe_allow_html=True)
             if st.button("Next question", key="next_question"):
-                st.session_state.current_q += 1
-                st.session_state.answered = False
-                st.session_state.selected_option = None
+                game.next_question()
                 st.rerun()
             st.markdown('</div>', unsafe_allow_html=True)
         else:
-            if st.session_state.total_questions > 0:
-                percent_fake = (st.session_state.fake_tweet_count / 10) * 100
-
-                st.markdown(f"### 🤖 AI-Generated Tweet Summary")
-                st.markdown(f"🧠 **{percent_fake:.1f}%** of the tweets you saw were AI-generated.")
-
-                if st.session_state.fake_tweets_list:
-                    st.markdown("Here are the AI-generated tweets you saw:")
-                    for fake_tweet in st.session_state.fake_tweets_list:
-                        st.markdown(f"> {fake_tweet}")
-            st.markdown("### 🏁 Final Results")
-            st.balloons()
-            score = st.session_state.score
-            if score == 10:
-                st.markdown(
-    f"<div style='background-color: #fff3cd; color: black; padding: 12px; border-radius: 8px;'>  🎉 You scored {score}/10. WOW! </div>",
-    unsafe_allow_html=True
-)
-
-            elif score >= 7:
-                st.markdown(
-    f"<div style='background-color: #d4edda; color: black; padding: 12px; border-radius: 8px;'>👏 Great job! You scored {score}/10!</div>",
-    unsafe_allow_html=True
-)
-            elif score >= 4:
-                st.markdown(
-    f"<div style='background-color: #d1ecf1; color: black; padding: 12px; border-radius: 8px;'>ℹ️ You scored {score}/10. Not bad — give it another go!</div>",
-    unsafe_allow_html=True
-)
-
-            else:
-                st.markdown(
-    f"<div style='background-color: #fff3cd; color: black; padding: 12px; border-radius: 8px;'>⚠️ You scored {score}/10. Tough round — try again! 💪</div>",
-    unsafe_allow_html=True
-)
-            if st.button("🔁 Play again", key="play_again"):
-                reset_game_state()
-                st.session_state.page = "Home"
-                st.rerun()
+            final_results(store, game)
 
 
 
 
 # GAME STARTED PAGE FUNCTION
+@timed('game_started')
 def GameStarted():
     if st.session_state.game_mode == "easy":
         st.set_page_config(page_title="WHO SAID THAT? - Easy Mode", layout="wide")
@@ -599,16 +402,16 @@ def GameStarted():
         st.rerun()
     
     #load the dataset
-    df= load_data("data/tweets.csv")
-    if df is None:
+    store= load_data(DATA_PATH)
+    if store is None:
         st.error("Error loading data. Please check the file path.")
         return
     # Start the game based on the selected mode
     if st.session_state.game_mode == "easy":
-        easy_question(df)
+        easy_question(store)
     else:
         st.write("THIS IS HARD MODE, WRITE FIRST AND LAST NAME OF THE AUTHOR")
-        hard_question(df)
+        hard_question(store)
         
         
 
@@ -617,8 +420,27 @@ def GameStarted():
 if 'page' not in st.session_state:
     st.session_state.page = 'Home'
 
+# Stage timings panel, only with TWEETLIKE_TIMINGS=1 (see instrumentation.py)
+def timings_panel():
+    timings = instrumentation.snapshot()
+    with st.sidebar.expander("⏱️ Stage timings (all sessions)"):
+        if not timings:
+            st.write("Nothing timed yet.")
+            return
+        rows = [
+            {"stage": stage, "calls": t["count"], "mean ms": t["mean"] * 1e3, "p50 ms": t["p50"] * 1e3,
+             "p95 ms": t["p95"] * 1e3, "max ms": t["max"] * 1e3}
+            for stage, t in timings.items()
+        ]
+        st.dataframe(rows, hide_index=True)
+
 # Navigation logic
-if st.session_state.page == 'Home':
-    Home()
-else:
-    GameStarted()
+with timer('rerun'):
+    if st.session_state.page == 'Home':
+        Home()
+    else:
+        GameStarted()
+
+if instrumentation.ENABLED:
+    timings_panel()
+    instrumentation.maybe_dump()
@@ -0,0 +1,84 @@
+import base64
+import io
+import os
+import time
+
+from PIL import Image, ImageOps, features
+
+# Images for the tweet cards, all as data URIs so rendering a card reads no files and
+# fetches nothing. Avatars from the tweets table's avatar column are resized once to
+# 48x48 WebP (JPEG where Pillow lacks WebP); the badge and action icons are inline
+# SVG. resources.get_assets() builds one AvatarCache per dataset, shared by every
+# session.
+
+AVATAR_SIZE = 48
+AVATAR_QUALITY = 80
+AVATAR_FORMAT = 'WEBP' if features.check('webp') else 'JPEG'
+
+
+def svg_uri(svg):
+    return 'data:image/svg+xml;base64,' + base64.b64encode(svg.encode()).decode()
+
+
+_ICON = '<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 24 24" fill="none" stroke="#8899a6" ' \
+        'stroke-width="2" stroke-linecap="round" stroke-linejoin="round">{}</svg>'
+
+ICONS = {
+    'verified': svg_uri('<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 24 24">'
+                        '<circle cx="12" cy="12" r="11" fill="#1d9bf0"/>'
+                        '<path d="M7 12.5l3 3 7-7" fill="none" stroke="#fff" stroke-width="2.5" '
+                        'stroke-linecap="round" stroke-linejoin="round"/></svg>'),
+    'reply': svg_uri(_ICON.format('<path d="M4 5h16v11H9l-5 4z"/>')),
+    'share': svg_uri(_ICON.format('<path d="M12 3v12M7 8l5-5 5 5M5 13v7h14v-7"/>')),
+    'like': svg_uri(_ICON.format('<path d="M12 20s-7-4.5-7-10a4 4 0 0 1 7-2.5A4 4 0 0 1 19 10c0 5.5-7 10-7 10z"/>')),
+    'views': svg_uri(_ICON.format('<path d="M5 20V10M12 20V4M19 20v-7"/>')),
+}
+
+DEFAULT_AVATAR = svg_uri('<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 48 48">'
+                         '<rect width="48" height="48" fill="#cfd9de"/><circle cx="24" cy="19" r="8" fill="#fff"/>'
+                         '<path d="M8 44c2-9 9-13 16-13s14 4 16 13z" fill="#fff"/></svg>')
+
+
+def encode_avatar(path, size=AVATAR_SIZE, image_format=AVATAR_FORMAT, quality=AVATAR_QUALITY):
+    # Center-cropped to a square and resized, as a data URI
+    with Image.open(path) as image:
+        image = ImageOps.exif_transpose(image).convert('RGB')
+        image = ImageOps.fit(image, (size, size), Image.LANCZOS)
+    buffer = io.BytesIO()
+    image.save(buffer, image_format, quality=quality)
+    return f'data:image/{image_format.lower()};base64,' + base64.b64encode(buffer.getvalue()).decode()
+
+
+class AvatarCache:
+    def __init__(self, avatars, build_seconds=None):
+        self.avatars = dict(avatars)  # author -> data URI
+        self.build_seconds = build_seconds
+
+    def avatar(self, author):
+        return self.avatars.get(author, DEFAULT_AVATAR)
+
+    @classmethod
+    def from_store(cls, store, base_dir):
+        # One avatar per author: the first avatar path among the author's tweets, with
+        # paths relative to the tweets table's directory. Authors without one, or whose
+        # file is missing or unreadable, keep DEFAULT_AVATAR.
+        start = time.perf_counter()
+        encoded = {}
+        avatars = {}
+        for code, author in enumerate(store.authors):
+            paths = (store.avatars[i] for i in store.tweets_by_author(code))
+            path = next((p for p in paths if isinstance(p, str) and p), None)
+            if path is None:
+                continue
+            if path not in encoded:
+                try:
+                    encoded[path] = encode_avatar(os.path.join(base_dir, path))
+                except OSError:
+                    encoded[path] = None
+            if encoded[path] is not None:
+                avatars[author] = encoded[path]
+        return cls(avatars, time.perf_counter() - start)
+
+    def stats(self):
+        sizes = [len(uri) for uri in self.avatars.values()]
+        return {'avatars': len(sizes), 'bytes': sum(sizes), 'build_seconds': self.build_seconds}
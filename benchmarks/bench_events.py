@@ -0,0 +1,62 @@
+import argparse
+import os
+import sqlite3
+import tempfile
+import time
+
+import events
+
+# What an answer costs the rerun that records it: a synchronous insert + commit per
+# answer (what writing from the script would do) vs events.EventStore's queue, and
+# how long the writer thread then takes to drain it:
+#   python -m benchmarks.bench_events --answers 5000
+
+
+def answers(n):
+    return [('player', f'game{i // 10}', 'easy', i % 10, f'tweet {i % 500}', 'Kanye West', 1, 'Kanye West', i % 2)
+            for i in range(n)]
+
+
+def synchronous(path, rows):
+    conn = sqlite3.connect(path)
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.executescript(events._SCHEMA)
+    start = time.perf_counter()
+    for row in rows:
+        with conn:
+            conn.execute(events._INSERT_ANSWER, (time.time(),) + row)
+            conn.execute(events._UPDATE_TWEET, (row[4], row[5], row[6], row[8]))
+    elapsed = time.perf_counter() - start
+    conn.close()
+    return elapsed
+
+
+def queued(path, rows):
+    store = events.EventStore(path)
+    start = time.perf_counter()
+    for row in rows:
+        store.record_answer(*row)
+    enqueued = time.perf_counter() - start
+    store.flush()
+    drained = time.perf_counter() - start
+    stats = store.stats()
+    store.close()
+    return enqueued, drained, stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Compare synchronous and queued answer recording.')
+    parser.add_argument('--answers', type=int, default=5000)
+    args = parser.parse_args(argv)
+
+    rows = answers(args.answers)
+    with tempfile.TemporaryDirectory() as tmp:
+        sync_seconds = synchronous(os.path.join(tmp, 'sync.db'), rows)
+        enqueued, drained, stats = queued(os.path.join(tmp, 'queued.db'), rows)
+    print(f"{'synchronous commit':24s} {sync_seconds / len(rows) * 1e6:8.1f} us/answer in the rerun")
+    print(f"{'EventStore queue':24s} {enqueued / len(rows) * 1e6:8.1f} us/answer in the rerun, "
+          f"all written after {drained:.2f}s in {stats['batches']} batches ({stats['dropped']} dropped)")
+
+
+if __name__ == '__main__':
+    main()
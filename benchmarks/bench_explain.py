@@ -0,0 +1,70 @@
+import argparse
+import timeit
+
+import eli5
+
+from explain import Explainer, to_html
+from inference import vectorize
+from model import DEFAULT_MODEL_PATH, load_model
+
+# Detailed explanation latency, eli5 vs explain.Explainer, plus a check that both
+# rank the same top features for every class:
+#   python -m benchmarks.bench_explain
+
+TWEETS = [
+    "just realized i've been singing the wrong lyrics to my own song all week",
+    "i love music and my fans so much",
+    "ok but who ate my oat milk",
+]
+
+
+def explain_eli5(model, X):
+    vectorizer = model.named_steps['tfidf']
+    classifier = model.named_steps['clf']
+    explanation = eli5.explain_prediction(classifier, X[0], feature_names=vectorizer.get_feature_names_out())
+    return explanation, eli5.format_as_html(explanation)
+
+
+def explain_native(explainer, X):
+    explanation = explainer.explain(X)
+    return explanation, to_html(explanation)
+
+
+def same_top_features(eli5_explanation, native_explanation):
+    for ours, theirs in zip(native_explanation, eli5_explanation.targets):
+        if ours.target != theirs.target:
+            return False
+        for mine, other in [(ours.pos, theirs.feature_weights.pos), (ours.neg, theirs.feature_weights.neg)]:
+            # Compared as feature -> weight so float-level ties may come out in either order
+            mine = {f.feature: f.weight for f in mine}
+            other = {f.feature: f.weight for f in other}
+            if mine.keys() != other.keys():
+                return False
+            if any(abs(mine[name] - other[name]) > 1e-9 for name in mine):
+                return False
+    return True
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Time eli5 against the native explainer.')
+    parser.add_argument('--model', default=DEFAULT_MODEL_PATH)
+    parser.add_argument('--number', type=int, default=200)
+    args = parser.parse_args(argv)
+
+    model = load_model(args.model)
+    explainer = Explainer(model)
+    for tweet in TWEETS:
+        X = vectorize(model, [tweet])
+        match = same_top_features(explain_eli5(model, X)[0], explain_native(explainer, X)[0])
+        print(f"top features match eli5: {match}  ({tweet!r})")
+
+    X = vectorize(model, [TWEETS[0]])
+    for name, fn in [('eli5 explain + format_as_html', lambda: explain_eli5(model, X)),
+                     ('Explainer.explain + to_html', lambda: explain_native(explainer, X))]:
+        fn()
+        best = min(timeit.repeat(fn, number=args.number, repeat=5)) / args.number
+        print(f"{name:32s} {best * 1e6:8.1f} us/request")
+
+
+if __name__ == '__main__':
+    main()
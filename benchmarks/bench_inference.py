@@ -0,0 +1,39 @@
+import argparse
+import timeit
+
+from inference import predict_top_k
+from model import DEFAULT_MODEL_PATH, load_model
+
+# Per-request latency of the Guess handler before and after inference.predict_top_k:
+#   python -m benchmarks.bench_inference
+
+TWEET = "just realized i've been singing the wrong lyrics to my own song all week"
+
+
+def guess_two_pass(model, tweet):
+    # What the Guess button used to do: two pipeline runs and a full sort
+    pred = model.predict([tweet])[0]
+    probs = model.predict_proba([tweet])[0]
+    top3 = sorted(zip(model.classes_, probs), key=lambda x: x[1], reverse=True)[:3]
+    return pred, top3
+
+
+def guess_one_pass(model, tweet):
+    return predict_top_k(model, [tweet], k=3)[0]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Time the Guess handler before and after predict_top_k.')
+    parser.add_argument('--model', default=DEFAULT_MODEL_PATH)
+    parser.add_argument('--number', type=int, default=2000)
+    args = parser.parse_args(argv)
+
+    model = load_model(args.model)
+    for name, fn in [('predict + predict_proba + sort', guess_two_pass), ('predict_top_k', guess_one_pass)]:
+        fn(model, TWEET)  # warm up
+        best = min(timeit.repeat(lambda: fn(model, TWEET), number=args.number, repeat=5)) / args.number
+        print(f"{name:32s} {best * 1e6:8.1f} us/request")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+import argparse
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import Pipeline
+
+from export_numpy import export
+from inference import vectorize
+from model import DEFAULT_MODEL_PATH, load_model
+from numpy_runtime import NumpyModel
+
+# Checks that numpy_runtime.NumpyModel matches predict_proba, for the shipped model
+# and a few other vectorizer settings, and compares cold start against unpickling
+# the sklearn pipeline:
+#   python -m benchmarks.bench_numpy_runtime
+
+VARIANTS = {
+    'word 1-2gram': dict(ngram_range=(1, 2)),
+    'char_wb 2-4': dict(analyzer='char_wb', ngram_range=(2, 4)),
+    'char 1-3 sublinear': dict(analyzer='char', ngram_range=(1, 3), sublinear_tf=True),
+    'stop words, accents': dict(stop_words='english', strip_accents='unicode'),
+}
+
+COLD_START = {
+    'sklearn pickle': "import joblib; m = joblib.load({path!r}); m.predict_proba(['hello there'])",
+    'numpy runtime': "from numpy_runtime import NumpyModel; m = NumpyModel({path!r}); m.predict_proba(['hello there'])",
+}
+
+
+def max_difference(model, texts):
+    with tempfile.TemporaryDirectory() as tmp:
+        export(model, tmp)
+        runtime = NumpyModel(tmp)
+        expected = model[-1].predict_proba(vectorize(model, texts))
+        actual = runtime.predict_proba(texts)
+        same_top = (expected.argmax(axis=1) == actual.argmax(axis=1)).mean()
+        return np.abs(expected - actual).max(), same_top
+
+
+def cold_start(code, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, '-c', code], check=True)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Check and time the pure-NumPy runtime.')
+    parser.add_argument('--model', default=DEFAULT_MODEL_PATH)
+    parser.add_argument('--tweets', default='data/tweets.csv')
+    args = parser.parse_args(argv)
+
+    texts = pd.read_csv(args.tweets)['tweet'].tolist()
+    model = load_model(args.model)
+    diff, same_top = max_difference(model, texts)
+    print(f"{'shipped model':24s} max |proba diff| {diff:.2e}  same top-1 {same_top:.1%}")
+
+    data = pd.read_csv('data/top_celebs.csv')
+    for name, params in VARIANTS.items():
+        variant = Pipeline([('tfidf', TfidfVectorizer(**params)), ('clf', LogisticRegression(max_iter=1000))])
+        variant.fit(data['tweet'].str.lower(), data['name'])
+        diff, same_top = max_difference(variant, texts)
+        print(f"{name:24s} max |proba diff| {diff:.2e}  same top-1 {same_top:.1%}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        export(model, tmp)
+        for name, code in COLD_START.items():
+            path = tmp if name == 'numpy runtime' else args.model
+            print(f"cold start, {name:16s} {cold_start(code.format(path=path)) * 1000:8.1f} ms (new process, import + load + 1 prediction)")
+
+
+if __name__ == '__main__':
+    main()
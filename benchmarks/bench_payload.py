@@ -0,0 +1,71 @@
+import argparse
+import os
+import tempfile
+
+from streamlit.testing.v1 import AppTest
+
+# Bytes Streamlit sends for one rerun of each page: the serialized protos of every
+# element and block the script emitted (the deltas of the rerun's ForwardMsgs, without
+# their small envelopes). Runs headless on a throwaway event database:
+#   python -m benchmarks.bench_payload
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'app.py')
+QUESTIONS = 10
+
+
+def _walk(node):
+    yield node
+    for child in getattr(node, 'children', {}).values():
+        yield from _walk(child)
+
+
+def payload(at):
+    # (bytes, elements) of the last rerun
+    protos = [node.proto for node in _walk(at._tree) if hasattr(getattr(node, 'proto', None), 'ByteSize')]
+    return sum(proto.ByteSize() for proto in protos), len(protos)
+
+
+def pages(timeout):
+    # (page, AppTest after one rerun of it)
+    at = AppTest.from_file(APP_PATH, default_timeout=timeout).run()
+    yield 'home', at
+    at.text_area[0].input('i love music and my fans so much').run()
+    for checkbox in at.checkbox:
+        checkbox.check()
+    at.button(key='guess').click().run()
+    yield 'home + guess', at
+
+    for mode in ('easy', 'hard'):
+        at.button(key=f'{mode}_mode').click().run()
+        at.button(key='start_game').click().run()
+        yield f'{mode} question', at
+        for q in range(QUESTIONS):
+            if mode == 'easy':
+                at.button(key=f'option_{q}_0').click().run()
+            else:
+                at.text_input(key='hard_answer').input('Kanye West').run()
+                at.button(key='submit_answer').click().run()
+            if q == 0:
+                yield f'{mode} answered', at
+            if q < QUESTIONS - 1:
+                at.button(key='next_question').click().run()
+        yield f'{mode} final results', at
+        at.button(key='play_again').click().run()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Measure the bytes each app page sends per rerun.')
+    parser.add_argument('--timeout', type=float, default=60.0)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ['TWEETLIKE_EVENTS_DB'] = os.path.join(tmp, 'events.db')
+        print(f"{'page':22s} {'bytes':>8s} {'elements':>9s}")
+        for page, at in pages(args.timeout):
+            assert not at.exception, at.exception
+            size, elements = payload(at)
+            print(f"{page:22s} {size:8d} {elements:9d}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+import argparse
+import sys
+
+import numpy as np
+
+from game_state import GameState
+from question_bank import QuestionBank
+from resources import DEFAULT_TWEETS_PATH, get_tweet_store
+
+# Per-session game state footprint after a full game, as the app used to keep it
+# (per-question tuples, option lists and a list of fake tweet texts) vs
+# game_state.GameState:
+#   python -m benchmarks.bench_session_state
+
+
+def deep_sizeof(obj, seen=None):
+    # sys.getsizeof over containers, plus the buffer of arrays that own their data
+    seen = set() if seen is None else seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, np.ndarray):
+        return size if obj.base is None else size + deep_sizeof(obj.base, seen)
+    if isinstance(obj, dict):
+        return size + sum(deep_sizeof(k, seen) + deep_sizeof(v, seen) for k, v in obj.items())
+    if isinstance(obj, (list, tuple, set)):
+        return size + sum(deep_sizeof(item, seen) for item in obj)
+    if hasattr(obj, '__slots__'):
+        return size + sum(deep_sizeof(getattr(obj, name), seen) for name in obj.__slots__ if hasattr(obj, name))
+    return size
+
+
+def legacy_state(store, game):
+    # The session keys app.py kept per game before GameState, after a full game
+    questions = []
+    for tweet_id, codes in zip(game.tweet_ids, game.options):
+        options = [str(store.authors[code]) for code in codes]
+        questions.append((str(store.author(tweet_id)), str(store.tweet(tweet_id)), options))
+    fake = [question[1] for question, real in zip(questions, game.is_real) if not real]
+    return {
+        'questions': questions,
+        'current_q': 9,
+        'answered': True,
+        'selected_option': questions[-1][2][0],
+        'score': 7,
+        'fake_tweet_count': len(fake),
+        'fake_tweets_list': fake,
+        'total_questions': 10,
+    }
+
+
+def finished_state(game):
+    state = GameState.from_game(game)
+    for _ in range(len(state)):
+        state.show()
+        state.answer('Kanye West', False)
+        state.next_question()
+    return state
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Measure per-session game state size.')
+    parser.add_argument('--tweets', default=DEFAULT_TWEETS_PATH)
+    parser.add_argument('--games', type=int, default=200)
+    args = parser.parse_args(argv)
+
+    store = get_tweet_store(args.tweets)
+    bank = QuestionBank(store, seed=0)
+    games = [bank.next_game() for _ in range(args.games)]
+
+    # Strings the session only references (owned by the CSV-backed store) are not
+    # counted against it
+    shared = {id(author) for author in store.authors} | {id(store.tweet(i)) for i in range(len(store))}
+    legacy = np.mean([deep_sizeof(legacy_state(store, game), set(shared)) for game in games])
+    compact = np.mean([deep_sizeof(finished_state(game), set(shared)) for game in games])
+    print(f"{'legacy session keys':24s} {legacy:8.0f} bytes/session")
+    print(f"{'GameState':24s} {compact:8.0f} bytes/session ({legacy / compact:.1f}x smaller)")
+
+
+if __name__ == '__main__':
+    main()
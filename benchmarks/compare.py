@@ -0,0 +1,56 @@
+import argparse
+import json
+import sys
+
+# Compares two benchmarks.suite result files scenario by scenario:
+#   python -m benchmarks.compare benchmarks/results/OLD.json benchmarks/results/NEW.json
+# Exits with status 1 when any scenario got slower than --threshold, so it can gate CI.
+
+
+def load_results(path):
+    with open(path) as f:
+        data = json.load(f)
+    return data['environment'], {(r['scenario'], r['scale']): r for r in data['results']}
+
+
+def compare(old, new, threshold=1.10):
+    # (scenario, scale, old seconds, new seconds, ratio, status) for scenarios in both
+    rows = []
+    for key in sorted(old.keys() & new.keys(), key=lambda k: (k[0], k[1] or 0)):
+        before, after = old[key]['best'], new[key]['best']
+        ratio = after / before if before else float('inf')
+        if ratio > threshold:
+            status = 'slower'
+        elif ratio < 1 / threshold:
+            status = 'faster'
+        else:
+            status = ''
+        rows.append((*key, before, after, ratio, status))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Compare two benchmark result files.')
+    parser.add_argument('old')
+    parser.add_argument('new')
+    parser.add_argument('--threshold', type=float, default=1.10,
+                        help='new/old time ratio above which a scenario counts as a regression')
+    args = parser.parse_args(argv)
+
+    old_env, old = load_results(args.old)
+    new_env, new = load_results(args.new)
+    print(f"old: {old_env.get('commit')} ({old_env.get('timestamp')})")
+    print(f"new: {new_env.get('commit')} ({new_env.get('timestamp')})")
+    rows = compare(old, new, args.threshold)
+    for scenario, scale, before, after, ratio, status in rows:
+        label = f'x{scale}' if scale is not None else '-'
+        print(f"{scenario:32s} {label:>6s} {before * 1e3:12.3f} ms {after * 1e3:12.3f} ms {ratio:7.2f}x  {status}")
+    for key in sorted(old.keys() ^ new.keys(), key=lambda k: (k[0], k[1] or 0)):
+        label = f'x{key[1]}' if key[1] is not None else '-'
+        print(f"{key[0]:32s} {label:>6s} only in {'old' if key in old else 'new'}")
+    if any(row[-1] == 'slower' for row in rows):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
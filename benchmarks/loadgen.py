@@ -0,0 +1,83 @@
+import argparse
+import statistics
+import threading
+import time
+
+from inference import predict_top_k
+from inference_client import InferenceClient
+from model import DEFAULT_MODEL_PATH, load_model
+
+# Load generator: N concurrent "sessions" sending Guess-sized requests, either
+# in-process (predict_top_k on a shared model, what app.py does by default) or through
+# inference_server.py. Start the server first for --target server:
+#   python inference_server.py &
+#   python -m benchmarks.loadgen --target both --concurrency 32 --duration 10
+
+TWEETS = [
+    "just realized i've been singing the wrong lyrics to my own song all week",
+    "i love music and my fans so much",
+    "ok but who ate my oat milk",
+    "new album dropping friday, no sleep until then",
+    "the creator of the universe would never",
+]
+
+
+def run(send, concurrency, duration):
+    latencies = []
+    lock = threading.Lock()
+    stop_at = time.perf_counter() + duration
+
+    def session(offset):
+        mine = []
+        i = offset
+        while time.perf_counter() < stop_at:
+            tweet = TWEETS[i % len(TWEETS)] + f" #{i}"  # distinct text per request
+            start = time.perf_counter()
+            send(tweet)
+            mine.append(time.perf_counter() - start)
+            i += concurrency
+        with lock:
+            latencies.extend(mine)
+
+    threads = [threading.Thread(target=session, args=(n,)) for n in range(concurrency)]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'throughput': len(latencies) / elapsed,
+        'p50_ms': statistics.median(latencies) * 1000,
+        'p99_ms': latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Compare in-process and server inference under concurrent load.')
+    parser.add_argument('--target', choices=['inprocess', 'server', 'both'], default='both')
+    parser.add_argument('--url', default='http://127.0.0.1:8765')
+    parser.add_argument('--model', default=DEFAULT_MODEL_PATH)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=5.0, help='seconds per target')
+    args = parser.parse_args(argv)
+
+    targets = []
+    if args.target in ('inprocess', 'both'):
+        model = load_model(args.model)
+        targets.append(('in-process', lambda tweet: predict_top_k(model, [tweet], 3)))
+    if args.target in ('server', 'both'):
+        client = InferenceClient(args.url)
+        targets.append((f'server {args.url}', lambda tweet: client.predict([tweet], 3)))
+
+    for name, send in targets:
+        send(TWEETS[0])  # warm up
+        result = run(send, args.concurrency, args.duration)
+        print(f"{name:32s} {result['requests']:7d} req  {result['throughput']:8.1f} req/s  "
+              f"p50 {result['p50_ms']:7.2f} ms  p99 {result['p99_ms']:7.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
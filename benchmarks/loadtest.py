@@ -0,0 +1,205 @@
+import argparse
+import os
+import random
+import resource
+import statistics
+import tempfile
+import threading
+import time
+from collections import defaultdict
+
+from streamlit.testing.v1 import AppTest
+
+import instrumentation
+
+# Headless load test for app.py: N concurrent sessions, each a Streamlit AppTest in
+# this process (so they share resources.py's model and datasets, as sessions of one
+# `streamlit run` server do). Every session plays full easy and hard games and sends
+# Guess requests from Home, pausing a random think time between interactions; each
+# click or input is one script rerun, timed by action. Nothing leaves localhost.
+#   python -m benchmarks.loadtest --sessions 8 --games 2 --guesses 3 --think 1
+# Service time includes AppTest's own overhead (building and walking the element
+# tree); with TWEETLIKE_TIMINGS=1 the app's own per-stage times (instrumentation.py)
+# are printed too, to separate the two.
+# AppTest installs a process-wide runtime for the length of a rerun, so reruns from
+# different sessions run one at a time. "latency" is what a player waits (queueing
+# behind other sessions included), "service" the rerun alone; on one core a real
+# server's script threads share the CPU much the same way.
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'app.py')
+QUESTIONS = 10
+TWEETS = [
+    "just realized i've been singing the wrong lyrics to my own song all week",
+    "i love music and my fans so much",
+    "ok but who ate my oat milk",
+    "new album dropping friday, no sleep until then",
+]
+HARD_ANSWERS = ['Kanye West', 'taylor swift', 'shaq', 'Conan O Brien', 'Elon']
+
+_run_lock = threading.Lock()
+
+
+def rss_bytes():
+    # Current resident set size (Linux); peak RSS where /proc is unavailable
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class Session:
+    def __init__(self, n, timeout, think=0.0):
+        self.n = n
+        self.random = random.Random(n)
+        self.timeout = timeout
+        self.think = think
+        self.latencies = defaultdict(list)  # action -> seconds from interaction to rendered page
+        self.service = []  # seconds spent in the rerun itself
+        self.errors = []
+        self.at = None
+
+    def _rerun(self, action, interact):
+        # interact() finds the widget on the current page and applies the click or input
+        if self.think:
+            time.sleep(self.random.expovariate(1 / self.think))
+        start = time.perf_counter()
+        try:
+            with _run_lock:
+                service_start = time.perf_counter()
+                interact().run(timeout=self.timeout)
+                end = time.perf_counter()
+        except Exception as e:
+            self.errors.append(f'{action}: {e!r}')
+            return False
+        self.latencies[action].append(end - start)
+        self.service.append(end - service_start)
+        if self.at.exception:
+            self.errors.append(f'{action}: {self.at.exception[0].value}')
+            return False
+        return True
+
+    def open(self):
+        self.at = AppTest.from_file(APP_PATH, default_timeout=self.timeout)
+        return self._rerun('open', lambda: self.at)
+
+    def play(self, mode):
+        at = self.at
+        if not (self._rerun('choose_mode', lambda: at.button(key=f'{mode}_mode').click())
+                and self._rerun('start_game', lambda: at.button(key='start_game').click())):
+            return False
+        for q in range(QUESTIONS):
+            if mode == 'easy':
+                option = self.random.randrange(4)
+                if not self._rerun('easy_answer', lambda: at.button(key=f'option_{q}_{option}').click()):
+                    return False
+            else:
+                answer = self.random.choice(HARD_ANSWERS)
+                if not (self._rerun('hard_type', lambda: at.text_input(key='hard_answer').input(answer))
+                        and self._rerun('hard_submit', lambda: at.button(key='submit_answer').click())):
+                    return False
+            action, key = ('next_question', 'next_question') if q < QUESTIONS - 1 else ('play_again', 'play_again')
+            if not self._rerun(action, lambda: at.button(key=key).click()):
+                return False
+        return True
+
+    def guess(self):
+        at = self.at
+        explain = self.random.random() < 0.5
+        tweet = self.random.choice(TWEETS) + f' #{self.n}'
+
+        def type_tweet():
+            for checkbox in at.checkbox:
+                checkbox.set_value(explain)
+            return at.text_area[0].input(tweet)
+
+        return (self._rerun('guess_type', type_tweet)
+                and self._rerun('guess', lambda: at.button(key='guess').click()))
+
+
+def run_session(session, games, guesses):
+    if not session.open():
+        return
+    for game in range(games):
+        if not session.play('easy' if game % 2 == 0 else 'hard'):
+            return
+    for _ in range(guesses):
+        if not session.guess():
+            return
+
+
+def percentile(sorted_values, q):
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * q))]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Load-test app.py with concurrent headless Streamlit sessions.')
+    parser.add_argument('--sessions', type=int, default=8)
+    parser.add_argument('--games', type=int, default=2, help='games per session, alternating easy and hard')
+    parser.add_argument('--guesses', type=int, default=3, help='Guess requests per session')
+    parser.add_argument('--think', type=float, default=0.5, help='mean seconds between interactions (exponential)')
+    parser.add_argument('--timeout', type=float, default=120.0, help='seconds per rerun')
+    args = parser.parse_args(argv)
+
+    # Games played here go to a throwaway event database, not the real leaderboard
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ['TWEETLIKE_EVENTS_DB'] = os.path.join(tmp, 'events.db')
+        return run(args)
+
+
+def run(args):
+    # One warm-up session loads the model and datasets, as the first visitor would
+    warmup = Session(-1, args.timeout)
+    run_session(warmup, 0, 1)
+    del warmup
+    instrumentation.reset()
+
+    sessions = [Session(n, args.timeout, args.think) for n in range(args.sessions)]
+    threads = [threading.Thread(target=run_session, args=(s, args.games, args.guesses)) for s in sessions]
+    rss_before = rss_bytes()
+    cpu_before = time.process_time()
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+    cpu = time.process_time() - cpu_before
+    rss_after = rss_bytes()  # every session's AppTest and session state is still alive here
+
+    by_action = defaultdict(list)
+    for session in sessions:
+        for action, latencies in session.latencies.items():
+            by_action[action].extend(latencies)
+    reruns = sum(len(latencies) for latencies in by_action.values())
+
+    print(f"{'action':14s} {'reruns':>7s} {'p50 ms':>9s} {'p95 ms':>9s} {'p99 ms':>9s} {'max ms':>9s}")
+    for action, latencies in list(by_action.items()) + [('all', [x for v in by_action.values() for x in v])]:
+        latencies.sort()
+        print(f"{action:14s} {len(latencies):7d} {statistics.median(latencies) * 1000:9.1f} "
+              f"{percentile(latencies, 0.95) * 1000:9.1f} {percentile(latencies, 0.99) * 1000:9.1f} "
+              f"{latencies[-1] * 1000:9.1f}")
+    service = sorted(x for s in sessions for x in s.service)
+    print(f"{'service':14s} {len(service):7d} {statistics.median(service) * 1000:9.1f} "
+          f"{percentile(service, 0.95) * 1000:9.1f} {percentile(service, 0.99) * 1000:9.1f} {service[-1] * 1000:9.1f}")
+    print(f"{args.sessions} sessions, {reruns} reruns in {elapsed:.1f}s ({reruns / elapsed:.1f} reruns/s, "
+          f"busy {sum(service) / elapsed:.0%})")
+    print(f"CPU {cpu:.2f}s total, {cpu / args.sessions:.2f}s per session, {cpu / reruns * 1000:.1f} ms per rerun")
+    print(f"RSS {rss_before / 2**20:.1f} -> {rss_after / 2**20:.1f} MiB, "
+          f"{(rss_after - rss_before) / args.sessions / 2**20:.2f} MiB per session")
+    if instrumentation.ENABLED:
+        print(f"\n{'stage':28s} {'count':>7s} {'p50 ms':>9s} {'p95 ms':>9s} {'total s':>9s}")
+        for stage, summary in sorted(instrumentation.snapshot().items(), key=lambda item: -item[1]['total']):
+            print(f"{stage:28s} {summary['count']:7d} {summary['p50'] * 1000:9.1f} "
+                  f"{summary['p95'] * 1000:9.1f} {summary['total']:9.2f}")
+    errors = [f'session {s.n}: {e}' for s in sessions for e in s.errors]
+    for error in errors:
+        print(error)
+    return 1 if errors else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,252 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+import timeit
+from functools import partial
+
+import eli5
+import joblib
+import numpy as np
+import pandas as pd
+import sklearn
+
+import dataset
+from explain import Explainer, to_html
+from inference import predict_top_k, vectorize
+from model import DEFAULT_MODEL_PATH, load_model
+from question_bank import QUESTIONS_PER_GAME, QuestionBank
+from tweet_store import TweetStore
+
+# Benchmark suite for data loading, game generation, inference and explanation, run
+# against synthetic copies of tweets.csv scaled 10x-1000x:
+#   python -m benchmarks.suite                      # writes benchmarks/results/<commit>.json
+#   python -m benchmarks.suite --scales 1,10 --filter game/
+#   python -m benchmarks.compare benchmarks/results/OLD.json benchmarks/results/NEW.json
+# Scenarios named legacy/* reproduce what app.py did before the TweetStore and
+# QuestionBank rewrite, so the old and new paths are measured on the same data.
+
+DEFAULT_TWEETS_PATH = 'data/tweets.csv'
+DEFAULT_RESULTS_DIR = os.path.join('benchmarks', 'results')
+DEFAULT_SCALES = (1, 10, 100, 1000)
+TWEET = "just realized i've been singing the wrong lyrics to my own song all week"
+
+
+def synthetic_tweets(path, scale):
+    # tweets.csv repeated scale times. Copy k gets its own author names ("Taylor Swift 3")
+    # and tweet texts, so authors and distinct tweets grow with the dataset
+    df = pd.read_csv(path)
+    if scale == 1:
+        return df
+    copy = np.repeat(np.arange(scale), len(df))
+    suffix = pd.Series(np.where(copy == 0, '', ' ' + copy.astype(str)))
+    big = pd.concat([df] * scale, ignore_index=True)
+    big['author'] = big['author'].str.strip() + suffix
+    big['tweet'] = big['tweet'] + suffix
+    return big
+
+
+# What app.py did before tweet_store.py / question_bank.py
+
+def legacy_get_random_tweet(df):
+    random_row = df.sample(n=1).iloc[0]
+    return random_row['tweet'], random_row['author']
+
+
+def legacy_get_options(df, correct_author):
+    other_authors = df[df['author'] != correct_author]['author'].unique()
+    sampled_authors = np.random.choice(other_authors, size=3, replace=False).tolist()
+    sampled_authors.append(correct_author)
+    np.random.shuffle(sampled_authors)
+    return sampled_authors
+
+
+def legacy_generate_question_easy(df):
+    tweet, correct_author = legacy_get_random_tweet(df)
+    return correct_author, tweet, legacy_get_options(df, correct_author)
+
+
+def legacy_generate_question_hard(df):
+    tweet, correct_author = legacy_get_random_tweet(df)
+    return correct_author, tweet
+
+
+def legacy_is_real(df, tweet_text):
+    return df[df['tweet'] == tweet_text].iloc[0]['is_real']
+
+
+class Context:
+    # Data and model shared by the scenarios of one scale; built lazily so a
+    # --filter run only pays for what it uses
+    def __init__(self, tweets_path, model_path, scale, tmp_dir):
+        self.tweets_path = tweets_path
+        self.model_path = model_path
+        self.scale = scale
+        self.tmp_dir = tmp_dir
+        self._cache = {}
+
+    def _get(self, name, build):
+        if name not in self._cache:
+            self._cache[name] = build()
+        return self._cache[name]
+
+    @property
+    def df(self):
+        return self._get('df', lambda: synthetic_tweets(self.tweets_path, self.scale))
+
+    @property
+    def csv_path(self):
+        def write():
+            path = os.path.join(self.tmp_dir, f'tweets_x{self.scale}.csv')
+            self.df.to_csv(path, index=False)
+            return path
+        return self._get('csv_path', write)
+
+    @property
+    def columnar_path(self):
+        def write():
+            path = os.path.join(self.tmp_dir, f'tweets_x{self.scale}.columnar')
+            dataset.write_columnar(self.df, path)
+            return path
+        return self._get('columnar_path', write)
+
+    @property
+    def store(self):
+        return self._get('store', lambda: TweetStore.from_frame(self.df))
+
+    @property
+    def bank(self):
+        return self._get('bank', lambda: QuestionBank(self.store, seed=0))
+
+    @property
+    def model(self):
+        return self._get('model', lambda: load_model(self.model_path))
+
+    @property
+    def explainer(self):
+        return self._get('explainer', lambda: Explainer(self.model))
+
+
+def _legacy_game(df):
+    for _ in range(QUESTIONS_PER_GAME):
+        legacy_generate_question_easy(df)
+
+
+def _eli5_explanation(model, X):
+    explanation = eli5.explain_prediction(model.named_steps['clf'], X[0],
+                                          feature_names=model.named_steps['tfidf'].get_feature_names_out())
+    return eli5.format_as_html(explanation)
+
+
+def _native_explanation(explainer, X):
+    return to_html(explainer.explain(X))
+
+
+# name -> (scaled, setup). setup(ctx) returns the zero-argument callable to time.
+# Scenarios with scaled=False do not depend on the dataset and run once.
+SCENARIOS = {
+    'load_data/pandas': (True, lambda ctx: partial(pd.read_csv, ctx.csv_path)),
+    'load_data/tweet_store': (True, lambda ctx: lambda: TweetStore.from_frame(pd.read_csv(ctx.csv_path))),
+    'load_data/columnar_store': (True, lambda ctx: lambda: TweetStore.from_columnar(dataset.open_columnar(ctx.columnar_path))),
+    'question/legacy_easy': (True, lambda ctx: partial(legacy_generate_question_easy, ctx.df)),
+    'question/legacy_hard': (True, lambda ctx: partial(legacy_generate_question_hard, ctx.df)),
+    'game/legacy_pandas': (True, lambda ctx: partial(_legacy_game, ctx.df)),
+    'game/question_bank_generate': (True, lambda ctx: partial(ctx.bank.generate, 1)),
+    'game/question_bank_next': (True, lambda ctx: ctx.bank.next_game),
+    # The old lookup builds a mask over the whole tweet column, whichever row it finds
+    'lookup/legacy_df_filter': (True, lambda ctx: partial(legacy_is_real, ctx.df, ctx.df['tweet'].iloc[-1])),
+    'lookup/tweet_store': (True, lambda ctx: partial(ctx.store.is_real.__getitem__, len(ctx.store) - 1)),
+    'model/joblib_load': (False, lambda ctx: partial(joblib.load, ctx.model_path)),
+    'predict/single_predict_proba': (False, lambda ctx: partial(ctx.model.predict_proba, [TWEET])),
+    'predict/single_top_k': (False, lambda ctx: partial(predict_top_k, ctx.model, [TWEET], k=3)),
+    'predict/batch_predict_proba': (True, lambda ctx: partial(ctx.model.predict_proba, ctx.df['tweet'].tolist())),
+    'explain/eli5': (False, lambda ctx: partial(_eli5_explanation, ctx.model, vectorize(ctx.model, [TWEET]))),
+    'explain/explainer': (False, lambda ctx: partial(_native_explanation, ctx.explainer, vectorize(ctx.model, [TWEET]))),
+}
+
+
+def measure(fn, repeat=5, min_seconds=0.2):
+    # timeit-style: pick a call count that runs for about min_seconds, then repeat
+    fn()  # warm up
+    timer = timeit.Timer(fn)
+    number = 1
+    while True:
+        elapsed = timer.timeit(number)
+        if elapsed >= min_seconds or number >= 1_000_000:
+            break
+        number *= 10 if elapsed < min_seconds / 10 else 2
+    times = [t / number for t in timer.repeat(repeat=repeat, number=number)]
+    return {'best': min(times), 'median': statistics.median(times), 'number': number, 'repeat': repeat}
+
+
+def _git(*args):
+    try:
+        return subprocess.run(['git', *args], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def environment():
+    return {
+        'commit': _git('rev-parse', 'HEAD'),
+        'dirty': bool(_git('status', '--porcelain', '--untracked-files=no')),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'sklearn': sklearn.__version__,
+    }
+
+
+def run(scales=DEFAULT_SCALES, tweets_path=DEFAULT_TWEETS_PATH, model_path=DEFAULT_MODEL_PATH,
+        pattern=None, repeat=5, min_seconds=0.2):
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for i, scale in enumerate(scales):
+            ctx = Context(tweets_path, model_path, scale, tmp_dir)
+            for name, (scaled, setup) in SCENARIOS.items():
+                if pattern and pattern not in name:
+                    continue
+                if not scaled and i > 0:
+                    continue
+                timing = measure(setup(ctx), repeat, min_seconds)
+                result = {'scenario': name, 'scale': scale if scaled else None,
+                          'rows': len(ctx.df) if scaled else None, **timing}
+                results.append(result)
+                print(f"{name:32s} {'x' + str(scale) if scaled else '-':>6s} {timing['best'] * 1e3:12.3f} ms", flush=True)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Run the benchmark scenarios and save the timings as JSON.')
+    parser.add_argument('--scales', default=','.join(map(str, DEFAULT_SCALES)),
+                        help='comma-separated multiples of tweets.csv')
+    parser.add_argument('--filter', help='only scenarios whose name contains this')
+    parser.add_argument('--tweets', default=DEFAULT_TWEETS_PATH)
+    parser.add_argument('--model', default=DEFAULT_MODEL_PATH)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--min-seconds', type=float, default=0.2, help='target duration of one repeat')
+    parser.add_argument('--output', help='JSON path (default: benchmarks/results/<commit>.json)')
+    args = parser.parse_args(argv)
+
+    env = environment()
+    results = run([int(s) for s in args.scales.split(',')], args.tweets, args.model, args.filter,
+                  args.repeat, args.min_seconds)
+    output = args.output
+    if output is None:
+        name = (env['commit'] or 'unknown')[:12] + ('-dirty' if env['dirty'] else '')
+        output = os.path.join(DEFAULT_RESULTS_DIR, f'{name}.json')
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump({'environment': env, 'results': results}, f, indent=2)
+    print(f"Saved {len(results)} results to {output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,316 @@
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+# One loader for the tweet tables (tweets.csv, top_celebs.csv/.parquet) plus a compact
+# columnar format for them:
+#   python dataset.py data/tweets.csv data/tweets.columnar
+# A .columnar directory holds one file per column, written once with the cleanup below
+# already applied:
+#   strings      <col>.offsets.npy (int64, rows + 1) + <col>.blob.npy (UTF-8 bytes)
+#   dictionary   <col>.codes.npy (int32, -1 for missing) + the distinct values in meta.json (authors, avatars)
+#   bool         <col>.bits.npy (np.packbits)
+#   numbers      <col>.npy
+# Arrays are opened with mmap_mode='r', so loading parses nothing but meta.json and
+# every process reading the same directory shares its pages. Strings are decoded one
+# row at a time, on access.
+
+COLUMNAR_FORMAT = 1
+COLUMNAR_SUFFIX = '.columnar'
+META_FILE = 'meta.json'
+AUTHOR_COLUMNS = ('author', 'name')
+TWEET_COLUMN = 'tweet'
+DICTIONARY_COLUMNS = AUTHOR_COLUMNS + ('avatar',)
+
+_APOSTROPHES = str.maketrans({'’': "'", '‘': "'", 'ʼ': "'", '`': "'", '´': "'"})
+
+
+### CLEANUP ###
+
+def clean_names(names):
+    # "Frankie Muniz\n" -> "Frankie Muniz", "Conan O’Brien" -> "Conan O'Brien"
+    return names.str.translate(_APOSTROPHES).str.split().str.join(' ')
+
+
+def clean_tweets(tweets):
+    # Surrounding whitespace, and the quotes wrapping a whole tweet ('"My daily..."')
+    tweets = tweets.str.strip()
+    wrapped = (tweets.str.len() >= 2) & (
+        (tweets.str.startswith('"') & tweets.str.endswith('"') & (tweets.str.count('"') == 2))
+        | (tweets.str.startswith('“') & tweets.str.endswith('”'))
+    )
+    return tweets.mask(wrapped, tweets.str[1:-1].str.strip())
+
+
+def clean_frame(df):
+    df = df.copy()
+    for column in df.columns:
+        if column in AUTHOR_COLUMNS:
+            df[column] = clean_names(df[column])
+        elif column == TWEET_COLUMN:
+            df[column] = clean_tweets(df[column])
+    return df
+
+
+### COLUMNAR FORMAT ###
+
+def is_columnar(path):
+    return os.path.isfile(os.path.join(path, META_FILE))
+
+
+def signature_path(path):
+    # File whose stat and content identify the dataset, for resources.cached
+    return os.path.join(path, META_FILE) if is_columnar(path) else path
+
+
+def resolve(path):
+    # data/tweets.csv -> data/tweets.columnar when a conversion at least as new exists
+    columnar_path = os.path.splitext(path)[0] + COLUMNAR_SUFFIX
+    if path != columnar_path and is_columnar(columnar_path):
+        if not os.path.exists(path) or os.path.getmtime(signature_path(columnar_path)) >= os.path.getmtime(path):
+            return columnar_path
+    return path
+
+
+class StringColumn:
+    # Offsets into one UTF-8 blob; row i is blob[offsets[i]:offsets[i + 1]]
+    def __init__(self, offsets, blob):
+        self.offsets = offsets
+        self.blob = blob
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        return self.blob[self.offsets[i]:self.offsets[i + 1]].tobytes().decode('utf-8')
+
+    def slice(self, start, stop):
+        # Rows start..stop-1 without touching the rest of the blob
+        offsets = np.asarray(self.offsets[start:stop + 1])
+        return StringColumn(offsets - offsets[0], self.blob[offsets[0]:offsets[-1]])
+
+    def to_numpy(self):
+        raw = self.blob.tobytes()
+        offsets = self.offsets.tolist()
+        return np.array([raw[a:b].decode('utf-8') for a, b in zip(offsets[:-1], offsets[1:])], dtype=object)
+
+
+class DictionaryColumn:
+    # Integer codes into a short tuple of distinct values; code -1 is a missing value
+    def __init__(self, codes, values):
+        self.codes = codes
+        self.values = tuple(values)
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __getitem__(self, i):
+        code = self.codes[i]
+        return self.values[code] if code >= 0 else None
+
+    def slice(self, start, stop):
+        return DictionaryColumn(self.codes[start:stop], self.values)
+
+    def to_numpy(self):
+        # The None appended last is what code -1 indexes
+        return np.array(self.values + (None,), dtype=object)[self.codes]
+
+
+class ColumnarTable:
+    def __init__(self, path, mmap=True):
+        self.path = path
+        with open(os.path.join(path, META_FILE)) as f:
+            self.meta = json.load(f)
+        if self.meta.get('format', COLUMNAR_FORMAT) > COLUMNAR_FORMAT:
+            raise ValueError(f"{path} has columnar format {self.meta['format']}; this code reads up to {COLUMNAR_FORMAT}")
+        self._mmap_mode = 'r' if mmap else None
+        self._columns = {}
+
+    def __len__(self):
+        return self.meta['rows']
+
+    @property
+    def columns(self):
+        return [column['name'] for column in self.meta['columns']]
+
+    def _load(self, name, suffix):
+        return np.load(os.path.join(self.path, f'{name}.{suffix}.npy'), mmap_mode=self._mmap_mode)
+
+    def column(self, name):
+        if name not in self._columns:
+            spec = self._spec(name)
+            if spec['kind'] == 'string':
+                column = StringColumn(self._load(name, 'offsets'), self._load(name, 'blob'))
+            elif spec['kind'] == 'dictionary':
+                column = DictionaryColumn(self._load(name, 'codes'), spec['values'])
+            elif spec['kind'] == 'bool':
+                column = np.unpackbits(self._load(name, 'bits'), count=len(self)).astype(bool)
+            else:
+                column = np.load(os.path.join(self.path, f'{name}.npy'), mmap_mode=self._mmap_mode)
+            self._columns[name] = column
+        return self._columns[name]
+
+    def _spec(self, name):
+        spec = next((c for c in self.meta['columns'] if c['name'] == name), None)
+        if spec is None:
+            raise KeyError(name)
+        return spec
+
+    def _rows(self, name, start, stop):
+        # Only rows start..stop-1 are decoded: strings and codes are sliced first, and
+        # bool columns unpack just the bytes covering the range
+        if self._spec(name)['kind'] == 'bool':
+            bits = self._load(name, 'bits')[start // 8:(stop + 7) // 8]
+            first = start - start // 8 * 8
+            return np.unpackbits(bits)[first:first + stop - start].astype(bool)
+        column = self.column(name)
+        if isinstance(column, np.ndarray):
+            return np.asarray(column[start:stop])
+        return column.slice(start, stop).to_numpy()
+
+    def to_frame(self, columns=None, start=0, stop=None):
+        start, stop, _ = slice(start, stop).indices(len(self))
+        stop = max(start, stop)
+        return pd.DataFrame({name: self._rows(name, start, stop) for name in columns or self.columns})
+
+
+def open_columnar(path, mmap=True):
+    return ColumnarTable(path, mmap)
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _write_columns(df, directory):
+    columns = []
+    for name in df.columns:
+        series = df[name]
+        if series.dtype == bool:
+            np.save(os.path.join(directory, f'{name}.bits.npy'), np.packbits(series.to_numpy()))
+            columns.append({'name': name, 'kind': 'bool'})
+        elif pd.api.types.is_numeric_dtype(series):
+            np.save(os.path.join(directory, f'{name}.npy'), series.to_numpy())
+            columns.append({'name': name, 'kind': 'numeric', 'dtype': str(series.dtype)})
+        elif name in DICTIONARY_COLUMNS:
+            codes, values = pd.factorize(series)
+            np.save(os.path.join(directory, f'{name}.codes.npy'), codes.astype(np.int32))
+            columns.append({'name': name, 'kind': 'dictionary', 'values': [str(v) for v in values]})
+        else:
+            encoded = [str(v).encode('utf-8') for v in series.fillna('')]
+            offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+            np.cumsum([len(b) for b in encoded], out=offsets[1:])
+            np.save(os.path.join(directory, f'{name}.offsets.npy'), offsets)
+            np.save(os.path.join(directory, f'{name}.blob.npy'), np.frombuffer(b''.join(encoded), dtype=np.uint8))
+            columns.append({'name': name, 'kind': 'string'})
+    return columns
+
+
+def write_columnar(df, path, source=None):
+    # Built in a temporary directory and swapped in, so readers never see a partial
+    # table; processes still mapping the old files keep them until they reopen
+    df = clean_frame(df)
+    parent = os.path.dirname(os.path.abspath(path))
+    tmp_dir = tempfile.mkdtemp(dir=parent, suffix='.tmp')
+    try:
+        # mkdtemp makes the directory 0700; readable by other users like a plain mkdir
+        umask = os.umask(0)
+        os.umask(umask)
+        os.chmod(tmp_dir, 0o777 & ~umask)
+        meta = {
+            'format': COLUMNAR_FORMAT,
+            'rows': len(df),
+            'created': time.time(),
+            'source': source,
+            'source_sha256': file_sha256(source) if source and os.path.isfile(source) else None,
+            'columns': _write_columns(df, tmp_dir),
+        }
+        with open(os.path.join(tmp_dir, META_FILE), 'w') as f:
+            json.dump(meta, f, indent=2)
+        old_dir = None
+        if os.path.exists(path):
+            old_dir = tempfile.mkdtemp(dir=parent, suffix='.old')
+            os.rename(path, os.path.join(old_dir, 'table'))
+        os.rename(tmp_dir, path)
+        if old_dir:
+            shutil.rmtree(old_dir)
+    except BaseException:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+    return meta
+
+
+### LOADER API ###
+
+def table_columns(path):
+    if isinstance(path, pd.DataFrame):
+        return list(path.columns)
+    if is_columnar(path):
+        return open_columnar(path).columns
+    if path.endswith('.parquet'):
+        return pq.read_schema(path).names
+    return list(pd.read_csv(path, nrows=0).columns)
+
+
+def read_table(path, columns=None):
+    # Cleaned DataFrame from a .columnar directory, .parquet or .csv
+    if is_columnar(path):
+        return open_columnar(path).to_frame(columns)
+    if path.endswith('.parquet'):
+        df = pd.read_parquet(path, columns=columns)
+    else:
+        df = pd.read_csv(path, usecols=columns)
+    return clean_frame(df)
+
+
+def iter_chunks(path, chunksize=100_000):
+    # Cleaned DataFrames of at most chunksize rows; path may also be a DataFrame
+    # Only one chunk is decoded at a time, whatever the format
+    if isinstance(path, pd.DataFrame) or is_columnar(path):
+        if isinstance(path, pd.DataFrame):
+            n_rows, get = len(path), lambda start: clean_frame(path.iloc[start:start + chunksize])
+        else:
+            table = open_columnar(path)
+            n_rows, get = len(table), lambda start: table.to_frame(start=start, stop=start + chunksize)
+        for start in range(0, n_rows, chunksize):
+            yield get(start).reset_index(drop=True)
+        return
+    if path.endswith('.parquet'):
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize):
+            yield clean_frame(batch.to_pandas())
+        return
+    for chunk in pd.read_csv(path, chunksize=chunksize):
+        yield clean_frame(chunk)
+
+
+def convert(input_path, output_path):
+    return write_columnar(read_table(input_path), output_path, source=input_path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Convert a tweets CSV or Parquet table to the columnar format.')
+    parser.add_argument('input', help='.csv or .parquet table')
+    parser.add_argument('output', nargs='?', help=f'output directory (default: input with {COLUMNAR_SUFFIX})')
+    args = parser.parse_args(argv)
+
+    output = args.output or os.path.splitext(args.input)[0] + COLUMNAR_SUFFIX
+    start = time.perf_counter()
+    meta = convert(args.input, output)
+    kinds = ', '.join(f"{c['name']}: {c['kind']}" for c in meta['columns'])
+    print(f"{meta['rows']} rows -> {output} ({kinds}) in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,257 @@
+import atexit
+import os
+import queue
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+
+# Persistent gameplay analytics: every answer and finished game goes to a local SQLite
+# database (WAL mode) for the global leaderboard and per-tweet difficulty. Reruns
+# never touch SQLite: record_*() drop the event on a bounded queue (or count it as
+# dropped when the queue is full) and one writer thread per process inserts in
+# batches, updating the leaderboard and per-tweet aggregates in the same transaction.
+# Reads come from an in-memory Snapshot the writer refreshes every few seconds, so
+# games written by other processes show up too; a refresh only fetches the tweets
+# answered since the last one (answers.id is the watermark). A database that cannot be opened
+# leaves the store disabled (self.error set, EMPTY_SNAPSHOT, writes ignored) rather
+# than failing the app.
+# TWEETLIKE_EVENTS_DB overrides the database path.
+
+EVENTS_DB_ENV = 'TWEETLIKE_EVENTS_DB'
+DEFAULT_EVENTS_DB = 'tweetlike_events.db'
+MODES = ('easy', 'hard')
+LEADERBOARD_SIZE = 10
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS answers (
+    id INTEGER PRIMARY KEY, at REAL, player TEXT, game TEXT, mode TEXT, question INTEGER,
+    tweet TEXT, author TEXT, is_real INTEGER, selected TEXT, correct INTEGER
+);
+CREATE TABLE IF NOT EXISTS games (
+    game TEXT PRIMARY KEY, player TEXT, name TEXT, mode TEXT, score INTEGER, questions INTEGER,
+    fake_seen INTEGER, finished_at REAL
+);
+CREATE TABLE IF NOT EXISTS leaderboard (
+    player TEXT, mode TEXT, name TEXT, games INTEGER, total_score INTEGER, best_score INTEGER,
+    updated_at REAL, PRIMARY KEY (player, mode)
+);
+CREATE INDEX IF NOT EXISTS leaderboard_rank ON leaderboard (mode, best_score DESC, total_score DESC);
+CREATE TABLE IF NOT EXISTS tweet_stats (
+    tweet TEXT PRIMARY KEY, author TEXT, is_real INTEGER, answers INTEGER, correct INTEGER
+);
+"""
+
+_INSERT_ANSWER = 'INSERT INTO answers VALUES (NULL, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)'
+_UPDATE_TWEET = """
+INSERT INTO tweet_stats VALUES (?, ?, ?, 1, ?)
+ON CONFLICT (tweet) DO UPDATE SET answers = answers + 1, correct = correct + excluded.correct
+"""
+_INSERT_GAME = 'INSERT OR IGNORE INTO games VALUES (?, ?, ?, ?, ?, ?, ?, ?)'
+_UPDATE_LEADERBOARD = """
+INSERT INTO leaderboard VALUES (?, ?, ?, 1, ?, ?, ?)
+ON CONFLICT (player, mode) DO UPDATE SET
+    name = excluded.name, games = games + 1, total_score = total_score + excluded.total_score,
+    best_score = max(best_score, excluded.best_score), updated_at = excluded.updated_at
+"""
+
+Answer = namedtuple('Answer', ['at', 'player', 'game', 'mode', 'question', 'tweet', 'author', 'is_real', 'selected', 'correct'])
+GameResult = namedtuple('GameResult', ['game', 'player', 'name', 'mode', 'score', 'questions', 'fake_seen', 'finished_at'])
+# leaderboard: mode -> [(name, best_score, games, average_score)], best first;
+# tweets: tweet text -> (answers, correct), one dict the writer thread updates in
+# place, so look tweets up with .get() rather than iterating it while games are played
+Snapshot = namedtuple('Snapshot', ['leaderboard', 'tweets', 'games', 'answers', 'taken_at'])
+
+EMPTY_SNAPSHOT = Snapshot({mode: [] for mode in MODES}, {}, 0, 0, 0.0)
+_STOP = object()
+
+
+class EventStore:
+    def __init__(self, path=DEFAULT_EVENTS_DB, max_queue=10_000, batch_size=500, flush_interval=0.5,
+                 snapshot_interval=5.0):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.snapshot_interval = snapshot_interval
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._snapshot = EMPTY_SNAPSHOT
+        self._tweets = {}  # the snapshots' tweets dict
+        self._answers = 0  # sum of its answer counts
+        self._last_answer_id = 0  # answers up to this id are in _tweets
+        self._stats_lock = threading.Lock()
+        self._stats = {'queued': 0, 'dropped': 0, 'written': 0, 'batches': 0, 'errors': 0,
+                       'last_batch_seconds': 0.0, 'last_snapshot_seconds': 0.0}
+        self.error = None
+        self._thread = None
+        try:
+            # Opened here, so a bad path fails fast; only the writer thread uses it afterwards
+            conn = self._connect()
+            self._read_snapshot(conn)
+        except sqlite3.Error as e:
+            self.error = e
+            return
+        self._thread = threading.Thread(target=self._run, args=(conn,), name='events-writer', daemon=True)
+        self._thread.start()
+
+    ### WRITE PATH (any thread) ###
+
+    def _put(self, event):
+        if self._thread is None:
+            self._count('dropped')
+            return False
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            self._count('dropped')
+            return False
+        self._count('queued')
+        return True
+
+    def record_answer(self, player, game, mode, question, tweet, author, is_real, selected, correct):
+        return self._put(Answer(time.time(), player, game, mode, question, tweet, author,
+                                int(is_real), selected, int(correct)))
+
+    def record_game(self, game, player, name, mode, score, questions, fake_seen):
+        return self._put(GameResult(game, player, name, mode, score, questions, fake_seen, time.time()))
+
+    def flush(self, timeout=None):
+        # Block until everything queued so far is written and visible in the snapshot;
+        # False if that took longer than timeout, or the queue stayed full that long
+        if self._thread is None:
+            return True
+        done = threading.Event()
+        try:
+            self._queue.put(done, timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+
+    def close(self):
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join()
+
+    ### READ PATH ###
+
+    def snapshot(self):
+        return self._snapshot
+
+    def tweet_accuracy(self, tweet):
+        # (answers, share correct) across all players, or None before the first answer
+        answers, correct = self._snapshot.tweets.get(tweet, (0, 0))
+        return (answers, correct / answers) if answers else None
+
+    def stats(self):
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats['pending'] = self._queue.qsize()
+        stats['error'] = str(self.error) if self.error else None
+        return stats
+
+    ### WRITER THREAD ###
+
+    def _count(self, name, n=1):
+        with self._stats_lock:
+            self._stats[name] += n
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.executescript(_SCHEMA)
+        return conn
+
+    def _write(self, conn, batch):
+        answers = [e for e in batch if isinstance(e, Answer)]
+        games = [e for e in batch if isinstance(e, GameResult)]
+        start = time.perf_counter()
+        with conn:
+            conn.executemany(_INSERT_ANSWER, answers)
+            conn.executemany(_UPDATE_TWEET, [(a.tweet, a.author, a.is_real, a.correct) for a in answers])
+            for g in games:
+                # A game is counted once, even if its result is recorded twice
+                if conn.execute(_INSERT_GAME, g).rowcount:
+                    conn.execute(_UPDATE_LEADERBOARD, (g.player, g.mode, g.name, g.score, g.score, g.finished_at))
+        with self._stats_lock:
+            self._stats['written'] += len(batch)
+            self._stats['batches'] += 1
+            self._stats['last_batch_seconds'] = time.perf_counter() - start
+
+    def _read_snapshot(self, conn):
+        start = time.perf_counter()
+        leaderboard = {}
+        for mode in MODES:
+            rows = conn.execute(
+                'SELECT name, best_score, games, total_score FROM leaderboard WHERE mode = ? '
+                'ORDER BY best_score DESC, total_score DESC LIMIT ?', (mode, LEADERBOARD_SIZE))
+            leaderboard[mode] = [(name, best, games, total / games) for name, best, games, total in rows]
+        # Only tweets answered since the last refresh. An answer and its tweet_stats
+        # update commit together, so stats are never behind the watermark; rows
+        # committed after max(id) is read are fetched again next time, harmlessly
+        last_answer_id = conn.execute('SELECT max(id) FROM answers').fetchone()[0] or 0
+        if self._last_answer_id:
+            changed = conn.execute(
+                'SELECT tweet, answers, correct FROM tweet_stats WHERE tweet IN '
+                '(SELECT tweet FROM answers WHERE id > ? AND id <= ?)', (self._last_answer_id, last_answer_id))
+        else:
+            changed = conn.execute('SELECT tweet, answers, correct FROM tweet_stats')  # first load
+        for tweet, answers, correct in changed:
+            self._answers += answers - self._tweets.get(tweet, (0, 0))[0]
+            self._tweets[tweet] = (answers, correct)
+        self._last_answer_id = last_answer_id
+        # Games are only ever inserted, so the largest rowid is the count, without a scan
+        games = conn.execute('SELECT max(rowid) FROM games').fetchone()[0] or 0
+        self._snapshot = Snapshot(leaderboard, self._tweets, games, self._answers, time.time())
+        with self._stats_lock:
+            self._stats['last_snapshot_seconds'] = time.perf_counter() - start
+
+    def _run(self, conn):
+        dirty = False
+        last_snapshot = time.monotonic()
+        while True:
+            try:
+                batch = [self._queue.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                batch = []
+            while batch and len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            waiters = [e for e in batch if isinstance(e, threading.Event)]
+            stop = any(e is _STOP for e in batch)
+            events = [e for e in batch if isinstance(e, (Answer, GameResult))]
+            if events:
+                try:
+                    self._write(conn, events)
+                    dirty = True
+                except sqlite3.Error:
+                    self._count('errors')
+            # Periodically even when this process wrote nothing, for other processes' games
+            if (dirty and (waiters or stop)) or time.monotonic() - last_snapshot >= self.snapshot_interval:
+                try:
+                    self._read_snapshot(conn)
+                except sqlite3.Error:
+                    self._count('errors')
+                dirty = False
+                last_snapshot = time.monotonic()
+            for waiter in waiters:
+                waiter.set()
+            if stop:
+                conn.close()
+                return
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_store(path=None):
+    # Shared store for path (default: $TWEETLIKE_EVENTS_DB or tweetlike_events.db),
+    # flushed at interpreter exit
+    path = path or os.environ.get(EVENTS_DB_ENV) or DEFAULT_EVENTS_DB
+    with _stores_lock:
+        if path not in _stores:
+            _stores[path] = EventStore(path)
+            atexit.register(_stores[path].close)
+        return _stores[path]
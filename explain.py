@@ -0,0 +1,112 @@
+import html
+from collections import namedtuple
+
+import numpy as np
+
+# Per-token explanation of a prediction, a lighter stand-in for eli5.explain_prediction.
+# Feature names and coefficients are pulled out of the pipeline once when the
+# Explainer is built; a request then only touches the tweet's nonzero TF-IDF features.
+
+BIAS = '<BIAS>'
+
+Contribution = namedtuple('Contribution', ['feature', 'weight', 'value'])
+TargetExplanation = namedtuple('TargetExplanation', ['target', 'proba', 'score', 'pos', 'neg'])
+
+
+class Explainer:
+    def __init__(self, model):
+        vectorizer = model.named_steps['tfidf']
+        classifier = model.named_steps['clf']
+        self.feature_names = vectorizer.get_feature_names_out()
+        # A char_wb model (train.py --search can pick one) has n-grams, not words, as features
+        self.word_features = vectorizer.analyzer == 'word'
+        coef = classifier.coef_
+        # Binary logistic regression keeps one row of weights, for the positive class
+        self.targets = list(classifier.classes_[1:] if coef.shape[0] == 1 else classifier.classes_)
+        # One contiguous row per feature, so gathering a tweet's features is a single take
+        self.coef_by_feature = np.ascontiguousarray(coef.T)
+        self.intercept = np.asarray(classifier.intercept_, dtype=float)
+        self.target_index = {target: t for t, target in enumerate(self.targets)}
+
+    def contributions(self, X):
+        # (nnz, n_targets) contributions of the first row of X, plus the row's feature indices
+        row = X[0].tocsr()
+        return row.indices, row.data[:, None] * self.coef_by_feature[row.indices], row.data
+
+    def explain(self, X, targets=None, top=20):
+        # Mirrors eli5: every class by default, features ranked by |contribution|,
+        # the intercept reported as the <BIAS> feature
+        indices, contrib, values = self.contributions(X)
+        scores = contrib.sum(axis=0) + self.intercept
+        if len(self.targets) == 1:
+            probas = 1 / (1 + np.exp(-scores))
+        else:
+            exp = np.exp(scores - scores.max())
+            probas = exp / exp.sum()
+
+        names = self.feature_names[indices]
+        explanations = []
+        for t, target in enumerate(self.targets):
+            if targets is not None and target not in targets:
+                continue
+            features = [Contribution(name, float(w), float(v)) for name, w, v in zip(names, contrib[:, t], values)]
+            features.append(Contribution(BIAS, float(self.intercept[t]), 1.0))
+            features.sort(key=lambda f: abs(f.weight), reverse=True)
+            features = features[:top]
+            pos = sorted((f for f in features if f.weight > 0), key=lambda f: f.weight, reverse=True)
+            neg = sorted((f for f in features if f.weight < 0), key=lambda f: f.weight)
+            explanations.append(TargetExplanation(target, float(probas[t]), float(scores[t]), pos, neg))
+        return explanations
+
+
+    def top_words(self, X, target, n=5):
+        # Tokens that pushed the first row of X towards target the most, by TF-IDF value x
+        # coefficient. X comes from the pipeline's own vectorizer, so these are the
+        # analyzer's tokens rather than a whitespace split of the raw text. None when the
+        # features are character n-grams, which would read as fragments of words.
+        if not self.word_features:
+            return None
+        row = X[0].tocsr()
+        if target in self.target_index:
+            weights = row.data * self.coef_by_feature[row.indices, self.target_index[target]]
+        else:
+            # Negative class of a binary model
+            weights = -row.data * self.coef_by_feature[row.indices, 0]
+        order = np.argsort(-weights, kind='stable')[:n]
+        return [str(self.feature_names[row.indices[i]]) for i in order if weights[i] > 0]
+
+
+def to_json(explanations):
+    return [
+        {
+            'target': e.target,
+            'proba': e.proba,
+            'score': e.score,
+            'pos': [f._asdict() for f in e.pos],
+            'neg': [f._asdict() for f in e.neg],
+        }
+        for e in explanations
+    ]
+
+
+def _row(feature, max_weight):
+    # Same green/red shading idea as eli5, scaled by the strongest weight shown
+    alpha = 0.15 + 0.65 * abs(feature.weight) / max_weight if max_weight else 0.15
+    color = f"rgba(0, 160, 0, {alpha:.2f})" if feature.weight > 0 else f"rgba(220, 0, 0, {alpha:.2f})"
+    return (f"<tr style='background-color: {color};'><td style='padding: 2px 10px; text-align: right;'>"
+            f"{feature.weight:+.3f}</td><td style='padding: 2px 10px;'>{html.escape(feature.feature)}</td></tr>")
+
+
+def to_html(explanations):
+    parts = []
+    for e in explanations:
+        features = e.pos + e.neg[::-1]
+        max_weight = max((abs(f.weight) for f in features), default=0)
+        parts.append(
+            f"<p><b>y={html.escape(str(e.target))}</b> (probability <b>{e.proba:.3f}</b>, score <b>{e.score:.3f}</b>)</p>"
+            "<table style='border-collapse: collapse; margin-bottom: 16px;'>"
+            "<tr><th style='padding: 2px 10px;'>Contribution</th><th style='padding: 2px 10px;'>Feature</th></tr>"
+            + ''.join(_row(f, max_weight) for f in features)
+            + "</table>"
+        )
+    return ''.join(parts)
@@ -0,0 +1,105 @@
+import argparse
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+
+from model import DEFAULT_MODEL_PATH, load_metadata, load_model
+
+# Exports the fitted TF-IDF + LogisticRegression pipeline for numpy_runtime.py:
+#   python export_numpy.py --model tweetlike_model.pkl --output tweetlike_model_numpy
+# The output directory holds config.json, vocabulary.json (terms in feature order) and
+# float32 idf/coef/intercept .npy files that NumpyModel memory-maps (plus ai_coef and
+# ai_intercept for train.py --ai-head artifacts). Re-exporting builds a new directory
+# and swaps it in, so a worker never maps a mix of old and new arrays.
+
+DEFAULT_EXPORT_PATH = 'tweetlike_model_numpy'
+
+
+def _vectorizer_config(vectorizer):
+    if not isinstance(vectorizer, TfidfVectorizer):
+        raise ValueError(f"only TfidfVectorizer can be exported, not {type(vectorizer).__name__}")
+    if callable(vectorizer.analyzer) or vectorizer.preprocessor is not None or vectorizer.tokenizer is not None:
+        raise ValueError('custom analyzer, preprocessor or tokenizer callables cannot be exported')
+    if vectorizer.strip_accents not in (None, 'ascii', 'unicode'):
+        raise ValueError(f"strip_accents={vectorizer.strip_accents!r} cannot be exported")
+    stop_words = vectorizer.get_stop_words()
+    return {
+        'analyzer': vectorizer.analyzer,
+        'lowercase': vectorizer.lowercase,
+        'strip_accents': vectorizer.strip_accents,
+        'token_pattern': vectorizer.token_pattern,
+        'ngram_range': list(vectorizer.ngram_range),
+        'stop_words': sorted(stop_words) if stop_words else None,
+        'binary': vectorizer.binary,
+        'norm': vectorizer.norm,
+        'use_idf': vectorizer.use_idf,
+        'sublinear_tf': vectorizer.sublinear_tf,
+    }
+
+
+def export(model, output_path, version=None):
+    vectorizer = model.named_steps['tfidf']
+    classifier = model.named_steps['clf']
+    if not isinstance(classifier, LogisticRegression):
+        raise ValueError(f"only LogisticRegression can be exported, not {type(classifier).__name__}")
+
+    ai_head = getattr(model, 'ai_head', None)
+    config = {
+        'version': version,
+        'classes': [str(c) for c in classifier.classes_],
+        'vectorizer': _vectorizer_config(vectorizer),
+        'ai_head': ai_head is not None,
+    }
+    if ai_head is not None and list(ai_head.classes_) != [False, True]:
+        raise ValueError(f"unexpected AI head classes {list(ai_head.classes_)}")
+
+    # Same swap as dataset.write_columnar: processes still mapping the old arrays keep
+    # them until they reload
+    parent = os.path.dirname(os.path.abspath(output_path))
+    tmp_dir = tempfile.mkdtemp(dir=parent, suffix='.tmp')
+    try:
+        umask = os.umask(0)
+        os.umask(umask)
+        os.chmod(tmp_dir, 0o777 & ~umask)
+        with open(os.path.join(tmp_dir, 'config.json'), 'w') as f:
+            json.dump(config, f, indent=2)
+        with open(os.path.join(tmp_dir, 'vocabulary.json'), 'w') as f:
+            json.dump([str(term) for term in vectorizer.get_feature_names_out()], f)
+        idf = vectorizer.idf_ if vectorizer.use_idf else np.ones(len(vectorizer.vocabulary_))
+        np.save(os.path.join(tmp_dir, 'idf.npy'), idf.astype(np.float32))
+        np.save(os.path.join(tmp_dir, 'coef.npy'), np.ascontiguousarray(classifier.coef_.T, dtype=np.float32))
+        np.save(os.path.join(tmp_dir, 'intercept.npy'), classifier.intercept_.astype(np.float32))
+        if ai_head is not None:
+            # Binary head: one weight vector, positive class is True (AI-generated)
+            np.save(os.path.join(tmp_dir, 'ai_coef.npy'), ai_head.coef_[0].astype(np.float32))
+            np.save(os.path.join(tmp_dir, 'ai_intercept.npy'), ai_head.intercept_.astype(np.float32))
+        old_dir = None
+        if os.path.exists(output_path):
+            old_dir = tempfile.mkdtemp(dir=parent, suffix='.old')
+            os.rename(output_path, os.path.join(old_dir, 'model'))
+        os.rename(tmp_dir, output_path)
+        if old_dir:
+            shutil.rmtree(old_dir)
+    except BaseException:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+    return config
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Export the sklearn model for the pure-NumPy runtime.')
+    parser.add_argument('--model', default=DEFAULT_MODEL_PATH)
+    parser.add_argument('--output', default=DEFAULT_EXPORT_PATH)
+    args = parser.parse_args(argv)
+
+    config = export(load_model(args.model), args.output, load_metadata(args.model).get('version'))
+    print(f"Exported {len(config['classes'])} classes to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
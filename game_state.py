@@ -0,0 +1,99 @@
+import uuid
+from dataclasses import dataclass
+
+import numpy as np
+
+# Everything one session needs to play a game, in one small object kept in
+# st.session_state.game. Questions are tweet IDs and option author codes (copied out
+# of the question bank so a session does not pin the bank's arrays); per-question
+# flags are bits of plain ints (bit q is question q), so bookkeeping is a bit
+# operation that does the same thing however often Streamlit reruns the script.
+
+
+def _mask(flags):
+    return sum(1 << q for q, flag in enumerate(flags) if flag)
+
+
+@dataclass(slots=True)
+class GameState:
+    tweet_ids: np.ndarray  # int32, one per question
+    options: np.ndarray  # int32, one row of option author codes per question
+    fake: int  # questions whose tweet is AI-generated
+    seen: int = 0  # questions shown so far
+    answered: int = 0
+    correct: int = 0
+    current: int = 0
+    selected: str = None  # answer given to the current question
+    game_id: str = ''  # for events.py
+
+    @classmethod
+    def from_game(cls, game):
+        return cls(
+            tweet_ids=np.array(game.tweet_ids, dtype=np.int32),
+            options=np.array(game.options, dtype=np.int32),
+            fake=_mask(~np.asarray(game.is_real, dtype=bool)),
+            game_id=uuid.uuid4().hex,
+        )
+
+    def __len__(self):
+        return len(self.tweet_ids)
+
+    @property
+    def tweet_id(self):
+        return int(self.tweet_ids[self.current])
+
+    @property
+    def option_codes(self):
+        return self.options[self.current]
+
+    @property
+    def is_real(self):
+        return not self.fake >> self.current & 1
+
+    @property
+    def is_answered(self):
+        return bool(self.answered >> self.current & 1)
+
+    @property
+    def is_correct(self):
+        return bool(self.correct >> self.current & 1)
+
+    @property
+    def is_last(self):
+        return self.current == len(self) - 1
+
+    @property
+    def score(self):
+        return self.correct.bit_count()
+
+    @property
+    def questions_seen(self):
+        return self.seen.bit_count()
+
+    @property
+    def fake_seen(self):
+        return (self.fake & self.seen).bit_count()
+
+    def fake_tweet_ids(self):
+        # AI-generated tweets shown so far, in question order
+        shown = self.fake & self.seen
+        return [int(self.tweet_ids[q]) for q in range(len(self)) if shown >> q & 1]
+
+    def show(self):
+        self.seen |= 1 << self.current
+
+    def answer(self, selected, correct):
+        # Only the first answer to a question counts
+        if self.is_answered:
+            return False
+        bit = 1 << self.current
+        self.answered |= bit
+        if correct:
+            self.correct |= bit
+        self.selected = selected
+        return True
+
+    def next_question(self):
+        if self.current < len(self) - 1:
+            self.current += 1
+            self.selected = None
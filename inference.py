@@ -0,0 +1,48 @@
+from collections import namedtuple
+
+import numpy as np
+
+from model import normalize_tweet
+
+# Shared inference helper for the Guess button and batch scoring: the text is
+# vectorized once, predict_proba runs once, and the prediction and top-k are read
+# off that single probability row.
+
+# top: [(author, probability), ...] best first; ai_probability: P(AI-generated) from
+# the second head of a train.py --ai-head artifact, None for author-only models
+Prediction = namedtuple('Prediction', ['author', 'top', 'ai_probability'], defaults=[None])
+
+
+def vectorize(model, texts):
+    if not hasattr(model, 'steps'):
+        # numpy_runtime.NumpyModel vectorizes (and normalizes) raw texts itself
+        return model.transform(texts)
+    # Every step but the classifier: TF-IDF, or hashing for incremental artifacts
+    return model[:-1].transform([normalize_tweet(text) for text in texts])
+
+
+def top_k_indices(probs, k):
+    # Partial sort: argpartition picks the k largest per row, then only those k are ordered
+    k = min(k, probs.shape[1])
+    idx = np.argpartition(-probs, k - 1, axis=1)[:, :k]
+    order = np.argsort(-np.take_along_axis(probs, idx, axis=1), axis=1)
+    return np.take_along_axis(idx, order, axis=1)
+
+
+def predict_top_k(model, texts, k=3, X=None):
+    # X can be passed in when the caller already vectorized the texts
+    if X is None:
+        X = vectorize(model, texts)
+    if hasattr(model, 'steps'):
+        probs = model[-1].predict_proba(X)
+        classes = model[-1].classes_
+    else:
+        probs = model.predict_proba(texts, X=X)
+        classes = model.classes_
+    # Multi-head artifacts score is_real from the same matrix, no second vectorize
+    ai = model.ai_probability(X) if hasattr(model, 'ai_probability') else None
+    predictions = []
+    for n, (row, idx) in enumerate(zip(probs, top_k_indices(probs, k))):
+        top = [(classes[i], float(row[i])) for i in idx]
+        predictions.append(Prediction(top[0][0], top, None if ai is None else float(ai[n])))
+    return predictions
@@ -0,0 +1,121 @@
+import http.client
+import json
+import os
+import queue
+import socket
+import threading
+from urllib.parse import urlparse
+
+from inference import Prediction
+from similarity import Neighbor
+
+# Client for inference_server.py. Keep-alive connections live in a small pool shared
+# by every thread: a request checks one out and returns it afterwards, so a Guess
+# does not pay a TCP/socket setup even though Streamlit runs each rerun on a fresh
+# thread. At most pool_size idle connections are kept; extras are closed.
+# The app uses it when TWEETLIKE_INFERENCE_URL is set, e.g. http://127.0.0.1:8765
+# or unix:///tmp/tweetlike.sock.
+
+INFERENCE_URL_ENV = 'TWEETLIKE_INFERENCE_URL'
+# What a failed request can raise: socket errors and timeouts, a broken HTTP exchange,
+# a non-200 answer (RuntimeError) or a body that is not JSON
+ERRORS = (OSError, http.client.HTTPException, RuntimeError, ValueError)
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, path, timeout):
+        super().__init__('localhost', timeout=timeout)
+        self._path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self._path)
+
+
+class InferenceClient:
+    def __init__(self, url, timeout=5.0, pool_size=8):
+        self.url = url
+        self.timeout = timeout
+        self._pool = queue.LifoQueue(maxsize=pool_size)  # most recently used first
+
+    def _connect(self):
+        parsed = urlparse(self.url)
+        if parsed.scheme == 'unix':
+            return _UnixHTTPConnection(parsed.path, self.timeout)
+        return http.client.HTTPConnection(parsed.hostname, parsed.port or 80, timeout=self.timeout)
+
+    def _checkout(self, fresh=False):
+        # (connection, whether it was reused from the pool)
+        if not fresh:
+            try:
+                return self._pool.get_nowait(), True
+            except queue.Empty:
+                pass
+        return self._connect(), False
+
+    def _checkin(self, conn):
+        try:
+            self._pool.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def close(self):
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                return
+
+    def _request(self, method, path, payload=None):
+        body = json.dumps(payload).encode() if payload is not None else None
+        headers = {'Content-Type': 'application/json'} if body is not None else {}
+        for attempt in range(2):
+            conn, reused = self._checkout(fresh=attempt > 0)
+            try:
+                conn.request(method, path, body=body, headers=headers)
+                response = conn.getresponse()
+                data = json.loads(response.read())
+            except Exception as e:
+                conn.close()
+                # A pooled connection the server has since closed (restart, idle timeout)
+                # is retried once on a new one. Timeouts are not: resending to a busy
+                # server doubles its load and the caller's wait.
+                if reused and isinstance(e, (ConnectionResetError, BrokenPipeError, http.client.RemoteDisconnected)):
+                    continue
+                raise
+            self._checkin(conn)
+            if response.status != 200:
+                raise RuntimeError(f"inference server returned {response.status}: {data.get('error')}")
+            return data
+
+    def predict(self, tweets, k=3, explain=False, similar=0):
+        # One result dict per tweet: author, top, explanation_html/top_words when explain=True,
+        # and the similar closest real tweets as similarity.Neighbor tuples in 'neighbors'
+        data = self._request('POST', '/predict', {'tweets': list(tweets), 'k': k, 'explain': explain,
+                                                  'similar': similar})
+        results = []
+        for result in data['predictions']:
+            result['prediction'] = Prediction(result['author'], [tuple(pair) for pair in result['top']],
+                                              result.get('ai_probability'))
+            result['neighbors'] = [Neighbor(**neighbor) for neighbor in result.get('similar', [])]
+            results.append(result)
+        return results
+
+    def health(self):
+        return self._request('GET', '/health')
+
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def get_client(url=None):
+    # Shared client for url (default: $TWEETLIKE_INFERENCE_URL), or None when unset
+    url = url or os.environ.get(INFERENCE_URL_ENV)
+    if not url:
+        return None
+    with _clients_lock:
+        if url not in _clients:
+            _clients[url] = InferenceClient(url)
+        return _clients[url]
@@ -0,0 +1,206 @@
+import argparse
+import asyncio
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import dataset
+import similarity
+from explain import Explainer, to_html
+from inference import predict_top_k, vectorize
+from model import DEFAULT_MODEL_PATH, load_metadata, load_model
+
+# Local micro-batching inference server:
+#   python inference_server.py --port 8765            (or --unix /tmp/tweetlike.sock)
+# Requests arriving within max_wait of each other are scored as one batch, so many
+# concurrent sessions share one vectorize + predict_proba instead of running
+# single-row predictions. Speaks just enough HTTP/1.1 (keep-alive, Content-Length)
+# for inference_client.py.
+#
+#   POST /predict  {"tweets": ["..."], "k": 3, "explain": false, "similar": 0}
+#                  (similar: how many of the closest real tweets to return per tweet)
+#   GET  /health
+
+
+class Batcher:
+    def __init__(self, model, explainer, index, max_batch=64, max_wait=0.005):
+        self.model = model
+        self.explainer = explainer
+        self.index = index
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.stats = {'requests': 0, 'items': 0, 'batches': 0, 'largest_batch': 0, 'retried_batches': 0}
+        self._queue = asyncio.Queue()
+        # One scoring thread: keeps the event loop free while numpy/scipy run
+        self._executor = ThreadPoolExecutor(max_workers=1)
+
+    async def submit(self, tweet, k, explain, similar=0):
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((tweet, k, explain, similar, future))
+        return await future
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            self.stats['batches'] += 1
+            self.stats['items'] += len(batch)
+            self.stats['largest_batch'] = max(self.stats['largest_batch'], len(batch))
+            try:
+                results = await loop.run_in_executor(self._executor, self._score, batch)
+            except Exception as e:
+                if len(batch) == 1:
+                    results = [e]
+                else:
+                    # Score the items one by one, so only the bad request fails
+                    self.stats['retried_batches'] += 1
+                    results = [await self._score_one(loop, item) for item in batch]
+            for (*_, future), result in zip(batch, results):
+                if future.done():
+                    continue
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+
+    async def _score_one(self, loop, item):
+        try:
+            return (await loop.run_in_executor(self._executor, self._score, [item]))[0]
+        except Exception as e:
+            return e
+
+    def _score(self, batch):
+        tweets = [tweet for tweet, *_ in batch]
+        k = max(k for _, k, *_ in batch)
+        X = vectorize(self.model, tweets)
+        predictions = predict_top_k(self.model, tweets, k, X=X)
+        most_similar = max(similar for _, _, _, similar, _ in batch)
+        neighbors = self.index.query(X, most_similar) if most_similar else None
+        results = []
+        for i, ((_, item_k, explain, similar, _), prediction) in enumerate(zip(batch, predictions)):
+            result = {'author': prediction.author, 'top': prediction.top[:item_k],
+                      'ai_probability': prediction.ai_probability}
+            if explain:
+                row = X[i]
+                result['explanation_html'] = to_html(self.explainer.explain(row))
+                result['top_words'] = self.explainer.top_words(row, prediction.author)
+            if similar:
+                result['similar'] = [n._asdict() for n in neighbors[i][:similar]]
+            results.append(result)
+        return results
+
+
+class InferenceServer:
+    def __init__(self, model_path=DEFAULT_MODEL_PATH, max_batch=64, max_wait=0.005,
+                 tweets_path=None):
+        model = load_model(model_path)
+        self.version = load_metadata(model_path).get('version')
+        # Same table as the app: data/tweets.columnar when it is current
+        tweets_path = tweets_path or dataset.resolve(similarity.DEFAULT_TWEETS_PATH)
+        index = similarity.load_or_build(model, model_path, tweets_path)
+        self.batcher = Batcher(model, Explainer(model), index, max_batch, max_wait)
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, _ = request_line.decode('latin-1').split(' ', 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get('content-length', 0)))
+                try:
+                    status, payload = await self.dispatch(method, path, body)
+                except Exception as e:
+                    # Answer the request that failed and keep the connection
+                    status, payload = '500 Internal Server Error', {'error': f'{type(e).__name__}: {e}'}
+                data = json.dumps(payload).encode()
+                writer.write(
+                    f"HTTP/1.1 {status}\r\nContent-Type: application/json\r\n"
+                    f"Content-Length: {len(data)}\r\nConnection: keep-alive\r\n\r\n".encode() + data
+                )
+                await writer.drain()
+                if headers.get('connection', '').lower() == 'close':
+                    break
+        except (asyncio.IncompleteReadError, ConnectionResetError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def dispatch(self, method, path, body):
+        if method == 'GET' and path == '/health':
+            return '200 OK', {'status': 'ok', 'version': self.version, 'stats': self.batcher.stats}
+        if method == 'POST' and path == '/predict':
+            try:
+                request = json.loads(body)
+                tweets = request['tweets']
+                k = int(request.get('k', 3))
+                explain = bool(request.get('explain', False))
+                similar = int(request.get('similar', 0))
+                if not isinstance(tweets, list) or not all(isinstance(tweet, str) for tweet in tweets):
+                    raise ValueError('tweets must be a list of strings')
+                if k < 1:
+                    raise ValueError('k must be at least 1')
+                if similar < 0:
+                    raise ValueError('similar must not be negative')
+            except (ValueError, KeyError, TypeError) as e:
+                return '400 Bad Request', {'error': str(e)}
+            self.batcher.stats['requests'] += 1
+            results = await asyncio.gather(*(self.batcher.submit(tweet, k, explain, similar) for tweet in tweets))
+            return '200 OK', {'predictions': results, 'version': self.version}
+        return '404 Not Found', {'error': f'no route for {method} {path}'}
+
+    async def serve(self, host='127.0.0.1', port=8765, unix_path=None):
+        batch_task = asyncio.create_task(self.batcher.run())
+        if unix_path:
+            if os.path.exists(unix_path):
+                os.unlink(unix_path)
+            server = await asyncio.start_unix_server(self.handle, path=unix_path)
+            where = f'unix://{unix_path}'
+        else:
+            server = await asyncio.start_server(self.handle, host, port)
+            where = f'http://{host}:{port}'
+        print(f"Serving {where} (model version {self.version})", flush=True)
+        async with server:
+            try:
+                await server.serve_forever()
+            finally:
+                batch_task.cancel()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Micro-batching inference server for the TweetLike classifier.')
+    parser.add_argument('--model', default=DEFAULT_MODEL_PATH)
+    parser.add_argument('--tweets', help=f'real tweets searched for "similar" (default: {similarity.DEFAULT_TWEETS_PATH}, '
+                                         'or its columnar copy when current)')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--unix', metavar='PATH', help='listen on a Unix socket instead of TCP')
+    parser.add_argument('--max-batch', type=int, default=64, help='most tweets scored in one batch')
+    parser.add_argument('--max-wait-ms', type=float, default=5.0, help='longest a request waits for a batch to fill')
+    args = parser.parse_args(argv)
+
+    server = InferenceServer(args.model, args.max_batch, args.max_wait_ms / 1000, args.tweets)
+    try:
+        asyncio.run(server.serve(args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
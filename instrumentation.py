@@ -0,0 +1,151 @@
+import os
+import threading
+import time
+from bisect import bisect_left
+
+# Stage timings for the app. Off unless TWEETLIKE_TIMINGS=1; while off, timed()
+# returns the function undecorated and timer() a shared no-op context manager, so
+# instrumented code pays one function call per stage. While on, durations go into
+# fixed-bucket histograms shared by every session in the process, which app.py shows
+# in a sidebar panel and dumps in Prometheus text format to TWEETLIKE_METRICS_FILE.
+
+TIMINGS_ENV = 'TWEETLIKE_TIMINGS'
+METRICS_FILE_ENV = 'TWEETLIKE_METRICS_FILE'
+DEFAULT_METRICS_FILE = 'tweetlike_metrics.prom'
+METRIC_NAME = 'tweetlike_stage_seconds'
+
+ENABLED = os.environ.get(TIMINGS_ENV, '').lower() in ('1', 'true', 'yes', 'on')
+
+# Upper bounds in seconds, as for a Prometheus histogram; the last bucket is +Inf
+BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_lock = threading.Lock()
+_histograms = {}  # stage -> [bucket counts (len(BUCKETS) + 1), sum, count, max]
+_last_dump = 0.0
+
+
+def observe(stage, seconds):
+    with _lock:
+        histogram = _histograms.get(stage)
+        if histogram is None:
+            histogram = _histograms[stage] = [[0] * (len(BUCKETS) + 1), 0.0, 0, 0.0]
+        histogram[0][bisect_left(BUCKETS, seconds)] += 1
+        histogram[1] += seconds
+        histogram[2] += 1
+        histogram[3] = max(histogram[3], seconds)
+
+
+class _Timer:
+    def __init__(self, stage):
+        self.stage = stage
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        observe(self.stage, time.perf_counter() - self._start)
+        return False
+
+
+class _NullTimer:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+def timer(stage):
+    # with timer('guess.predict'): ...
+    return _Timer(stage) if ENABLED else _NULL_TIMER
+
+
+def timed(stage):
+    # @timed('home') records every call of the decorated function
+    def decorate(fn):
+        if not ENABLED:
+            return fn
+
+        def wrapper(*args, **kwargs):
+            with _Timer(stage):
+                return fn(*args, **kwargs)
+        wrapper.__name__ = fn.__name__
+        wrapper.__wrapped__ = fn
+        return wrapper
+    return decorate
+
+
+def _quantile(counts, total, q):
+    # Linear interpolation inside the bucket holding the q-th observation
+    rank = q * total
+    seen = 0
+    for i, count in enumerate(counts):
+        if count and seen + count >= rank:
+            lower = BUCKETS[i - 1] if i > 0 else 0.0
+            upper = BUCKETS[i] if i < len(BUCKETS) else BUCKETS[-1]
+            return lower + (upper - lower) * (rank - seen) / count
+        seen += count
+    return 0.0
+
+
+def snapshot():
+    # stage -> count, total/mean/p50/p95/max seconds, for every stage seen so far
+    with _lock:
+        histograms = {stage: (list(h[0]), h[1], h[2], h[3]) for stage, h in _histograms.items()}
+    result = {}
+    for stage, (counts, total, count, worst) in sorted(histograms.items()):
+        result[stage] = {
+            'count': count,
+            'total': total,
+            'mean': total / count,
+            'p50': min(_quantile(counts, count, 0.5), worst),
+            'p95': min(_quantile(counts, count, 0.95), worst),
+            'max': worst,
+        }
+    return result
+
+
+def prometheus_text():
+    with _lock:
+        histograms = {stage: (list(h[0]), h[1], h[2]) for stage, h in _histograms.items()}
+    lines = [f'# HELP {METRIC_NAME} Time spent in each app stage.', f'# TYPE {METRIC_NAME} histogram']
+    for stage, (counts, total, count) in sorted(histograms.items()):
+        cumulative = 0
+        for bound, bucket_count in zip(BUCKETS + ('+Inf',), counts):
+            cumulative += bucket_count
+            lines.append(f'{METRIC_NAME}_bucket{{stage="{stage}",le="{bound}"}} {cumulative}')
+        lines.append(f'{METRIC_NAME}_sum{{stage="{stage}"}} {total:.6f}')
+        lines.append(f'{METRIC_NAME}_count{{stage="{stage}"}} {count}')
+    return '\n'.join(lines) + '\n'
+
+
+def dump(path=None):
+    # Written to a temporary file and renamed, so a scraper never reads half a dump
+    path = path or os.environ.get(METRICS_FILE_ENV, DEFAULT_METRICS_FILE)
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'w') as f:
+        f.write(prometheus_text())
+    os.replace(tmp_path, path)
+    return path
+
+
+def maybe_dump(interval=5.0):
+    # dump() at most once per interval seconds; called at the end of every rerun
+    global _last_dump
+    if not ENABLED:
+        return None
+    now = time.monotonic()
+    with _lock:
+        if now - _last_dump < interval:
+            return None
+        _last_dump = now
+    return dump()
+
+
+def reset():
+    with _lock:
+        _histograms.clear()
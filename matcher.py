@@ -0,0 +1,116 @@
+import re
+import unicodedata
+from collections import Counter, namedtuple
+
+# Fuzzy author matching for hard mode. Built once from the author names: every author
+# gets a few normalized aliases, the aliases go into a character-trigram index, and a
+# typed answer is only compared (bounded edit distance) against the handful of
+# aliases sharing the most trigrams with it, so the cost does not grow with the
+# number of authors.
+
+Match = namedtuple('Match', ['author', 'score', 'alias'])
+
+_APOSTROPHES = re.compile(r"['’‘`´]")
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+
+# Score multiplier for aliases that are only part of a name ("swift" for Taylor Swift)
+PARTIAL_ALIAS_WEIGHT = 0.9
+
+
+def normalize_name(name):
+    # "Conan O’Brien " -> "conan obrien", "Tyler, the Creator" -> "tyler the creator"
+    name = unicodedata.normalize('NFKD', name)
+    name = ''.join(c for c in name if not unicodedata.combining(c)).lower()
+    name = _APOSTROPHES.sub('', name)
+    return _NON_ALNUM.sub(' ', name).strip()
+
+
+def name_key(name):
+    # Spaces dropped as well, so "conan o brien" and "conan obrien" agree
+    return normalize_name(name).replace(' ', '')
+
+
+def _trigrams(text):
+    padded = f'  {text} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def bounded_edit_distance(a, b, max_distance):
+    # Levenshtein distance, or max_distance + 1 as soon as it is known to exceed it
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i] + [0] * len(b)
+        for j, cb in enumerate(b, 1):
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb))
+        if min(current) > max_distance:
+            return max_distance + 1
+        previous = current
+    return previous[-1]
+
+
+class AuthorMatcher:
+    def __init__(self, authors, min_score=0.75, candidates=8):
+        self.min_score = min_score
+        self.candidates = candidates
+        self.aliases = []  # (alias key, author, weight)
+        self._exact = {}
+        self._index = {}
+
+        authors = list(dict.fromkeys(authors))
+        # A single name token is only an alias when no other author uses it
+        token_counts = Counter(token for author in authors for token in set(normalize_name(author).split()))
+        for author in authors:
+            tokens = normalize_name(author).split()
+            keys = {''.join(tokens): 1.0}
+            if tokens and tokens[0] == 'the' and len(tokens) > 1:
+                keys.setdefault(''.join(tokens[1:]), 1.0)  # "ellen show"
+            for token in (tokens[0], tokens[-1]) if len(tokens) > 1 else ():
+                if len(token) >= 3 and token != 'the' and token_counts[token] == 1:
+                    keys.setdefault(token, PARTIAL_ALIAS_WEIGHT)
+            for key, weight in keys.items():
+                self._add_alias(key, author, weight)
+
+    def _add_alias(self, key, author, weight):
+        alias_id = len(self.aliases)
+        self.aliases.append((key, author, weight))
+        # Keep the first author for a key; later duplicates ("Conan O'Brien" spelled
+        # with a curly apostrophe) resolve to the same person anyway
+        self._exact.setdefault(key, alias_id)
+        for gram in _trigrams(key):
+            self._index.setdefault(gram, []).append(alias_id)
+
+    def match(self, answer):
+        # Best Match for a typed answer, or None when nothing scores min_score
+        query = name_key(answer)
+        if not query:
+            return None
+        alias_id = self._exact.get(query)
+        if alias_id is not None:
+            key, author, weight = self.aliases[alias_id]
+            return Match(author, weight, key)
+
+        shared = Counter()
+        for gram in _trigrams(query):
+            shared.update(self._index.get(gram, ()))
+        best = None
+        for alias_id, _ in shared.most_common(self.candidates):
+            key, author, weight = self.aliases[alias_id]
+            length = max(len(query), len(key))
+            # Largest distance that could still reach min_score
+            max_distance = int(length * (1 - self.min_score / weight))
+            if max_distance < 0:
+                continue
+            distance = bounded_edit_distance(query, key, max_distance)
+            if distance > max_distance:
+                continue
+            score = weight * (1 - distance / length)
+            if best is None or score > best.score:
+                best = Match(author, score, key)
+        return best
+
+    def is_correct(self, answer, correct_author):
+        # (correct?, Match) for a hard-mode answer
+        match = self.match(answer)
+        return match is not None and name_key(match.author) == name_key(correct_author), match
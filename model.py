@@ -1,33 +1,41 @@
-import pandas as pd
+import json
+import os
+
 import joblib
-data = pd.read_csv('data/top_celebs.csv')
-data['name'] = data['name'].str.strip()
-filtered = data.groupby('name').filter(lambda n: len(n) >= 5)
-filtered['name'].unique() # celebs with >= 4 tweets
 
-# Train / Test split
-from sklearn.model_selection import train_test_split
-X = filtered['tweet'].str.strip().str.lower()
-y = filtered['name']
-X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state = 42)
+# Loading the trained classifier. Training lives in train.py, so importing this
+# module never fits or writes anything.
 
-# Model pipeline
+DEFAULT_MODEL_PATH = 'tweetlike_model.pkl'
 
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.linear_model import LogisticRegression
-from sklearn.pipeline import Pipeline
+# Bump when the layout of the pickle or its metadata sidecar changes
+ARTIFACT_FORMAT = 1
 
-model = Pipeline([
-    ('tfidf', TfidfVectorizer(lowercase=True, stop_words=None)),  # Converts text to numeric features
-    ('clf', LogisticRegression(max_iter=1000))  # Multi-class classification
-])
 
-model.fit(X_train, y_train)
+def normalize_tweet(text):
+    # Same cleanup the training tweets get before they reach the vectorizer
+    return text.strip().lower()
 
-score = model.score(X_test, y_test)
-print(f"Accuracy: {score:.2f}")
 
-def get_model():
-    return model
+def metadata_path(model_path):
+    return os.path.splitext(model_path)[0] + '.json'
+
+
+def load_metadata(model_path=DEFAULT_MODEL_PATH):
+    try:
+        with open(metadata_path(model_path)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        # Artifacts from before train.py existed have no sidecar
+        return {}
 
-joblib.dump(model, 'tweetlike_model.pkl')
+
+def load_model(path=DEFAULT_MODEL_PATH):
+    metadata = load_metadata(path)
+    if metadata.get('format', ARTIFACT_FORMAT) > ARTIFACT_FORMAT:
+        raise ValueError(f"{path} was written by a newer train.py (format {metadata['format']})")
+    return joblib.load(path)
+
+
+def get_model():
+    return load_model()
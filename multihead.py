@@ -0,0 +1,40 @@
+# Artifact written by train.py --ai-head: the usual TF-IDF + author pipeline plus an
+# is-AI-generated classifier that reads the same TF-IDF matrix. It behaves like the
+# author Pipeline everywhere (steps, named_steps, slicing, predict_proba), so the
+# rest of the code needs no changes to load it; inference.py additionally asks it for
+# ai_probability on the matrix it already computed.
+
+
+class MultiHeadModel:
+    def __init__(self, pipeline, ai_head):
+        self.pipeline = pipeline
+        self.ai_head = ai_head  # trained on is_ai = not is_real
+
+    @property
+    def steps(self):
+        return self.pipeline.steps
+
+    @property
+    def named_steps(self):
+        return self.pipeline.named_steps
+
+    @property
+    def classes_(self):
+        return self.pipeline.classes_
+
+    def __getitem__(self, index):
+        return self.pipeline[index]
+
+    def predict(self, X):
+        return self.pipeline.predict(X)
+
+    def predict_proba(self, X):
+        return self.pipeline.predict_proba(X)
+
+    def score(self, X, y):
+        return self.pipeline.score(X, y)
+
+    def ai_probability(self, X):
+        # P(AI-generated) for each row of an already vectorized matrix
+        column = list(self.ai_head.classes_).index(True)
+        return self.ai_head.predict_proba(X)[:, column]
@@ -0,0 +1,137 @@
+import json
+import os
+import re
+import unicodedata
+from collections import Counter
+
+import numpy as np
+
+# Pure-NumPy scorer for models exported by export_numpy.py. Imports neither
+# scikit-learn nor pandas, and the weight arrays are opened with mmap_mode='r', so
+# every worker process maps the same pages from the page cache instead of unpickling
+# its own copy. The analyzer below is a port of TfidfVectorizer's, limited to the
+# options export_numpy.py accepts.
+
+_WHITE_SPACES = re.compile(r"\s\s+")
+
+
+def _normalize(text):
+    # Same cleanup as model.normalize_tweet, repeated here to avoid importing joblib
+    return text.strip().lower()
+
+
+def _strip_accents(text, mode):
+    if mode == 'unicode':
+        return ''.join(c for c in unicodedata.normalize('NFKD', text) if not unicodedata.combining(c))
+    if mode == 'ascii':
+        return unicodedata.normalize('NFKD', text).encode('ASCII', 'ignore').decode('ASCII')
+    return text
+
+
+class NumpyModel:
+    def __init__(self, path, mmap=True):
+        with open(os.path.join(path, 'config.json')) as f:
+            self.config = json.load(f)
+        with open(os.path.join(path, 'vocabulary.json')) as f:
+            self.vocabulary = {term: i for i, term in enumerate(json.load(f))}
+        mmap_mode = 'r' if mmap else None
+        self.idf = np.load(os.path.join(path, 'idf.npy'), mmap_mode=mmap_mode)
+        self.coef = np.load(os.path.join(path, 'coef.npy'), mmap_mode=mmap_mode)  # (n_features, n_targets)
+        self.intercept = np.load(os.path.join(path, 'intercept.npy'), mmap_mode=mmap_mode)
+        self.ai_coef = self.ai_intercept = None
+        if self.config.get('ai_head'):
+            self.ai_coef = np.load(os.path.join(path, 'ai_coef.npy'), mmap_mode=mmap_mode)
+            self.ai_intercept = np.load(os.path.join(path, 'ai_intercept.npy'), mmap_mode=mmap_mode)
+        self.classes_ = np.array(self.config['classes'], dtype=object)
+        self.version = self.config.get('version')
+
+        vec = self.config['vectorizer']
+        self._analyzer = vec['analyzer']
+        self._lowercase = vec['lowercase']
+        self._strip = vec['strip_accents']
+        self._token_pattern = re.compile(vec['token_pattern'])
+        self._ngram_range = tuple(vec['ngram_range'])
+        self._stop_words = frozenset(vec['stop_words'] or ())
+
+    def analyze(self, text):
+        # Terms TfidfVectorizer would extract from text
+        text = _strip_accents(text.lower() if self._lowercase else text, self._strip)
+        min_n, max_n = self._ngram_range
+        if self._analyzer == 'word':
+            tokens = [t for t in self._token_pattern.findall(text) if t not in self._stop_words]
+            terms = list(tokens) if min_n == 1 else []
+            for n in range(max(min_n, 2), max_n + 1):
+                terms.extend(' '.join(tokens[i:i + n]) for i in range(len(tokens) - n + 1))
+            return terms
+        if self._analyzer == 'char':
+            text = _WHITE_SPACES.sub(' ', text)
+            return [text[i:i + n] for n in range(min_n, min(max_n, len(text)) + 1) for i in range(len(text) - n + 1)]
+        # char_wb: n-grams inside each whitespace-separated word, padded with spaces
+        terms = []
+        for word in text.split():
+            word = ' ' + word + ' '
+            for n in range(min_n, max_n + 1):
+                offset = 0
+                terms.append(word[offset:offset + n])
+                while offset + n < len(word):
+                    offset += 1
+                    terms.append(word[offset:offset + n])
+                if offset == 0:  # count a short word (len(word) < n) only once
+                    break
+        return terms
+
+    def transform(self, texts):
+        # CSR parts (indptr, indices, data) of the TF-IDF matrix, float32
+        vec = self.config['vectorizer']
+        indptr, indices, data = [0], [], []
+        for text in texts:
+            counts = Counter(self.vocabulary[t] for t in self.analyze(_normalize(text)) if t in self.vocabulary)
+            idx = np.fromiter(counts.keys(), dtype=np.int64, count=len(counts))
+            tf = np.fromiter(counts.values(), dtype=np.float32, count=len(counts))
+            if vec['binary']:
+                tf = np.ones_like(tf)
+            elif vec['sublinear_tf']:
+                tf = 1 + np.log(tf)
+            if vec['use_idf']:
+                tf = tf * self.idf[idx]
+            if vec['norm'] == 'l2' and len(tf):
+                tf = tf / np.sqrt(np.dot(tf, tf))
+            elif vec['norm'] == 'l1' and len(tf):
+                tf = tf / np.abs(tf).sum()
+            indices.append(idx)
+            data.append(tf.astype(np.float32))
+            indptr.append(indptr[-1] + len(idx))
+        indices = np.concatenate(indices) if indices else np.empty(0, dtype=np.int64)
+        data = np.concatenate(data) if data else np.empty(0, dtype=np.float32)
+        return np.array(indptr), indices, data
+
+    def decision_function(self, texts, X=None):
+        indptr, indices, data = X if X is not None else self.transform(texts)
+        n_docs = len(indptr) - 1
+        scores = np.tile(self.intercept, (n_docs, 1)).astype(np.float32)
+        if len(indices):
+            contrib = data[:, None] * self.coef[indices]
+            rows = np.repeat(np.arange(n_docs), np.diff(indptr))
+            np.add.at(scores, rows, contrib)
+        return scores
+
+    def predict_proba(self, texts, X=None):
+        scores = self.decision_function(texts, X).astype(np.float64)
+        if scores.shape[1] == 1:
+            p = 1 / (1 + np.exp(-scores[:, 0]))
+            return np.column_stack([1 - p, p])
+        scores -= scores.max(axis=1, keepdims=True)
+        exp = np.exp(scores)
+        return exp / exp.sum(axis=1, keepdims=True)
+
+    def ai_probability(self, X):
+        # P(AI-generated) per row of transform() output, None without an AI head
+        if self.ai_coef is None:
+            return None
+        indptr, indices, data = X
+        rows = np.repeat(np.arange(len(indptr) - 1), np.diff(indptr))
+        scores = np.bincount(rows, weights=data * self.ai_coef[indices], minlength=len(indptr) - 1)
+        return 1 / (1 + np.exp(-(scores + float(self.ai_intercept[0]))))
+
+    def predict(self, texts):
+        return self.classes_[self.predict_proba(texts).argmax(axis=1)]
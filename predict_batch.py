@@ -0,0 +1,130 @@
+import argparse
+import csv
+import itertools
+import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from inference import predict_top_k
+from model import DEFAULT_MODEL_PATH, load_model
+
+# Offline "who do you tweet like" scoring for large tweet dumps:
+#   python predict_batch.py tweets.jsonl --workers 4 > predictions.jsonl
+# Input is read and scored one chunk at a time, so memory stays bounded by
+# chunk_size * (workers * 2) tweets no matter how big the input is.
+
+
+def read_tweets(path, column='tweet', fmt=None):
+    # Yield tweet texts from a CSV, JSONL or plain-text (one tweet per line) file; '-' is stdin
+    if fmt is None:
+        fmt = os.path.splitext(path)[1].lstrip('.').lower() if path != '-' else 'txt'
+    f = sys.stdin if path == '-' else open(path, newline='', encoding='utf-8')
+    try:
+        if fmt == 'csv':
+            for row in csv.DictReader(f):
+                yield row[column]
+        elif fmt in ('jsonl', 'ndjson'):
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)[column]
+        else:
+            for line in f:
+                line = line.rstrip('\r\n')
+                if line:
+                    yield line
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+
+def _chunks(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def score_chunk(model, texts, top_k=3):
+    # One vectorize + one predict_proba for the whole chunk
+    results = []
+    for text, prediction in zip(texts, predict_top_k(model, texts, top_k)):
+        result = {
+            'tweet': text,
+            'prediction': prediction.author,
+            'top': [{'author': author, 'probability': prob} for author, prob in prediction.top],
+        }
+        if prediction.ai_probability is not None:
+            result['ai_probability'] = prediction.ai_probability
+        results.append(result)
+    return results
+
+
+def _load(model_path):
+    # A directory is an export_numpy.py artifact: memory-mapped, no sklearn import
+    if os.path.isdir(model_path):
+        from numpy_runtime import NumpyModel
+        return NumpyModel(model_path)
+    return load_model(model_path)
+
+
+_worker_model = None
+
+
+def _init_worker(model_path):
+    global _worker_model
+    _worker_model = _load(model_path)
+
+
+def _score_in_worker(texts, top_k):
+    return score_chunk(_worker_model, texts, top_k)
+
+
+def predict_stream(texts, model=None, model_path=DEFAULT_MODEL_PATH, chunk_size=1000, top_k=3, workers=1):
+    # Yield one result dict per input tweet, in input order
+    if workers <= 1:
+        model = model if model is not None else _load(model_path)
+        for chunk in _chunks(texts, chunk_size):
+            yield from score_chunk(model, chunk, top_k)
+        return
+
+    # Each worker loads the model once; at most two chunks per worker are in flight
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(model_path,)) as pool:
+        pending = deque()
+        for chunk in _chunks(texts, chunk_size):
+            pending.append(pool.submit(_score_in_worker, chunk, top_k))
+            if len(pending) >= workers * 2:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Score tweets with the TweetLike classifier and stream top-k celebrities as JSONL.')
+    parser.add_argument('input', nargs='?', default='-', help="CSV, JSONL or text file of tweets ('-' for stdin)")
+    parser.add_argument('--format', choices=['csv', 'jsonl', 'txt'], help='input format (default: from the file extension)')
+    parser.add_argument('--column', default='tweet', help='tweet field for CSV/JSONL input')
+    parser.add_argument('--output', default='-', help="where to write JSONL results ('-' for stdout)")
+    parser.add_argument('--model', default=DEFAULT_MODEL_PATH,
+                        help='model pickle written by train.py, or a directory written by export_numpy.py')
+    parser.add_argument('--chunk-size', type=int, default=1000)
+    parser.add_argument('--top-k', type=int, default=3)
+    parser.add_argument('--workers', type=int, default=1, help='worker processes (default: 1, in-process)')
+    args = parser.parse_args(argv)
+
+    texts = read_tweets(args.input, args.column, args.format)
+    out = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8')
+    try:
+        for result in predict_stream(texts, model_path=args.model, chunk_size=args.chunk_size,
+                                     top_k=args.top_k, workers=args.workers):
+            out.write(json.dumps(result, ensure_ascii=False) + '\n')
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,125 @@
+import threading
+import time
+from collections import OrderedDict
+
+from explain import to_html
+from inference import predict_top_k, vectorize
+from model import normalize_tweet
+
+# Bounded LRU + TTL cache in front of inference and explanations for the Guess button.
+# Keys use the same normalization as training, so "Hello " and "hello" share an entry,
+# and the whole cache is dropped when the model version changes. Vectorized rows get
+# their own small LRU, so sparse matrices never evict finished results.
+
+_MISSING = object()
+
+
+class LRUCache:
+    def __init__(self, maxsize=1024, ttl=600.0, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._data = OrderedDict()  # key -> (expires_at, value)
+        self._version = None
+        self._stats = {'hits': 0, 'misses': 0, 'expired': 0, 'evictions': 0, 'invalidations': 0}
+
+    def check_version(self, version):
+        # Drop everything cached for a different model artifact
+        with self._lock:
+            if version != self._version:
+                if self._data:
+                    self._stats['invalidations'] += 1
+                self._data.clear()
+                self._version = version
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING:
+                self._stats['misses'] += 1
+                return default
+            expires_at, value = entry
+            if expires_at < self._clock():
+                del self._data[key]
+                self._stats['expired'] += 1
+                self._stats['misses'] += 1
+                return default
+            self._data.move_to_end(key)
+            self._stats['hits'] += 1
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (self._clock() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self._stats['evictions'] += 1
+
+    def get_or_compute(self, key, compute):
+        # compute() runs outside the lock; two sessions missing at once both compute
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = compute()
+            self.set(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats, size=len(self._data), maxsize=self.maxsize)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+        return stats
+
+
+_cache = LRUCache()
+# A miss on predict/explain/similar for one tweet vectorizes it once for all three
+_X_cache = LRUCache(maxsize=64)
+
+
+def vectorized(model, version, text):
+    _X_cache.check_version(version)
+    key = normalize_tweet(text)
+    return _X_cache.get_or_compute(key, lambda: vectorize(model, [key]))
+
+
+def predict(model, version, text, k=3):
+    _cache.check_version(version)
+    return _cache.get_or_compute(
+        ('predict', normalize_tweet(text), k),
+        lambda: predict_top_k(model, [text], k, X=vectorized(model, version, text))[0],
+    )
+
+
+def explanation_html(explainer, model, version, text):
+    _cache.check_version(version)
+    return _cache.get_or_compute(
+        ('explanation_html', normalize_tweet(text)),
+        lambda: to_html(explainer.explain(vectorized(model, version, text))),
+    )
+
+
+def top_words(explainer, model, version, text, target, n=5):
+    _cache.check_version(version)
+    return _cache.get_or_compute(
+        ('top_words', normalize_tweet(text), target, n),
+        lambda: explainer.top_words(vectorized(model, version, text), target, n),
+    )
+
+
+def similar(index, model, version, text, k=3):
+    # Closest real tweets (similarity.Neighbor tuples) to the tweet
+    _cache.check_version(version)
+    return _cache.get_or_compute(
+        ('similar', normalize_tweet(text), k),
+        lambda: index.query(vectorized(model, version, text), k)[0],
+    )
+
+
+def stats():
+    return dict(_cache.stats(), vectorized=_X_cache.stats())
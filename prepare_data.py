@@ -0,0 +1,131 @@
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+import dataset
+
+# Builds the balanced training set from the raw tweets:
+#   python prepare_data.py --input data/tweets.csv --output data/top_celebs.parquet
+# The input (CSV, Parquet or a dataset.py columnar directory) is streamed in chunks
+# twice: once to count tweets per celeb, once to sample them. Memory is bounded by one
+# chunk plus per_author rows per celeb, however big the input is.
+
+DEFAULT_INPUT_PATH = 'data/tweets.csv'
+DEFAULT_OUTPUT_PATH = 'data/top_celebs.parquet'
+
+
+def _read_chunks(path, chunksize, author_column):
+    # Chunks come back from dataset.iter_chunks with names and tweets already cleaned
+    for chunk in dataset.iter_chunks(path, chunksize):
+        chunk = chunk.rename(columns={author_column: 'name'})
+        # is_real is kept for train.py --ai-head
+        yield chunk[[c for c in ('name', 'tweet', 'is_real') if c in chunk]]
+
+
+def _detect_author_column(path):
+    # tweets.csv calls it 'author', older exports and top_celebs.csv call it 'name'
+    return 'author' if 'author' in dataset.table_columns(path) else 'name'
+
+
+def count_authors(path, chunksize=100_000, author_column='author'):
+    counts = pd.Series(dtype='int64')
+    for chunk in _read_chunks(path, chunksize, author_column):
+        counts = counts.add(chunk['name'].value_counts(), fill_value=0)
+    return counts.astype('int64')
+
+
+def sample_authors(path, eligible, per_author, rng, chunksize=100_000, author_column='author'):
+    # Bottom-k sampling: every row gets a uniform random key and each celeb keeps the
+    # per_author rows with the smallest keys. That is a uniform sample without
+    # replacement, computed with vectorized sort + groupby.head per chunk.
+    kept = None
+    for chunk in _read_chunks(path, chunksize, author_column):
+        chunk = chunk[chunk['name'].isin(eligible)].copy()
+        chunk['_key'] = rng.random(len(chunk))
+        kept = chunk if kept is None else pd.concat([kept, chunk], ignore_index=True)
+        kept = kept.sort_values(['name', '_key'], kind='stable').groupby('name').head(per_author)
+    if kept is None:
+        return pd.DataFrame(columns=['name', 'tweet'])
+    return kept.drop(columns='_key').reset_index(drop=True)
+
+
+def upsample_authors(df, per_author, rng):
+    # Celebs with fewer than per_author tweets are resampled with replacement up to
+    # per_author, all at once: one random offset into each celeb's block of rows
+    df = df.sort_values('name', kind='stable').reset_index(drop=True)
+    sizes = df.groupby('name', sort=True).size()
+    short = sizes[sizes < per_author]
+    if short.empty:
+        return df, []
+    starts = np.concatenate([[0], np.cumsum(sizes.to_numpy())[:-1]])
+    starts = pd.Series(starts, index=sizes.index)[short.index].to_numpy()
+    draws = np.repeat(starts, per_author) + (rng.random(len(short) * per_author) * np.repeat(short.to_numpy(), per_author)).astype(int)
+    balanced = pd.concat([df[~df['name'].isin(short.index)], df.iloc[draws]], ignore_index=True)
+    return balanced.sort_values('name', kind='stable').reset_index(drop=True), list(short.index)
+
+
+def write_table(df, path):
+    if path.endswith(dataset.COLUMNAR_SUFFIX):
+        dataset.write_columnar(df, path)
+    elif path.endswith('.parquet'):
+        df.to_parquet(path, index=False)
+    else:
+        df.to_csv(path, index=False)
+
+
+def stats_path(output_path):
+    return os.path.splitext(output_path)[0] + '.stats.json'
+
+
+def prepare(input_path=DEFAULT_INPUT_PATH, output_path=DEFAULT_OUTPUT_PATH, min_count=5, per_author=8,
+            seed=42, chunksize=100_000):
+    start = time.perf_counter()
+    rng = np.random.default_rng(seed)
+    author_column = _detect_author_column(input_path)
+
+    counts = count_authors(input_path, chunksize, author_column)
+    eligible = counts[counts >= min_count].index  # celebs with >= min_count tweets
+    sampled = sample_authors(input_path, eligible, per_author, rng, chunksize, author_column)
+    balanced, upsampled = upsample_authors(sampled, per_author, rng)
+    write_table(balanced, output_path)
+
+    stats = {
+        'input_path': input_path if isinstance(input_path, str) else None,  # None: a DataFrame
+        'output_path': output_path,
+        'min_count': min_count,
+        'per_author': per_author,
+        'seed': seed,
+        'input_rows': int(counts.sum()),
+        'input_authors': len(counts),
+        'eligible_authors': len(eligible),
+        'upsampled_authors': [str(name) for name in upsampled],
+        'output_rows': len(balanced),
+        'seconds': time.perf_counter() - start,
+    }
+    with open(stats_path(output_path), 'w') as f:
+        json.dump(stats, f, indent=2)
+    return balanced, stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Build the balanced celeb training set from raw tweets.')
+    parser.add_argument('--input', default=DEFAULT_INPUT_PATH,
+                        help='raw tweets CSV, Parquet or columnar directory (author or name, tweet columns)')
+    parser.add_argument('--output', default=DEFAULT_OUTPUT_PATH, help='.parquet, .csv or .columnar output path')
+    parser.add_argument('--min-count', type=int, default=5, help='drop celebs with fewer tweets than this')
+    parser.add_argument('--per-author', type=int, default=8, help='tweets per celeb in the output')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--chunksize', type=int, default=100_000, help='rows read at a time')
+    args = parser.parse_args(argv)
+
+    _, stats = prepare(args.input, args.output, args.min_count, args.per_author, args.seed, args.chunksize)
+    print(f"{stats['output_rows']} tweets from {stats['eligible_authors']} of {stats['input_authors']} celebs "
+          f"-> {args.output} ({stats['seconds']:.2f}s)")
+
+
+if __name__ == '__main__':
+    main()
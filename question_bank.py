@@ -0,0 +1,95 @@
+import threading
+from collections import namedtuple
+
+import numpy as np
+
+# Pre-generated games for easy and hard mode. Questions are generated in bulk into
+# numpy arrays (tweet IDs, correct author codes, distractor author codes, is_real),
+# so starting a game is a slice. When the bank runs low a background thread refills
+# it. No tweet repeats within a game.
+
+QUESTIONS_PER_GAME = 10
+N_DISTRACTORS = 3
+
+# One game: tweet_ids and is_real have one entry per question, options one row of
+# author codes per question (the correct author plus N_DISTRACTORS, shuffled)
+Game = namedtuple('Game', ['tweet_ids', 'options', 'is_real'])
+
+
+class QuestionBank:
+    def __init__(self, store, seed=None, capacity=256, low_water=32):
+        if len(store) < QUESTIONS_PER_GAME or len(store.authors) <= N_DISTRACTORS:
+            raise ValueError('not enough tweets or authors to build a game')
+        self.store = store
+        self.capacity = capacity
+        self.low_water = low_water
+        self._rng = np.random.default_rng(seed)
+        self._lock = threading.Lock()
+        self._generate_lock = threading.Lock()  # numpy Generators are not thread-safe
+        self._refilling = False
+        self._tweet_ids = np.empty((0, QUESTIONS_PER_GAME), dtype=np.int32)
+        self._options = np.empty((0, QUESTIONS_PER_GAME, N_DISTRACTORS + 1), dtype=np.int32)
+        self._refill()
+
+    def _distinct(self, high, shape):
+        # Rows of shape[-1] distinct integers in [0, high)
+        if high <= 1024:
+            # Small range: the first k entries of a random permutation per row
+            keys = self._rng.random(shape[:-1] + (high,))
+            return np.argpartition(keys, shape[-1] - 1, axis=-1)[..., :shape[-1]]
+        # Large range: draw with replacement and redraw the few rows with a repeat
+        values = self._rng.integers(high, size=shape)
+        while True:
+            ordered = np.sort(values, axis=-1)
+            clash = (ordered[..., 1:] == ordered[..., :-1]).any(axis=-1)
+            if not clash.any():
+                return values
+            values[clash] = self._rng.integers(high, size=(int(clash.sum()), shape[-1]))
+
+    def generate(self, n_games):
+        store = self.store
+        with self._generate_lock:
+            tweet_ids = self._distinct(len(store), (n_games, QUESTIONS_PER_GAME))
+            correct = store.author_codes[tweet_ids]
+            # Distractors come from the n_authors - 1 other codes: draw from that range
+            # and step over the correct code
+            distractors = self._distinct(len(store.authors) - 1, correct.shape + (N_DISTRACTORS,))
+            distractors += distractors >= correct[..., None]
+            # Put the correct answer in a random position among the options
+            options = np.concatenate([distractors, correct[..., None]], axis=-1)
+            self._rng.permuted(options, axis=-1, out=options)
+        return tweet_ids.astype(np.int32), options.astype(np.int32)
+
+    def _refill(self):
+        try:
+            with self._lock:
+                missing = self.capacity - len(self._tweet_ids)
+            tweet_ids, options = self.generate(missing)
+            with self._lock:
+                self._tweet_ids = np.concatenate([self._tweet_ids, tweet_ids])
+                self._options = np.concatenate([self._options, options])
+        finally:
+            # Also after a failed generate, so the next next_game() can start another refill
+            with self._lock:
+                self._refilling = False
+
+    def __len__(self):
+        return len(self._tweet_ids)
+
+    def next_game(self):
+        with self._lock:
+            if len(self._tweet_ids) == 0:
+                tweet_ids = options = None
+            else:
+                tweet_ids, options = self._tweet_ids[0], self._options[0]
+                self._tweet_ids, self._options = self._tweet_ids[1:], self._options[1:]
+            start_refill = not self._refilling and len(self._tweet_ids) < self.low_water
+            if start_refill:
+                self._refilling = True
+        if tweet_ids is None:
+            # Drained faster than the background refill; generate this one inline
+            tweet_ids, options = self.generate(1)
+            tweet_ids, options = tweet_ids[0], options[0]
+        if start_refill:
+            threading.Thread(target=self._refill, daemon=True).start()
+        return Game(tweet_ids, options, self.store.is_real[tweet_ids])
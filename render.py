@@ -0,0 +1,264 @@
+import html
+import re
+from functools import lru_cache
+from string import Template
+
+import assets
+
+# The app's HTML and CSS, compiled once per process. Templates are minified when this
+# module is imported, the theme becomes one <style> string, and whatever depends
+# only on a few values (a tweet card for one tweet ID and reveal state, the score
+# badge, option pills, final banners) is rendered once and then served from a cache.
+# Streamlit still needs each of these re-emitted on every rerun, because elements a
+# rerun does not emit are removed from the page; this keeps that to a minified string
+# lookup. Bytes per page: python -m benchmarks.bench_payload
+
+
+def minify_css(css):
+    css = re.sub(r'/\*.*?\*/', '', css, flags=re.S)
+    css = re.sub(r'\s+', ' ', css)
+    css = re.sub(r'\s*([{};:,>])\s*', r'\1', css)
+    return css.replace(';}', '}').strip()
+
+
+def minify_html(markup):
+    # Whitespace between tags and runs of whitespace inside them; also keeps the
+    # markup on one line, so Markdown never reads indented HTML as a code block
+    markup = re.sub(r'>\s+<', '><', markup)
+    return re.sub(r'\s+', ' ', markup).strip()
+
+
+def _template(markup):
+    return Template(minify_html(markup))
+
+
+### THEME ###
+
+THEME_CSS = """
+/* Set background color to light yellow and text to black */
+.stApp {
+    background-color: #15202b;
+    font-family: 'Helvetica Neue', sans-serif;
+    color: white;
+}
+
+/* Header style - White text */
+h1, h2, h3, h4, .css-1q2bbj3 {
+    color: white;
+}
+
+/* Buttons styled with a light color */
+.stButton>button {
+    background-color: #2E5984;
+    color: white;
+    border-radius: 25px;
+    padding: 10px 20px;
+    font-size: 16px;
+    border: none;
+    box-shadow: none;
+    cursor: pointer;
+    transition: background-color 0.3s ease;
+}
+
+.stButton>button:hover {
+    background-color: #FFD700;
+}
+/* Custom style for 'Next question' button only */
+button[data-testid="next_question"] {
+    background-color: #d4edda !important; /* Light green */
+    color: black !important;
+}
+
+button[data-testid="next_question"]:hover {
+    background-color: #c3e6cb !important; /* Slightly darker on hover */
+}
+
+/* Main content area without sidebar */
+.main-container {
+    display: flex;
+    flex-direction: column;
+    align-items: center;
+    justify-content: center;
+    width: 100%;
+    max-width: 900px;
+    margin: 0 auto;
+    padding-top: 50px;
+    text-align: center;
+}
+
+/* Quit button in the top-right corner */
+.quit-btn {
+    position: absolute;
+    top: 20px;
+    right: 20px;
+    background-color: #FFDD44;
+    color: black;
+    padding: 10px 20px;
+    border-radius: 20px;
+    cursor: pointer;
+    border: none;
+    font-size: 16px;
+}
+
+.quit-btn:hover {
+    background-color: #FFD700;
+}
+/* Set global default text color to black */
+html, body, [class*="css"] {
+    color: black !important;
+}
+
+/* Make all Streamlit alert box text black */
+div.stAlert {
+    color: black !important;
+}
+/* set start game button color */
+button[data-testid="start_game"] {
+    background-color: #90EE90 !important; /* Light yellow */
+    color: black !important;
+}
+button[data-testid="start_game"]:hover {
+    background-color: #98FB98 !important; /* Slightly darker on hover */
+}
+/* Match buttons inside columns */
+div[data-testid="column"] button {
+    width: 100% !important;
+    padding: 20px 0 !important;
+    font-size: 24px !important;
+    border-radius: 28px !important;
+}
+/* Explanation checkboxes on Home */
+label[data-testid="stCheckbox-label"] {
+    color: black !important;
+    font-weight: bold;
+}
+"""
+
+THEME_STYLE = f'<style>{minify_css(THEME_CSS)}</style>'
+
+
+### TWEET CARDS ###
+
+_CARD = _template("""
+<div style="border: 1px solid #2f3336; background-color: #15202b; border-radius: 12px;
+    padding: 15px; margin: 20px auto; max-width: 550px;
+    box-shadow: 0px 2px 5px rgba(0,0,0,0.4);
+    font-family: 'Segoe UI', sans-serif;">
+    <div style="display: flex; align-items: center;">
+        <img src="$avatar" width="48" height="48" style="border-radius: 50%; margin-right: 10px;">
+        <div>
+            <span style="font-weight: 600; font-size: 16px; color: white;">$name</span>
+            <img src="$verified" width="16" height="16" style="margin-left: 4px; vertical-align: text-bottom;">
+            <br>
+            <span style="color: #8899a6;">@$handle · Apr 5, 2025</span>
+        </div>
+    </div>
+    <div style="margin-top: 12px; font-size: 18px; line-height: 1.5; color: white;">
+        $tweet
+    </div>
+    <div style="margin-top: 14px; display: flex; justify-content: space-around; color: #8899a6; font-size: 14px;">
+        <div><img src="$reply" width="20" height="20"/> 17</div>
+        <div><img src="$share" width="20" height="20"/> 112</div>
+        <div><img src="$like" width="20" height="20"/> 683</div>
+        <div><img src="$views" width="20" height="20"/> 13.2K</div>
+    </div>
+</div>
+""")
+
+
+def tweet_card(tweet, author=None, avatar=None):
+    # Unrevealed cards have no author: "Unknown Author" and the default avatar
+    return _CARD.substitute(
+        assets.ICONS,
+        avatar=avatar or assets.DEFAULT_AVATAR,
+        name=html.escape(author or 'Unknown Author'),
+        handle=html.escape(author.lower().replace(' ', '') if author else 'Unknown Author'),
+        tweet=html.escape(tweet, quote=False),
+    )
+
+
+class CardCache:
+    # Card HTML per (tweet ID, revealed) for one tweet store and its avatars;
+    # resources.get_cards() keeps one per dataset
+    def __init__(self, store, avatars, maxsize=4096):
+        self.store = store
+        self.avatars = avatars
+        self.card = lru_cache(maxsize=maxsize)(self._card)
+
+    def _card(self, tweet_id, revealed=False):
+        tweet = self.store.tweet(tweet_id)
+        if not revealed:
+            return tweet_card(tweet)
+        author = self.store.author(tweet_id)
+        return tweet_card(tweet, author, self.avatars.avatar(author))
+
+    def stats(self):
+        return self.card.cache_info()._asdict()
+
+
+### GAME PANELS ###
+
+_SCORE_BADGE = _template("""
+<div style="background-color: #ffffff; color: black; padding: 8px 12px;
+            border-radius: 12px; text-align: center; font-weight: bold;
+            box-shadow: 1px 1px 5px rgba(0,0,0,0.1); margin-top: 6px;">
+    Score: $score
+</div>
+""")
+
+_PILL = _template("""
+<div style='background-color: $background; color: black; padding: 10px 16px; border-radius: 20px;
+            text-align: center; font-weight: bold; box-shadow: 1px 1px 3px rgba(0,0,0,0.1);'>
+    $icon $text
+</div>
+""")
+
+_ANSWER_BANNER = _template("""
+<div style='background-color: $background; color: black; padding: 10px 16px; border-radius: 20px;
+    margin-bottom: 10px; font-weight: bold; box-shadow: 1px 1px 3px rgba(0,0,0,0.1);'>
+    $icon $selected The correct answer was: $author
+</div>
+""")
+
+_FINAL_BANNER = _template("""
+<div style='background-color: $background; color: black; padding: 12px; border-radius: 8px;'>$message</div>
+""")
+
+# (minimum score, background, message), best first
+FINAL_BANNERS = [
+    (10, '#fff3cd', '🎉 You scored {score}/{total}. WOW!'),
+    (7, '#d4edda', '👏 Great job! You scored {score}/{total}!'),
+    (4, '#d1ecf1', 'ℹ️ You scored {score}/{total}. Not bad — give it another go!'),
+    (0, '#fff3cd', '⚠️ You scored {score}/{total}. Tough round — try again! 💪'),
+]
+
+# Easy-mode option after answering: the right author, the wrong pick, the rest
+_OPTION_STYLES = {
+    'correct': ('#d4edda', '✅'),
+    'wrong': ('#f8d7da', '❌'),
+    'other': ('#e2e3e5', ''),
+}
+
+
+@lru_cache(maxsize=None)
+def score_badge(score):
+    return _SCORE_BADGE.substitute(score=score)
+
+
+@lru_cache(maxsize=1024)
+def option_pill(option, state):
+    background, icon = _OPTION_STYLES[state]
+    return _PILL.substitute(background=background, icon=icon, text=html.escape(option))
+
+
+def answer_banner(correct, selected, author):
+    # Hard mode; selected is whatever the player typed, so it is not cached
+    background, icon = _OPTION_STYLES['correct' if correct else 'wrong']
+    return _ANSWER_BANNER.substitute(background=background, icon=icon, selected=html.escape(selected or ''),
+                                     author=html.escape(author))
+
+
+@lru_cache(maxsize=None)
+def final_banner(score, total=10):
+    minimum, background, message = next(b for b in FINAL_BANNERS if score >= b[0])
+    return _FINAL_BANNER.substitute(background=background, message=message.format(score=score, total=total))
@@ -0,0 +1,161 @@
+import hashlib
+import os
+import threading
+import time
+
+import dataset
+import render
+import similarity
+from assets import AvatarCache
+from explain import Explainer
+from matcher import AuthorMatcher
+from model import DEFAULT_MODEL_PATH, load_model
+from question_bank import QuestionBank
+from tweet_store import TweetStore
+
+# Process-wide cache for the model and datasets. Streamlit imports this module once
+# per process, so everything here is shared by every session. Cached objects are
+# shared, so callers must treat them as read-only.
+
+DEFAULT_TWEETS_PATH = 'data/tweets.csv'
+
+_lock = threading.Lock()
+_entries = {}  # key -> [(stat signature, version), content hash, value]
+_load_locks = {}  # one per getter (key[0]), so the dict stays as small as the API
+_stats = {}
+
+
+def _file_stat(path):
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+
+def _file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _counters(key):
+    if key not in _stats:
+        _stats[key] = {'hits': 0, 'misses': 0, 'loads': 0, 'load_seconds': 0.0, 'last_load_seconds': 0.0}
+    return _stats[key]
+
+
+def cached(key, path, loader, version=None):
+    # Return loader() for key, reloading only when the file at path changed, or when
+    # version (whatever else the value was built from) did. A stat() per call catches
+    # mtime/size changes; the content hash then decides whether the file really
+    # changed or was merely touched. Loads through the same getter take turns.
+    signature = (_file_stat(path), version)
+    with _lock:
+        entry = _entries.get(key)
+        if entry is not None and entry[0] == signature:
+            _counters(key)['hits'] += 1
+            return entry[2]
+        load_lock = _load_locks.setdefault(key[0], threading.Lock())
+
+    with load_lock:
+        # Another session may have reloaded while we waited for the key lock
+        with _lock:
+            entry = _entries.get(key)
+            if entry is not None and entry[0] == signature:
+                _counters(key)['hits'] += 1
+                return entry[2]
+
+        content_hash = _file_hash(path)
+        if entry is not None and entry[0][1] == version and entry[1] == content_hash:
+            with _lock:
+                entry[0] = signature
+                _counters(key)['hits'] += 1
+            return entry[2]
+
+        start = time.perf_counter()
+        value = loader()
+        elapsed = time.perf_counter() - start
+        with _lock:
+            _entries[key] = [signature, content_hash, value]
+            counters = _counters(key)
+            counters['misses'] += 1
+            counters['loads'] += 1
+            counters['load_seconds'] += elapsed
+            counters['last_load_seconds'] = elapsed
+        return value
+
+
+def get_model(path=DEFAULT_MODEL_PATH):
+    return cached(('model', path), path, lambda: load_model(path))
+
+
+def get_model_version(path=DEFAULT_MODEL_PATH):
+    # Content hash of the model currently loaded from path; changes whenever it is reloaded
+    get_model(path)
+    with _lock:
+        return _entries[('model', path)][1][:16]
+
+
+def get_explainer(path=DEFAULT_MODEL_PATH):
+    # Feature names and coefficient arrays are extracted once per model load
+    return cached(('explainer', path), path, lambda: Explainer(get_model(path)))
+
+
+def get_similarity_index(model_path=DEFAULT_MODEL_PATH, tweets_path=DEFAULT_TWEETS_PATH):
+    # The index saved beside the model when it matches the model and the tweets,
+    # otherwise built in memory. Tracks the tweets' signature, so editing or
+    # converting the tweets table rebuilds it, and the model version, so a new model
+    # replaces the old index rather than adding an entry.
+    return cached(('similarity', model_path, tweets_path), dataset.signature_path(tweets_path),
+                  lambda: similarity.load_or_build(get_model(model_path), model_path, tweets_path),
+                  version=get_model_version(model_path))
+
+
+def get_tweets(path=DEFAULT_TWEETS_PATH):
+    return cached(('tweets', path), dataset.signature_path(path), lambda: dataset.read_table(path))
+
+
+def _load_tweet_store(path):
+    if dataset.is_columnar(path):
+        return TweetStore.from_columnar(dataset.open_columnar(path))
+    return TweetStore.from_frame(get_tweets(path))
+
+
+def get_tweet_store(path=DEFAULT_TWEETS_PATH):
+    # path may be a CSV or a dataset.py columnar directory (tracked through its meta.json)
+    return cached(('tweet_store', path), dataset.signature_path(path), lambda: _load_tweet_store(path))
+
+
+def get_question_bank(path=DEFAULT_TWEETS_PATH):
+    # Rebuilt along with the store when the tweets file changes
+    return cached(('question_bank', path), dataset.signature_path(path), lambda: QuestionBank(get_tweet_store(path)))
+
+
+def get_author_matcher(path=DEFAULT_TWEETS_PATH):
+    # Alias and trigram index over the store's authors, for hard-mode answers
+    return cached(('author_matcher', path), dataset.signature_path(path),
+                  lambda: AuthorMatcher(get_tweet_store(path).authors))
+
+
+def get_assets(path=DEFAULT_TWEETS_PATH):
+    # Resized avatar data URIs for the store's authors; avatar paths are relative to
+    # the tweets table's directory
+    return cached(('assets', path), dataset.signature_path(path),
+                  lambda: AvatarCache.from_store(get_tweet_store(path), os.path.dirname(path)))
+
+
+def get_cards(path=DEFAULT_TWEETS_PATH):
+    # Tweet-card HTML per tweet ID and reveal state, shared by every session
+    return cached(('cards', path), dataset.signature_path(path),
+                  lambda: render.CardCache(get_tweet_store(path), get_assets(path)))
+
+
+def stats():
+    with _lock:
+        return {key: dict(counters) for key, counters in _stats.items()}
+
+
+def clear():
+    with _lock:
+        _entries.clear()
+        _stats.clear()
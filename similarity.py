@@ -0,0 +1,180 @@
+import argparse
+import json
+import os
+import time
+from collections import namedtuple
+
+import numpy as np
+
+import dataset
+from inference import vectorize
+from model import DEFAULT_MODEL_PATH, load_metadata, load_model
+
+# "Your tweet is closest to ..." search over the real tweets, in the fitted model's
+# TF-IDF space. The tweet vectors are stored transposed, as postings: for every term,
+# the tweets containing it and their L2-normalized weights. A query only walks the
+# postings of its own few terms, so its cost follows those terms' frequencies rather
+# than the corpus size. The index is saved beside the model artifact:
+#   python similarity.py --model tweetlike_model.pkl build --tweets data/tweets.csv
+#   python similarity.py query "i love my fans" -k 5
+
+DEFAULT_TWEETS_PATH = 'data/tweets.csv'
+INDEX_FORMAT = 1
+
+# tweet_id: row of the indexed tweet table; score: cosine similarity
+Neighbor = namedtuple('Neighbor', ['author', 'tweet', 'score', 'tweet_id'])
+
+
+def index_path(model_path):
+    return os.path.splitext(model_path)[0] + '.similarity.npz'
+
+
+def _l2_normalize(X):
+    X = X.tocsr().astype(np.float32)
+    norms = np.sqrt(np.asarray(X.multiply(X).sum(axis=1)).ravel())
+    norms[norms == 0] = 1
+    return X.multiply(1 / norms[:, None]).tocsr()
+
+
+class SimilarityIndex:
+    def __init__(self, indptr, doc_ids, weights, tweets, author_codes, authors, meta=None):
+        self.indptr = indptr  # n_features + 1; term t owns doc_ids/weights[indptr[t]:indptr[t + 1]]
+        self.doc_ids = doc_ids
+        self.weights = weights
+        self.tweets = tweets  # dataset.StringColumn
+        self.author_codes = author_codes
+        self.authors = authors
+        self.meta = meta or {}
+
+    def __len__(self):
+        return len(self.author_codes)
+
+    @classmethod
+    def build(cls, model, tweets, authors, meta=None):
+        # Identical texts (after the model's normalization) are indexed once
+        tweets = [str(t) for t in tweets]
+        _, first = np.unique([t.strip().lower() for t in tweets], return_index=True)
+        first = np.sort(first)
+        tweets = [tweets[i] for i in first]
+        names, codes = np.unique(np.asarray(authors, dtype=str)[first], return_inverse=True)
+
+        postings = _l2_normalize(vectorize(model, tweets)).tocsc()
+        postings.sort_indices()
+        encoded = [t.encode('utf-8') for t in tweets]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(b) for b in encoded], out=offsets[1:])
+        blob = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+        return cls(postings.indptr.astype(np.int64), postings.indices.astype(np.int32), postings.data,
+                   dataset.StringColumn(offsets, blob), codes.astype(np.int32), [str(n) for n in names], meta)
+
+    def query(self, X, k=3):
+        # Top-k neighbors of each row of X (a vectorized query matrix)
+        X = _l2_normalize(X)
+        results = []
+        for row in range(X.shape[0]):
+            terms = X.indices[X.indptr[row]:X.indptr[row + 1]]
+            values = X.data[X.indptr[row]:X.indptr[row + 1]]
+            terms_in_vocab = terms < len(self.indptr) - 1
+            terms, values = terms[terms_in_vocab], values[terms_in_vocab]
+            starts, stops = self.indptr[terms], self.indptr[terms + 1]
+            lengths = stops - starts
+            if not lengths.sum():
+                results.append([])
+                continue
+            # Gather every posting of the query's terms, then sum per tweet
+            positions = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+            docs = self.doc_ids[positions]
+            scores = np.bincount(docs, weights=self.weights[positions] * np.repeat(values, lengths))
+            n = min(k, int(np.count_nonzero(scores)))
+            top = np.argpartition(-scores, n - 1)[:n]
+            top = top[np.argsort(-scores[top], kind='stable')]
+            results.append([Neighbor(self.authors[self.author_codes[i]], self.tweets[i], float(scores[i]), int(i))
+                            for i in top])
+        return results
+
+    def search(self, model, text, k=3):
+        return self.query(vectorize(model, [text]), k)[0]
+
+    def save(self, path):
+        tmp_path = f'{path}.{os.getpid()}.tmp.npz'
+        np.savez(tmp_path, indptr=self.indptr, doc_ids=self.doc_ids, weights=self.weights,
+                 tweet_offsets=self.tweets.offsets, tweet_blob=self.tweets.blob, author_codes=self.author_codes,
+                 authors=np.array(self.authors, dtype=str), meta=np.array(json.dumps(self.meta)))
+        os.replace(tmp_path, path)
+        return path
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            meta = json.loads(str(data['meta']))
+            if meta.get('format', INDEX_FORMAT) > INDEX_FORMAT:
+                raise ValueError(f"{path} has index format {meta['format']}; this code reads up to {INDEX_FORMAT}")
+            return cls(data['indptr'], data['doc_ids'], data['weights'],
+                       dataset.StringColumn(data['tweet_offsets'], data['tweet_blob']),
+                       data['author_codes'], [str(a) for a in data['authors']], meta)
+
+
+def tweets_sha256(tweets_path):
+    # A columnar table is identified by its meta.json
+    return dataset.file_sha256(dataset.signature_path(tweets_path))
+
+
+def build(model, model_path, tweets_path=DEFAULT_TWEETS_PATH):
+    # Real tweets only, so a match is something the celebrity actually wrote
+    df = dataset.read_table(tweets_path)
+    if 'is_real' in df:
+        df = df[df['is_real'].astype(bool)]
+    author_column = 'author' if 'author' in df else 'name'
+    meta = {
+        'format': INDEX_FORMAT,
+        'model_sha256': load_metadata(model_path).get('model_sha256'),
+        'tweets_path': tweets_path,
+        'tweets_sha256': tweets_sha256(tweets_path),
+        'built_at': time.time(),
+    }
+    return SimilarityIndex.build(model, df['tweet'], df[author_column], meta)
+
+
+def load_or_build(model, model_path, tweets_path=DEFAULT_TWEETS_PATH):
+    # The saved index when it was built from this exact model and tweets table,
+    # otherwise a fresh one
+    path = index_path(model_path)
+    if os.path.exists(path):
+        index = SimilarityIndex.load(path)
+        if (index.meta.get('model_sha256') == load_metadata(model_path).get('model_sha256')
+                and index.meta.get('tweets_sha256') == tweets_sha256(tweets_path)):
+            return index
+    return build(model, model_path, tweets_path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Build or query the nearest-tweet similarity index.')
+    parser.add_argument('--model', default=DEFAULT_MODEL_PATH)
+    commands = parser.add_subparsers(dest='command', required=True)
+    build_parser = commands.add_parser('build', help='index the real tweets next to the model')
+    build_parser.add_argument('--tweets', default=DEFAULT_TWEETS_PATH)
+    query_parser = commands.add_parser('query', help='print the tweets closest to a text')
+    query_parser.add_argument('text')
+    query_parser.add_argument('-k', type=int, default=3)
+    query_parser.add_argument('--tweets', default=DEFAULT_TWEETS_PATH, help='used when no saved index matches the model')
+    args = parser.parse_args(argv)
+
+    model = load_model(args.model)
+    if args.command == 'build':
+        start = time.perf_counter()
+        index = build(model, args.model, args.tweets)
+        path = index.save(index_path(args.model))
+        print(f"Indexed {len(index)} tweets -> {path} ({time.perf_counter() - start:.2f}s)")
+        return
+
+    index = load_or_build(model, args.model, args.tweets)
+    start = time.perf_counter()
+    neighbors = index.search(model, args.text, args.k)
+    elapsed = time.perf_counter() - start
+    for neighbor in neighbors:
+        print(f"{neighbor.score:.3f}  {neighbor.author}: {neighbor.tweet}")
+    print(f"({elapsed * 1e3:.2f} ms, {len(index)} tweets)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+import sqlite3
+import time
+
+import pytest
+
+import events
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = events.EventStore(str(tmp_path / 'events.db'))
+    yield store
+    store.close()
+
+
+def play(store, player, name, game, mode, score):
+    for question in range(10):
+        store.record_answer(player, game, mode, question, f'tweet {question}', 'Kanye West', True, 'Kanye West',
+                            question < score)
+    store.record_game(game, player, name, mode, score, 10, 3)
+
+
+def test_leaderboard_keeps_best_score_games_and_average(store):
+    play(store, 'p1', 'Ada', 'g1', 'easy', 6)
+    play(store, 'p1', 'Ada', 'g2', 'easy', 9)
+    play(store, 'p2', 'Bob', 'g3', 'easy', 7)
+    play(store, 'p2', 'Bob', 'g4', 'hard', 2)
+    assert store.flush(5)
+
+    snapshot = store.snapshot()
+    assert snapshot.leaderboard['easy'] == [('Ada', 9, 2, 7.5), ('Bob', 7, 1, 7.0)]
+    assert snapshot.leaderboard['hard'] == [('Bob', 2, 1, 2.0)]
+    assert snapshot.games == 4
+    assert snapshot.answers == 40
+
+
+def test_a_game_recorded_twice_counts_once(store):
+    play(store, 'p1', 'Ada', 'g1', 'easy', 5)
+    store.record_game('g1', 'p1', 'Ada', 'easy', 5, 10, 3)
+    store.flush(5)
+    assert store.snapshot().leaderboard['easy'] == [('Ada', 5, 1, 5.0)]
+
+
+def test_per_tweet_accuracy(store):
+    play(store, 'p1', 'Ada', 'g1', 'easy', 3)  # tweets 0-2 right, 3-9 wrong
+    play(store, 'p2', 'Bob', 'g2', 'easy', 1)  # tweet 0 right
+    store.flush(5)
+    assert store.tweet_accuracy('tweet 0') == (2, 1.0)
+    assert store.tweet_accuracy('tweet 1') == (2, 0.5)
+    assert store.tweet_accuracy('tweet 9') == (2, 0.0)
+    assert store.tweet_accuracy('never answered') is None
+
+
+def test_aggregates_match_the_raw_answers(store):
+    play(store, 'p1', 'Ada', 'g1', 'easy', 4)
+    play(store, 'p2', 'Bob', 'g2', 'hard', 8)
+    store.flush(5)
+    conn = sqlite3.connect(store.path)
+    raw = dict(conn.execute('SELECT tweet, sum(correct) FROM answers GROUP BY tweet'))
+    assert {tweet: correct for tweet, (_, correct) in store.snapshot().tweets.items()} == raw
+    assert conn.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+
+
+def test_other_processes_games_appear_after_a_refresh(tmp_path):
+    path = str(tmp_path / 'events.db')
+    writer = events.EventStore(path)
+    reader = events.EventStore(path, snapshot_interval=0.05)
+    try:
+        play(writer, 'p1', 'Ada', 'g1', 'easy', 6)
+        writer.flush(5)
+        time.sleep(0.6)
+        assert reader.snapshot().leaderboard['easy'] == [('Ada', 6, 1, 6.0)]
+    finally:
+        writer.close()
+        reader.close()
+
+
+def test_unopenable_database_disables_the_store(tmp_path):
+    store = events.EventStore(str(tmp_path / 'missing' / 'events.db'))
+    assert store.error is not None
+    assert not store.record_answer('p1', 'g1', 'easy', 0, 'tweet', 'Kanye West', True, 'Kanye West', True)
+    assert store.flush(1)
+    assert store.snapshot() is events.EMPTY_SNAPSHOT
+    store.close()
+
+
+def test_refresh_fetches_only_newly_answered_tweets(tmp_path):
+    path = str(tmp_path / 'events.db')
+    writer = events.EventStore(path)
+    reader = events.EventStore(path, snapshot_interval=3600)
+    try:
+        play(writer, 'p1', 'Ada', 'g1', 'easy', 4)
+        writer.flush(5)
+        conn = sqlite3.connect(path)
+        reader._read_snapshot(conn)
+        assert reader.snapshot().answers == 10 and reader.tweet_accuracy('tweet 0') == (1, 1.0)
+
+        writer.record_answer('p2', 'g2', 'easy', 0, 'tweet 0', 'Kanye West', True, 'Lady Gaga', False)
+        writer.record_answer('p2', 'g2', 'easy', 1, 'new tweet', 'Kanye West', True, 'Kanye West', True)
+        writer.flush(5)
+        fetched = []
+        conn.set_trace_callback(fetched.append)
+        reader._read_snapshot(conn)
+        snapshot = reader.snapshot()
+        assert snapshot.answers == 12 and snapshot.games == 1
+        assert reader.tweet_accuracy('tweet 0') == (2, 0.5) and reader.tweet_accuracy('new tweet') == (1, 1.0)
+        assert reader.tweet_accuracy('tweet 5') == (1, 0.0)
+        assert not any('FROM tweet_stats' in sql and 'WHERE' not in sql for sql in fetched)
+        conn.close()
+    finally:
+        writer.close()
+        reader.close()
+
+
+def test_flush_on_a_full_queue_returns_false(tmp_path):
+    store = events.EventStore(str(tmp_path / 'events.db'), max_queue=1)
+    store.close()  # no writer draining the queue any more
+    assert store.record_answer('p1', 'g1', 'easy', 0, 'tweet', 'Kanye West', True, 'Kanye West', True)
+    assert store.flush(0.1) is False
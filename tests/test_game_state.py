@@ -0,0 +1,87 @@
+from collections import namedtuple
+
+import numpy as np
+import pytest
+
+from game_state import GameState
+
+Game = namedtuple('Game', ['tweet_ids', 'options', 'is_real'])
+IS_REAL = [True, False, True, True, False, True, True, False, True, True]
+
+
+@pytest.fixture
+def game():
+    n = len(IS_REAL)
+    return GameState.from_game(Game(np.arange(100, 100 + n), np.arange(4 * n).reshape(n, 4), IS_REAL))
+
+
+def rerun(game, times=1):
+    # What every rerun of a question page does before handling widgets
+    for _ in range(times):
+        game.show()
+
+
+def test_reruns_count_each_question_once(game):
+    # The old bug: every rerun of a question page (a click, the answer, the next
+    # question) incremented total_questions again
+    for q in range(len(game)):
+        rerun(game, 3)
+        assert game.answer('Kanye West', correct=q % 2 == 0)
+        rerun(game, 2)
+        assert game.questions_seen == q + 1
+        game.next_question()
+    assert game.questions_seen == len(game)
+    assert game.score == 5
+    assert game.fake_seen == IS_REAL.count(False)
+
+
+def test_only_the_first_answer_to_a_question_counts(game):
+    rerun(game)
+    assert game.answer('Kanye West', correct=True)
+    assert not game.answer('Kanye West', correct=True)
+    assert not game.answer('Lady Gaga', correct=False)
+    rerun(game, 2)
+    assert game.score == 1 and game.is_correct and game.selected == 'Kanye West'
+
+
+def test_state_follows_the_current_question(game):
+    rerun(game)
+    game.answer('x', correct=False)
+    game.next_question()
+    assert game.current == 1 and game.selected is None and not game.is_answered
+    assert game.tweet_id == 101 and list(game.option_codes) == [4, 5, 6, 7] and not game.is_real
+    rerun(game)
+    assert game.fake_tweet_ids() == [101]
+
+
+def test_quitting_midway_counts_only_the_questions_shown(game):
+    for _ in range(4):
+        rerun(game, 2)
+        game.answer('x', correct=True)
+        game.next_question()
+    assert game.questions_seen == 4 and game.score == 4
+    assert game.fake_seen == 1 and game.fake_tweet_ids() == [101]
+
+
+def test_next_question_stops_at_the_last_one(game):
+    for _ in range(len(game) + 3):
+        game.next_question()
+    assert game.current == len(game) - 1 and game.is_last
+
+
+def test_app_reruns_do_not_double_count(tmp_path, monkeypatch):
+    # The whole easy game through the app, with an extra rerun after every click
+    from streamlit.testing.v1 import AppTest
+
+    monkeypatch.setenv('TWEETLIKE_EVENTS_DB', str(tmp_path / 'events.db'))
+    at = AppTest.from_file('../app.py', default_timeout=60).run()
+    at.button(key='easy_mode').click().run()
+    at.button(key='start_game').click().run().run()
+    for q in range(10):
+        at.button(key=f'option_{q}_0').click().run().run()
+        if q < 9:
+            at.button(key='next_question').click().run().run()
+    assert not at.exception
+    game = at.session_state.game
+    assert game.questions_seen == len(game) == 10
+    assert game.answered == (1 << 10) - 1 and game.score <= 10
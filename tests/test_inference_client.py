@@ -0,0 +1,59 @@
+import json
+import socket
+import threading
+
+import pytest
+
+from inference_client import InferenceClient
+
+ANSWER = json.dumps({'predictions': [{'author': 'Kanye West', 'top': [['Kanye West', 1.0]]}]}).encode()
+
+
+@pytest.fixture
+def fake_server():
+    # Per connection: 'drop' closes it at once, 'silent' never answers, 'answer' replies
+    # 200 to one request. Yields (url, behaviours to use in order, connections accepted).
+    listener = socket.socket()
+    listener.bind(('127.0.0.1', 0))
+    listener.listen()
+    behaviours, accepted = [], []
+
+    def serve():
+        while True:
+            try:
+                conn = listener.accept()[0]
+            except OSError:
+                return
+            accepted.append(conn)
+            behaviour = behaviours.pop(0) if behaviours else 'silent'
+            if behaviour == 'drop':
+                conn.close()
+            elif behaviour == 'answer':
+                conn.recv(65536)
+                conn.sendall(b'HTTP/1.1 200 OK\r\nContent-Length: %d\r\n\r\n' % len(ANSWER) + ANSWER)
+
+    threading.Thread(target=serve, daemon=True).start()
+    yield f'http://127.0.0.1:{listener.getsockname()[1]}', behaviours, accepted
+    listener.shutdown(socket.SHUT_RDWR)
+    listener.close()
+    for conn in accepted:
+        conn.close()
+
+
+def test_a_timed_out_request_is_not_sent_again(fake_server):
+    url, _, accepted = fake_server
+    client = InferenceClient(url, timeout=0.2)
+    with pytest.raises(TimeoutError):
+        client.predict(['i love my fans'])
+    assert len(accepted) == 1
+
+
+def test_a_dropped_pooled_connection_is_retried(fake_server):
+    url, behaviours, accepted = fake_server
+    behaviours += ['drop', 'answer']
+    client = InferenceClient(url, timeout=1.0)
+    idle = client._connect()
+    idle.connect()
+    client._checkin(idle)  # the server closes it while it sits in the pool
+    assert client.predict(['i love my fans'])[0]['prediction'].author == 'Kanye West'
+    assert len(accepted) == 2
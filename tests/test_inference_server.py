@@ -0,0 +1,61 @@
+import asyncio
+import json
+
+import pytest
+
+from inference_server import InferenceServer
+
+
+@pytest.fixture
+def server():
+    # A fresh server per test: the batcher's queue belongs to one event loop
+    return InferenceServer()
+
+
+def run(server, *requests):
+    # Send the POST /predict bodies concurrently, so they share a batch
+    async def main():
+        batch_task = asyncio.create_task(server.batcher.run())
+        try:
+            return await asyncio.gather(*(server.dispatch('POST', '/predict', json.dumps(r).encode())
+                                          for r in requests), return_exceptions=True)
+        finally:
+            batch_task.cancel()
+    return asyncio.run(main())
+
+
+@pytest.mark.parametrize('request_body', [
+    {'tweets': [None]},
+    {'tweets': 'not a list'},
+    {'tweets': ['ok'], 'k': 0},
+    {'k': 3},
+])
+def test_invalid_requests_get_400(server, request_body):
+    status, payload = run(server, request_body)[0]
+    assert status.startswith('400') and payload['error']
+
+
+def test_a_failing_item_does_not_fail_its_batch(server, monkeypatch):
+    score = server.batcher._score
+
+    def flaky_score(batch):
+        if any(tweet == 'boom' for tweet, *_ in batch):
+            raise RuntimeError('boom')
+        return score(batch)
+
+    monkeypatch.setattr(server.batcher, '_score', flaky_score)
+    good, bad = run(server, {'tweets': ['i love my fans so much']}, {'tweets': ['boom']})
+    assert good[0] == '200 OK' and good[1]['predictions'][0]['author']
+    assert isinstance(bad, RuntimeError)
+
+
+def test_similar_returns_the_closest_real_tweets(server):
+    (status, payload), (_, without) = run(server, {'tweets': ['i love my fans so much', 'hello'], 'similar': 2},
+                                          {'tweets': ['i love my fans so much']})
+    assert status == '200 OK'
+    assert payload['predictions'][0]['similar']
+    for prediction in payload['predictions']:
+        assert len(prediction['similar']) <= 2
+        for neighbor in prediction['similar']:
+            assert set(neighbor) == {'author', 'tweet', 'score', 'tweet_id'} and 0 < neighbor['score'] <= 1 + 1e-9
+    assert 'similar' not in without['predictions'][0]
@@ -0,0 +1,36 @@
+import pytest
+
+from matcher import AuthorMatcher
+
+AUTHORS = ['Taylor Swift', 'SHAQ', "Conan O'Brien", 'Kevin Hart', 'Kevin Durant', 'Kanye West',
+           'Tyler, the Creator']
+
+
+@pytest.fixture(scope='module')
+def matcher():
+    return AuthorMatcher(AUTHORS)
+
+
+@pytest.mark.parametrize('answer, author', [
+    ('Taylor Swift', 'Taylor Swift'),
+    ('tayler swift', 'Taylor Swift'),
+    ('taylor swfit', 'Taylor Swift'),
+    ('swift', 'Taylor Swift'),
+    ('shaq', 'SHAQ'),
+    ('conan o brien', "Conan O'Brien"),
+    ('Conan O’Brien', "Conan O'Brien"),
+    ('tyler the creator', 'Tyler, the Creator'),
+])
+def test_common_misspellings_match(matcher, answer, author):
+    match = matcher.match(answer)
+    assert match is not None and match.author == author
+
+
+@pytest.mark.parametrize('answer', ['', '   ', 'kevin', 'Bob Dylan', 'Lady Gaga', 'xyz'])
+def test_empty_ambiguous_and_unrelated_answers_do_not_match(matcher, answer):
+    assert matcher.match(answer) is None
+
+
+def test_is_correct_checks_the_matched_author(matcher):
+    assert matcher.is_correct('kanye', 'Kanye West')[0]
+    assert not matcher.is_correct('kanye', 'Taylor Swift')[0]
@@ -0,0 +1,58 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import Pipeline
+
+from export_numpy import export
+from inference import vectorize
+from model import load_model
+from numpy_runtime import NumpyModel
+
+# Variants cover the vectorizer options numpy_runtime.py ports besides the shipped ones
+VARIANTS = {
+    'word 1-2gram': dict(ngram_range=(1, 2)),
+    'char_wb 2-4': dict(analyzer='char_wb', ngram_range=(2, 4)),
+    'char 1-3 sublinear': dict(analyzer='char', ngram_range=(1, 3), sublinear_tf=True),
+    'stop words, accents': dict(stop_words='english', strip_accents='unicode'),
+}
+
+
+@pytest.fixture(scope='module')
+def texts():
+    return pd.read_csv('data/tweets.csv')['tweet'].tolist() + ['', 'Café  ÉCLAIR!!', 'unseen words only']
+
+
+def assert_same_probabilities(model, texts, path):
+    export(model, path)
+    expected = model[-1].predict_proba(vectorize(model, texts))
+    # float32 weights: agreement to ~1e-8 in practice
+    np.testing.assert_allclose(NumpyModel(path).predict_proba(texts), expected, atol=1e-6)
+
+
+def test_shipped_model_matches_sklearn(texts, tmp_path):
+    assert_same_probabilities(load_model(), texts, str(tmp_path / 'export'))
+
+
+@pytest.mark.parametrize('params', VARIANTS.values(), ids=VARIANTS.keys())
+def test_vectorizer_variants_match_sklearn(params, texts, tmp_path):
+    data = pd.read_csv('data/top_celebs.csv')
+    model = Pipeline([('tfidf', TfidfVectorizer(**params)), ('clf', LogisticRegression(max_iter=1000))])
+    model.fit(data['tweet'].str.lower(), data['name'])
+    assert_same_probabilities(model, texts, str(tmp_path / 'export'))
+
+
+def test_reexport_swaps_the_directory(texts, tmp_path):
+    path = str(tmp_path / 'export')
+    model = load_model()
+    export(model, path)
+    mapped = NumpyModel(path)
+    before = mapped.predict_proba(texts[:5])
+    export(model, path)
+    # The old arrays stay valid for a worker that mapped them, and nothing is left behind
+    np.testing.assert_array_equal(mapped.predict_proba(texts[:5]), before)
+    assert os.listdir(tmp_path) == ['export']
+    np.testing.assert_array_equal(NumpyModel(path).predict_proba(texts[:5]), before)
@@ -0,0 +1,86 @@
+import pytest
+
+import prediction_cache
+from model import load_model
+from prediction_cache import LRUCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = LRUCache(ttl=10, clock=clock)
+    cache.set('a', 1)
+    clock.now = 9.9
+    assert cache.get('a') == 1
+    clock.now = 10.1
+    assert cache.get('a') is None
+    assert cache.stats()['expired'] == 1 and cache.stats()['size'] == 0
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    cache = LRUCache(maxsize=2, clock=clock)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.get('a')
+    cache.set('c', 3)
+    assert cache.get('b') is None and cache.get('a') == 1 and cache.get('c') == 3
+
+
+def test_new_model_version_drops_everything(clock):
+    cache = LRUCache(clock=clock)
+    cache.check_version('v1')
+    cache.set('a', 1)
+    cache.check_version('v1')
+    assert cache.get('a') == 1
+    cache.check_version('v2')
+    assert cache.get('a') is None and cache.stats()['invalidations'] == 1
+
+
+@pytest.fixture(scope='module')
+def model():
+    return load_model()
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    # Fresh module caches, and a count of the real predict_top_k / vectorize calls
+    monkeypatch.setattr(prediction_cache, '_cache', LRUCache(maxsize=4))
+    monkeypatch.setattr(prediction_cache, '_X_cache', LRUCache(maxsize=4))
+    counts = {'predict': 0, 'vectorize': 0}
+    for name in counts:
+        real = getattr(prediction_cache, f'{name}_top_k' if name == 'predict' else name)
+
+        def counted(*args, _real=real, _name=name, **kwargs):
+            counts[_name] += 1
+            return _real(*args, **kwargs)
+
+        monkeypatch.setattr(prediction_cache, real.__name__, counted)
+    return counts
+
+
+def test_predictions_are_cached_per_normalized_text_and_version(model, calls):
+    first = prediction_cache.predict(model, 'v1', 'I love my fans', k=3)
+    assert prediction_cache.predict(model, 'v1', '  i love my fans ', k=3) == first
+    assert calls == {'predict': 1, 'vectorize': 1}
+    prediction_cache.predict(model, 'v2', 'I love my fans', k=3)
+    assert calls == {'predict': 2, 'vectorize': 2}
+
+
+def test_results_do_not_evict_vectorized_rows(model, calls):
+    prediction_cache.predict(model, 'v1', 'i love my fans', k=3)
+    # More results than the result cache holds, all for the one tweet
+    for k in range(1, 7):
+        prediction_cache.predict(model, 'v1', 'i love my fans', k=k)
+    assert calls['vectorize'] == 1
+    assert prediction_cache.stats()['vectorized']['size'] == 1
@@ -0,0 +1,94 @@
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from question_bank import N_DISTRACTORS, QUESTIONS_PER_GAME, QuestionBank
+from tweet_store import TweetStore
+
+AUTHORS = ['Taylor Swift', 'Kanye West', 'Lady Gaga', 'Elon Musk', 'Shaq', 'Jimmy Fallon']
+
+
+@pytest.fixture
+def store():
+    n = 60
+    return TweetStore.from_frame(pd.DataFrame({
+        'author': [AUTHORS[i % len(AUTHORS)] for i in range(n)],
+        'tweet': [f'tweet {i}' for i in range(n)],
+        'is_real': [i % 3 != 0 for i in range(n)],
+        'avatar': [''] * n,
+    }))
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, 'timed out'
+        time.sleep(0.01)
+
+
+def test_games_never_repeat_a_tweet_and_offer_the_author_plus_distinct_distractors(store):
+    bank = QuestionBank(store, seed=0, capacity=64)
+    for _ in range(200):
+        game = bank.next_game()
+        assert len(game.tweet_ids) == QUESTIONS_PER_GAME == len(set(game.tweet_ids.tolist()))
+        assert game.options.shape == (QUESTIONS_PER_GAME, N_DISTRACTORS + 1)
+        for tweet_id, options in zip(game.tweet_ids, game.options):
+            assert len(set(options.tolist())) == N_DISTRACTORS + 1
+            assert store.author_codes[tweet_id] in options
+            assert ((0 <= options) & (options < len(AUTHORS))).all()
+        np.testing.assert_array_equal(game.is_real, store.is_real[game.tweet_ids])
+
+
+def test_correct_answer_position_is_shuffled(store):
+    bank = QuestionBank(store, seed=0)
+    positions = {int(np.flatnonzero(options == store.author_codes[tweet_id])[0])
+                 for _ in range(20) for tweet_id, options in zip(*bank.next_game()[:2])}
+    assert positions == set(range(N_DISTRACTORS + 1))
+
+
+def test_bank_refills_in_the_background(store):
+    bank = QuestionBank(store, seed=0, capacity=8, low_water=4)
+    assert len(bank) == 8
+    for _ in range(5):
+        bank.next_game()
+    wait_for(lambda: len(bank) == 8)
+
+
+def test_drained_bank_still_serves_games(store):
+    bank = QuestionBank(store, seed=0, capacity=2, low_water=0)
+    games = [bank.next_game() for _ in range(5)]
+    assert all(len(set(g.tweet_ids.tolist())) == QUESTIONS_PER_GAME for g in games)
+
+
+def test_a_failed_refill_does_not_stop_later_refills(store, monkeypatch):
+    bank = QuestionBank(store, seed=0, capacity=8, low_water=4)
+    generate = bank.generate
+
+    def broken(n_games):
+        raise MemoryError('refill failed')
+
+    bank.low_water = 0  # no background refill while draining
+    for _ in range(5):
+        bank.next_game()
+    # What the background thread runs, called here so the failure is synchronous
+    monkeypatch.setattr(bank, 'generate', broken)
+    bank._refilling = True
+    with pytest.raises(MemoryError):
+        bank._refill()
+    assert not bank._refilling and len(bank) == 3
+
+    monkeypatch.setattr(bank, 'generate', generate)
+    bank.low_water = 4
+    bank.next_game()
+    wait_for(lambda: len(bank) == 8)
+
+
+def test_too_few_authors_is_an_error():
+    store = TweetStore.from_frame(pd.DataFrame({
+        'author': ['A', 'B', 'C'] * 5, 'tweet': [f't{i}' for i in range(15)],
+        'is_real': [True] * 15, 'avatar': [''] * 15,
+    }))
+    with pytest.raises(ValueError):
+        QuestionBank(store)
@@ -0,0 +1,50 @@
+import os
+
+import pytest
+
+import resources
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    resources.clear()
+    yield
+    resources.clear()
+
+
+def loader(calls, value):
+    def load():
+        calls.append(value)
+        return value
+    return load
+
+
+def test_reloads_only_when_the_content_changes(tmp_path):
+    path = tmp_path / 'data.txt'
+    path.write_text('one')
+    calls = []
+    assert resources.cached(('thing', str(path)), str(path), loader(calls, 1)) == 1
+    os.utime(path, ns=(0, 10 ** 9))  # touched, same content
+    assert resources.cached(('thing', str(path)), str(path), loader(calls, 2)) == 1
+    path.write_text('two')
+    assert resources.cached(('thing', str(path)), str(path), loader(calls, 3)) == 3
+    assert calls == [1, 3]
+
+
+def test_a_new_version_replaces_the_entry(tmp_path):
+    path = tmp_path / 'data.txt'
+    path.write_text('same')
+    calls = []
+    for version, value in [('v1', 1), ('v1', 2), ('v2', 3), ('v2', 4)]:
+        resources.cached(('thing',), str(path), loader(calls, value), version=version)
+    assert calls == [1, 3]
+    assert len(resources._entries) == 1
+
+
+def test_load_locks_do_not_grow_with_paths(tmp_path):
+    before = set(resources._load_locks)
+    for i in range(50):
+        path = tmp_path / f'data{i}.txt'
+        path.write_text(str(i))
+        resources.cached(('thing', str(path)), str(path), lambda: i)
+    assert set(resources._load_locks) - before <= {'thing'}
@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.preprocessing import normalize
+
+import similarity
+from inference import vectorize
+from train import build_pipeline
+
+TWEETS = [
+    ('i love my fans so much', 'Justin Bieber'),
+    ('new album dropping friday', 'Taylor Swift'),
+    ('basketball is life, see you on the court', 'SHAQ'),
+    ('who ate my oat milk again', 'Conan O\'Brien'),
+    ('I love my fans so much ', 'Justin Bieber'),  # a duplicate after normalization
+    ('my album is the best album', 'Kanye West'),
+]
+
+
+@pytest.fixture(scope='module')
+def model():
+    texts, authors = zip(*TWEETS)
+    return build_pipeline().fit(list(texts), list(authors))
+
+
+@pytest.fixture(scope='module')
+def index(model):
+    texts, authors = zip(*TWEETS)
+    return similarity.SimilarityIndex.build(model, texts, authors)
+
+
+def test_duplicates_are_indexed_once(index):
+    assert len(index) == len(TWEETS) - 1
+
+
+def test_nearest_tweet_and_author(index, model):
+    neighbors = index.search(model, 'so much love for my fans', k=2)
+    assert neighbors[0].author == 'Justin Bieber'
+    assert neighbors[0].tweet == 'i love my fans so much'
+    assert neighbors[0].score > neighbors[1].score
+
+
+def test_scores_match_brute_force_cosine(index, model):
+    query = 'my new album friday'
+    tweets = [index.tweets[i] for i in range(len(index))]
+    expected = (normalize(vectorize(model, tweets)) @ normalize(vectorize(model, [query])).T).toarray().ravel()
+    neighbors = index.search(model, query, k=3)
+    assert [n.tweet_id for n in neighbors] == list(np.argsort(-expected, kind='stable')[:3])
+    assert [n.score for n in neighbors] == pytest.approx(np.sort(expected)[::-1][:3], abs=1e-6)
+
+
+def test_unknown_words_have_no_neighbors(index, model):
+    assert index.search(model, 'zzzz qqqq', k=3) == []
+
+
+def test_save_and_load_round_trip(index, model, tmp_path):
+    path = index.save(str(tmp_path / 'index.npz'))
+    loaded = similarity.SimilarityIndex.load(path)
+    assert loaded.search(model, 'oat milk', k=1) == index.search(model, 'oat milk', k=1)
+
+
+def test_saved_index_is_rebuilt_when_the_tweets_change(model, tmp_path):
+    model_path = str(tmp_path / 'model.pkl')
+    tweets_path = str(tmp_path / 'tweets.csv')
+    pd.DataFrame({'tweet': ['new album dropping friday'], 'author': ['Taylor Swift'], 'is_real': [True]}).to_csv(tweets_path, index=False)
+    similarity.build(model, model_path, tweets_path).save(similarity.index_path(model_path))
+    assert similarity.load_or_build(model, model_path, tweets_path).search(model, 'album', k=1)[0].author == 'Taylor Swift'
+
+    pd.DataFrame({'tweet': ['my album is the best album'], 'author': ['Kanye West'], 'is_real': [True]}).to_csv(tweets_path, index=False)
+    assert similarity.load_or_build(model, model_path, tweets_path).search(model, 'album', k=1)[0].author == 'Kanye West'
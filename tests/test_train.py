@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import train
+from model import load_metadata
+
+
+def test_add_classes_to_a_binary_model_keeps_its_predictions():
+    rng = np.random.default_rng(0)
+    X = rng.random((40, 5))
+    y = np.array(['a', 'b'] * 20)
+    X[y == 'b', 0] += 2
+    classifier = train.SGDClassifier(loss='log_loss', random_state=0).fit(X, y)
+    before = classifier.predict(X)
+
+    assert train._add_classes(classifier, pd.Series(['c', 'a'])) == ['c']
+    assert classifier.coef_.shape == (3, 5) and list(classifier.classes_) == ['a', 'b', 'c']
+    # The zero row for c never wins against a trained pair, so a and b keep their labels
+    np.testing.assert_array_equal(classifier.predict(X), before)
+    classifier.partial_fit(X[:10] + 5, ['c'] * 10)
+    assert classifier.coef_.shape == (3, 5)
+
+
+@pytest.fixture
+def incremental(tmp_path):
+    model_path = str(tmp_path / 'online.pkl')
+    train.train_incremental(train.DEFAULT_DATA_PATH, model_path)
+    update_path = tmp_path / 'new.csv'
+    pd.DataFrame({'name': ['New Celeb'] * 6,
+                  'tweet': [f'brand new celeb tweet number {i}' for i in range(6)]}).to_csv(update_path, index=False)
+    return model_path, str(update_path)
+
+
+def test_update_learns_new_celebs_without_forgetting_the_base_set(incremental):
+    model_path, update_path = incremental
+    base = load_metadata(model_path)
+    model, metadata = train.update_incremental(update_path, model_path=model_path)
+
+    assert model.predict(['brand new celeb tweet number 3'])[0] == 'New Celeb'
+    assert metadata['accuracy'] >= base['accuracy']
+    update, = metadata['updates']
+    assert update['added_classes'] == ['New Celeb'] and update['n_samples'] == 6
+    assert update['accuracy_before'] == base['accuracy']
+    # The top level still describes the base training set
+    for field in ('data_path', 'data_sha256', 'trained_at'):
+        assert metadata[field] == base[field]
+    assert metadata['version'] != base['version']
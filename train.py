@@ -0,0 +1,371 @@
+import argparse
+import hashlib
+import json
+import os
+import tempfile
+from datetime import datetime, timezone
+
+import joblib
+import numpy as np
+import pandas as pd
+import sklearn
+from scipy.stats import loguniform
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfVectorizer
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+from sklearn.model_selection import GridSearchCV, RandomizedSearchCV, StratifiedKFold, train_test_split
+from sklearn.pipeline import Pipeline
+
+from dataset import read_table, signature_path
+from model import ARTIFACT_FORMAT, DEFAULT_MODEL_PATH, load_metadata, load_model, metadata_path, normalize_tweet
+from multihead import MultiHeadModel
+import prepare_data
+
+# Training entry point: python train.py --data data/top_celebs.csv --output tweetlike_model.pkl
+# AI-generated head:   python train.py --ai-head, on prepare_data.py's output (built if missing)
+# Incremental model:    python train.py --incremental, then python train.py --update new_tweets.csv
+# Hyperparameter search: python train.py --search grid (or random) writes the best pipeline
+# to --output and every configuration's CV scores to a .search.csv beside it
+
+DEFAULT_DATA_PATH = 'data/top_celebs.csv'
+# The curated CSV has no is_real column; --ai-head trains on prepare_data.py's output
+DEFAULT_AI_DATA_PATH = prepare_data.DEFAULT_OUTPUT_PATH
+DEFAULT_ONLINE_MODEL_PATH = 'tweetlike_model_online.pkl'
+DEFAULT_CACHE_DIR = '.train_cache'
+MIN_TWEETS = 5
+
+
+def load_training_data(path, with_ai=False):
+    data = read_table(path)
+    data['name'] = data['name'].str.strip()
+    filtered = data.groupby('name').filter(lambda n: len(n) >= MIN_TWEETS)  # celebs with >= 5 tweets
+    X = filtered['tweet'].map(normalize_tweet)
+    y = filtered['name']
+    if not with_ai:
+        return X, y
+    if 'is_real' not in filtered:
+        raise ValueError(f"{path} has no is_real column; rebuild it with prepare_data.py")
+    return X, y, ~filtered['is_real'].astype(bool)  # label: AI-generated
+
+
+def split_data(*arrays, seed=42):
+    return train_test_split(*arrays, test_size=0.2, random_state=seed)
+
+
+def build_pipeline(seed=42, memory=None):
+    return Pipeline([
+        ('tfidf', TfidfVectorizer(lowercase=True, stop_words=None)),  # Converts text to numeric features
+        ('clf', LogisticRegression(max_iter=1000, random_state=seed))  # Multi-class classification
+    ], memory=memory)
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _atomic_write(path, write):
+    # Write next to the target and rename, so a reader never sees a half-written file
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix='.tmp')
+    os.close(fd)
+    try:
+        write(tmp_path)
+        # mkstemp creates the file 0600; give it the permissions a plain open() would,
+        # so a service running as another user can still read the artifact
+        umask = os.umask(0)
+        os.umask(umask)
+        os.chmod(tmp_path, 0o666 & ~umask)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def save_artifact(model, path, metadata):
+    def write_model(tmp_path):
+        joblib.dump(model, tmp_path)
+        metadata['model_sha256'] = file_sha256(tmp_path)
+
+    def write_metadata(tmp_path):
+        with open(tmp_path, 'w') as f:
+            json.dump(metadata, f, indent=2)
+
+    _atomic_write(path, write_model)
+    _atomic_write(metadata_path(path), write_metadata)
+    return metadata
+
+
+def _metadata(model, data_path, seed, accuracy, **extra):
+    data_hash = file_sha256(signature_path(data_path))  # a columnar table is identified by its meta.json
+    trained_at = datetime.now(timezone.utc)
+    metadata = {
+        'format': ARTIFACT_FORMAT,
+        'version': f"{trained_at:%Y%m%d%H%M%S}-{data_hash[:8]}",
+        'trained_at': trained_at.isoformat(),
+        'data_path': data_path,
+        'data_sha256': data_hash,
+        'seed': seed,
+        'sklearn_version': sklearn.__version__,
+    }
+    metadata.update(extra)
+    metadata['classes'] = [str(c) for c in model.classes_]
+    metadata['accuracy'] = accuracy
+    return metadata
+
+
+def train(data_path=DEFAULT_DATA_PATH, output_path=DEFAULT_MODEL_PATH, seed=42, ai_head=False):
+    if ai_head:
+        return train_multihead(data_path, output_path, seed)
+    X, y = load_training_data(data_path)
+    X_train, X_test, y_train, y_test = split_data(X, y, seed=seed)
+
+    model = build_pipeline(seed)
+    model.fit(X_train, y_train)
+    accuracy = model.score(X_test, y_test)
+
+    metadata = _metadata(model, data_path, seed, accuracy, n_train=len(X_train), n_test=len(X_test))
+    return model, save_artifact(model, output_path, metadata)
+
+
+def train_multihead(data_path=DEFAULT_DATA_PATH, output_path=DEFAULT_MODEL_PATH, seed=42):
+    # One TF-IDF fit; the author classifier and the is-AI classifier both train on
+    # the same sparse matrix, and inference scores both from one vectorize pass
+    X, y, y_ai = load_training_data(data_path, with_ai=True)
+    X_train, X_test, y_train, y_test, ai_train, ai_test = split_data(X, y, y_ai, seed=seed)
+
+    pipeline = build_pipeline(seed)
+    vectorizer = pipeline.named_steps['tfidf']
+    M_train = vectorizer.fit_transform(X_train)
+    pipeline.named_steps['clf'].fit(M_train, y_train)
+    ai_head = LogisticRegression(max_iter=1000, class_weight='balanced', random_state=seed)
+    ai_head.fit(M_train, ai_train)
+
+    M_test = vectorizer.transform(X_test)
+    accuracy = pipeline.named_steps['clf'].score(M_test, y_test)
+    ai_accuracy = ai_head.score(M_test, ai_test)
+
+    model = MultiHeadModel(pipeline, ai_head)
+    metadata = _metadata(model, data_path, seed, accuracy, kind='multihead', heads=['author', 'ai'],
+                         n_train=len(X_train), n_test=len(X_test), ai_accuracy=ai_accuracy)
+    return model, save_artifact(model, output_path, metadata)
+
+
+### HYPERPARAMETER SEARCH ###
+# Cross-validated search over the vectorizer and classifier settings. The pipeline's
+# joblib Memory caches each fitted TF-IDF step on disk, keyed on its parameters and
+# the fold's tweets, so every C tried for one vectorizer setting (and any rerun of the
+# search) reuses the fold's matrix instead of re-tokenizing it.
+
+SEARCH_C = [0.3, 1, 3, 10, 30]
+SEARCH_SPACE = [
+    {'tfidf__analyzer': ['word'], 'tfidf__ngram_range': [(1, 1), (1, 2)], 'tfidf__min_df': [1, 2]},
+    {'tfidf__analyzer': ['char_wb'], 'tfidf__ngram_range': [(2, 4), (3, 5)], 'tfidf__min_df': [1, 2]},
+]
+
+
+def search_results_path(output_path):
+    return os.path.splitext(output_path)[0] + '.search.csv'
+
+
+def _plain(value):
+    # numpy scalars from the random search -> JSON-serializable Python values
+    return value.item() if hasattr(value, 'item') else value
+
+
+def train_search(data_path=DEFAULT_DATA_PATH, output_path=DEFAULT_MODEL_PATH, seed=42, search='grid',
+                 n_iter=20, cv=5, n_jobs=-1, cache_dir=DEFAULT_CACHE_DIR):
+    X, y = load_training_data(data_path)
+    X_train, X_test, y_train, y_test = split_data(X, y, seed=seed)
+
+    pipeline = build_pipeline(seed, memory=joblib.Memory(cache_dir, verbose=0))
+    folds = StratifiedKFold(n_splits=cv, shuffle=True, random_state=seed)
+    if search == 'grid':
+        space = [dict(params, clf__C=SEARCH_C) for params in SEARCH_SPACE]
+        searcher = GridSearchCV(pipeline, space, cv=folds, n_jobs=n_jobs)
+    else:
+        space = [dict(params, clf__C=loguniform(SEARCH_C[0], SEARCH_C[-1])) for params in SEARCH_SPACE]
+        searcher = RandomizedSearchCV(pipeline, space, n_iter=n_iter, cv=folds, n_jobs=n_jobs, random_state=seed)
+    searcher.fit(X_train, y_train)
+
+    # The refit best pipeline must not point at the cache directory once pickled
+    model = searcher.best_estimator_.set_params(memory=None)
+    accuracy = model.score(X_test, y_test)
+
+    results = pd.DataFrame(searcher.cv_results_)
+    columns = ['rank_test_score', 'mean_test_score', 'std_test_score', 'mean_fit_time']
+    table = pd.concat([results[columns], pd.json_normalize(results['params'])], axis=1).sort_values('rank_test_score')
+    results_path = search_results_path(output_path)
+    _atomic_write(results_path, lambda tmp_path: table.to_csv(tmp_path, index=False))
+
+    metadata = _metadata(model, data_path, seed, accuracy, kind='search', search=search, cv=cv,
+                         n_candidates=len(results), best_params={k: _plain(v) for k, v in searcher.best_params_.items()},
+                         cv_accuracy=float(searcher.best_score_), search_results=results_path,
+                         n_train=len(X_train), n_test=len(X_test))
+    return model, save_artifact(model, output_path, metadata)
+
+
+### INCREMENTAL TRAINING ###
+# A stateless hashing vectorizer has no vocabulary to refit, and SGDClassifier supports
+# partial_fit, so new labelled tweets are folded into an existing artifact in time
+# proportional to the new data instead of refitting everything.
+
+def build_incremental_pipeline(seed=42, n_features=2 ** 16):
+    return Pipeline([
+        ('hash', HashingVectorizer(lowercase=True, alternate_sign=False, n_features=n_features)),
+        ('clf', SGDClassifier(loss='log_loss', random_state=seed)),  # log loss, so predict_proba works
+    ])
+
+
+def load_update_data(path):
+    # New labelled tweets: same columns as the training CSV, but no minimum per celeb
+    data = read_table(path)
+    return data['tweet'].map(normalize_tweet), data['name'].str.strip()
+
+
+def _add_classes(classifier, labels):
+    # partial_fit only knows the classes from the first fit; a new celebrity gets a
+    # zero-initialised row of weights that the following partial_fit calls train
+    known = set(classifier.classes_)
+    new = [label for label in pd.unique(labels) if label not in known]
+    if new:
+        coef, intercept = classifier.coef_, classifier.intercept_
+        if len(classifier.classes_) == 2:
+            # A binary model keeps one row, for classes_[1]; one-vs-rest needs a row per
+            # class, and classes_[0]'s is the same decision function negated
+            coef, intercept = np.vstack([-coef, coef]), np.concatenate([-intercept, intercept])
+        classifier.classes_ = np.append(classifier.classes_, new)
+        classifier.coef_ = np.vstack([coef, np.zeros((len(new), coef.shape[1]))])
+        classifier.intercept_ = np.append(intercept, np.zeros(len(new)))
+    return new
+
+
+def train_incremental(data_path=DEFAULT_DATA_PATH, output_path=DEFAULT_ONLINE_MODEL_PATH, seed=42):
+    X, y = load_training_data(data_path)
+    X_train, X_test, y_train, y_test = split_data(X, y, seed=seed)
+
+    model = build_incremental_pipeline(seed)
+    model.fit(X_train, y_train)
+    accuracy = model.score(X_test, y_test)
+
+    metadata = _metadata(model, data_path, seed, accuracy, kind='incremental',
+                         n_train=len(X_train), n_test=len(X_test), updates=[])
+    return model, save_artifact(model, output_path, metadata)
+
+
+def update_incremental(update_path, data_path=DEFAULT_DATA_PATH, model_path=DEFAULT_ONLINE_MODEL_PATH, seed=42, epochs=5,
+                       replay=1000):
+    model = load_model(model_path)
+    metadata = load_metadata(model_path)
+    if metadata.get('kind') != 'incremental':
+        raise ValueError(f"{model_path} is not an incremental artifact; create one with train.py --incremental")
+
+    X_new, y_new = load_update_data(update_path)
+    # Same split as a full refit of data_path, so the held-out numbers are comparable
+    X_train, X_test, y_train, y_test = split_data(*load_training_data(data_path), seed=seed)
+    accuracy_before = model.score(X_test, y_test)
+
+    # Passes over the new rows alone overwrite what SGD learned from the base set, so
+    # each pass also replays up to replay base training rows, in a shuffled mix
+    rng = np.random.default_rng(seed)
+    base = rng.permutation(len(X_train))[:replay]
+    X_mix = pd.concat([X_new, X_train.iloc[base]], ignore_index=True)
+    y_mix = pd.concat([y_new, y_train.iloc[base]], ignore_index=True)
+    classifier = model.named_steps['clf']
+    added = _add_classes(classifier, y_new)
+    X_hashed = model.named_steps['hash'].transform(X_mix)
+    for _ in range(epochs):
+        order = rng.permutation(len(y_mix))
+        classifier.partial_fit(X_hashed[order], y_mix.iloc[order])
+    accuracy = model.score(X_test, y_test)
+
+    # data_path, data_sha256 and trained_at keep describing the base training set;
+    # each update is recorded only in updates. The version still changes (_metadata's
+    # scheme plus the update count), since caches of predictions are keyed on it.
+    updated_at = datetime.now(timezone.utc)
+    metadata['updates'] = metadata.get('updates', []) + [{
+        'data_path': update_path,
+        'data_sha256': file_sha256(signature_path(update_path)),
+        'updated_at': updated_at.isoformat(),
+        'n_samples': len(X_new),
+        'n_replayed': len(base),
+        'added_classes': [str(c) for c in added],
+        'accuracy_before': accuracy_before,
+        'accuracy_after': accuracy,
+    }]
+    metadata['version'] = f"{updated_at:%Y%m%d%H%M%S}-{metadata['data_sha256'][:8]}-u{len(metadata['updates'])}"
+    metadata['n_train'] = metadata.get('n_train', 0) + len(X_new)
+    metadata['n_test'] = len(X_test)
+    metadata['classes'] = [str(c) for c in model.classes_]
+    metadata['accuracy'] = accuracy
+    return model, save_artifact(model, model_path, metadata)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Train the 'Who Do You Tweet Like' classifier.")
+    parser.add_argument('--data', help=f'training table with name and tweet columns (default: {DEFAULT_DATA_PATH}, '
+                                       f'or {DEFAULT_AI_DATA_PATH} with --ai-head)')
+    parser.add_argument('--output', help=f'where to write the model pickle (default: {DEFAULT_MODEL_PATH}, '
+                                         f'or {DEFAULT_ONLINE_MODEL_PATH} with --incremental)')
+    parser.add_argument('--seed', type=int, default=42, help='seed for the train/test split and classifier')
+    parser.add_argument('--ai-head', action='store_true',
+                        help='also train an is-AI-generated head on the same TF-IDF features (needs an is_real column)')
+    parser.add_argument('--incremental', action='store_true',
+                        help='train a hashing + SGD model that can be updated with --update')
+    parser.add_argument('--update', metavar='CSV',
+                        help='fold new labelled tweets into the incremental artifact at --output')
+    parser.add_argument('--epochs', type=int, default=5, help='partial_fit passes over the --update data')
+    parser.add_argument('--replay', type=int, default=1000,
+                        help='base training rows mixed into every --update pass, so the model keeps what it knew')
+    parser.add_argument('--search', choices=['grid', 'random'],
+                        help='cross-validated search over n-grams, analyzer, min_df and C; exports the best pipeline')
+    parser.add_argument('--n-iter', type=int, default=20, help='configurations tried by --search random')
+    parser.add_argument('--cv', type=int, default=5, help='cross-validation folds for --search')
+    parser.add_argument('--jobs', type=int, default=-1, help='parallel fits for --search (-1: all cores)')
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR, help='on-disk cache of fitted TF-IDF steps for --search')
+    args = parser.parse_args(argv)
+
+    if args.data is None and args.ai_head and not args.update:
+        args.data = DEFAULT_AI_DATA_PATH
+        if not os.path.exists(args.data):
+            print(f"Building {args.data} with prepare_data.py")
+            prepare_data.prepare()
+    args.data = args.data or DEFAULT_DATA_PATH
+
+    if args.update:
+        output = args.output or DEFAULT_ONLINE_MODEL_PATH
+        _, metadata = update_incremental(args.update, args.data, output, args.seed, args.epochs,
+                                         args.replay)
+    elif args.search:
+        output = args.output or DEFAULT_MODEL_PATH
+        _, metadata = train_search(args.data, output, args.seed, args.search, args.n_iter, args.cv,
+                                   args.jobs, args.cache_dir)
+    elif args.incremental:
+        output = args.output or DEFAULT_ONLINE_MODEL_PATH
+        _, metadata = train_incremental(args.data, output, args.seed)
+    else:
+        output = args.output or DEFAULT_MODEL_PATH
+        _, metadata = train(args.data, output, args.seed, args.ai_head)
+
+    if metadata.get('kind') == 'search':
+        print(f"Best of {metadata['n_candidates']} configurations (CV accuracy {metadata['cv_accuracy']:.2f}): "
+              f"{metadata['best_params']}")
+        print(f"Search results: {metadata['search_results']}")
+    print(f"Accuracy: {metadata['accuracy']:.2f}")
+    if 'ai_accuracy' in metadata:
+        print(f"AI-generated head accuracy: {metadata['ai_accuracy']:.2f}")
+    if args.update:
+        update = metadata['updates'][-1]
+        if update['accuracy_after'] < update['accuracy_before']:
+            print(f"Warning: held-out accuracy fell from {update['accuracy_before']:.2f} to "
+                  f"{update['accuracy_after']:.2f} with this update")
+    if metadata.get('kind') == 'incremental':
+        full_refit = load_metadata(DEFAULT_MODEL_PATH).get('accuracy')
+        if full_refit is not None:
+            print(f"Full refit ({DEFAULT_MODEL_PATH}) accuracy: {full_refit:.2f}")
+    print(f"Wrote {output} (version {metadata['version']})")
+
+
+if __name__ == '__main__':
+    main()
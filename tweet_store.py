@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+
+# Compact, read-only view of tweets.csv for the game. Tweet IDs are row positions,
+# authors are stored as integer codes and every per-question lookup is an array index
+# instead of a scan over the DataFrame.
+
+
+def _read_only(array):
+    # Columns from a dataset.py columnar table are already read-only mmaps or wrappers
+    if isinstance(array, np.ndarray):
+        array.flags.writeable = False
+    return array
+
+
+class TweetStore:
+    def __init__(self, tweets, author_codes, authors, is_real, avatars):
+        self.tweets = _read_only(tweets)
+        self.author_codes = _read_only(author_codes)
+        self.authors = tuple(authors)
+        self.is_real = _read_only(is_real)
+        self.avatars = _read_only(avatars)
+
+        # Tweet IDs grouped by author: author code c owns _by_author[_bounds[c]:_bounds[c + 1]].
+        # Two flat arrays rather than one array per author, so building the store stays
+        # a couple of vectorized calls however many authors there are
+        self._by_author = _read_only(np.argsort(author_codes, kind='stable'))
+        self._bounds = _read_only(np.searchsorted(author_codes[self._by_author], np.arange(len(self.authors) + 1)))
+
+    @classmethod
+    def from_frame(cls, df):
+        codes, authors = pd.factorize(df['author'].str.strip())
+        return cls(
+            tweets=df['tweet'].to_numpy(dtype=object),
+            author_codes=codes.astype(np.int32),
+            authors=authors,
+            is_real=df['is_real'].to_numpy(dtype=bool),
+            avatars=df['avatar'].to_numpy(dtype=object),
+        )
+
+    @classmethod
+    def from_columnar(cls, table):
+        # Author codes and dictionary come straight from the table, and tweets stay in
+        # the mmap'd blob until a question shows them
+        authors = table.column('author')
+        return cls(
+            tweets=table.column('tweet'),
+            author_codes=authors.codes,
+            authors=authors.values,
+            is_real=table.column('is_real'),
+            avatars=table.column('avatar'),
+        )
+
+    def __len__(self):
+        return len(self.tweets)
+
+    def tweet(self, tweet_id):
+        return self.tweets[tweet_id]
+
+    def author(self, tweet_id):
+        return self.authors[self.author_codes[tweet_id]]
+
+    def tweets_by_author(self, author_code):
+        return self._by_author[self._bounds[author_code]:self._bounds[author_code + 1]]